@@ -12,6 +12,9 @@ from .random import RandomAgent
 from .frequency import FrequencyAgent
 from .better_entropy import BetterEntropyAgent
 from .k_beam import KBeamAgent
+from .optimal import OptimalAgent
+from .lookahead import LookaheadAgent
+from .mcts import MCTSAgent
 
 _STRATEGY_FACTORIES: Dict[SolverStrategy, Type[Agent]] = {
     SolverStrategy.ENTROPY: EntropyAgent,
@@ -19,6 +22,9 @@ _STRATEGY_FACTORIES: Dict[SolverStrategy, Type[Agent]] = {
     SolverStrategy.FREQUENCY: FrequencyAgent,
     SolverStrategy.BETTER_ENTROPY: BetterEntropyAgent,
     SolverStrategy.K_BEAM: KBeamAgent,
+    SolverStrategy.OPTIMAL: OptimalAgent,
+    SolverStrategy.LOOKAHEAD: LookaheadAgent,
+    SolverStrategy.MCTS: MCTSAgent,
 }
 
 
@@ -29,7 +35,14 @@ def _build_agent(strategy: SolverStrategy) -> Agent:
         factory = _STRATEGY_FACTORIES[strategy]
     except KeyError as exc:  # pragma: no cover - programming errors
         raise ValueError(f"Unsupported solver strategy: {strategy}") from exc
-    return factory()
+    from .decision_tree import DecisionTree, tree_path
+    from .opening_book import OpeningBook, table_path
+
+    agent = factory()
+    if agent.precomputable and getattr(agent, "first_guess", None):
+        agent.opening_book = OpeningBook.load(agent, table_path(strategy))
+        agent.decision_tree = DecisionTree.load(agent, tree_path(strategy))
+    return agent
 
 
 def get_agent(strategy: SolverStrategy | None = None) -> Agent:
@@ -51,6 +64,9 @@ __all__ = [
     "FrequencyAgent",
     "BetterEntropyAgent",
     "KBeamAgent",
+    "OptimalAgent",
+    "LookaheadAgent",
+    "MCTSAgent",
     "SolverStrategy",
     "get_agent",
 ]
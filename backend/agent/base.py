@@ -1,19 +1,48 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence, Set
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
-from word_manager.word_manager import wordlist
 
-from schema.solve_request import GuessFeedback, SolveRequest
-from schema.solve_response import SolveResponse
+import numpy as np
+
+from word_manager.candidate_cache import HistoryKey, candidate_cache
+from word_manager.candidate_set import CandidateSet
+from word_manager.word_manager import WILDCARD, wordlist
+
+from .endgame import solve_endgame
+
+from schema.solve_request import (
+    GuessFeedback,
+    SearchObjective,
+    SolveMode,
+    SolveParameters,
+    SolveRequest,
+)
+from schema.solve_response import AgentThought, SolveResponse
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .decision_tree import DecisionTree
+    from .opening_book import OpeningBook
 
 
 class Agent(ABC):
     """Interface for the Wordly solving agent."""
 
+    # Modules whose source precomputed tables depend on beyond what the agent's
+    # module imports (see ``agent.opening_book.source_modules``).
+    source_dependencies: Tuple[str, ...] = ()
+    # Agents whose answers depend on a time budget or on chance set this to
+    # False: a table would store one machine's run instead of their search.
+    precomputable = True
+
     def __init__(self) -> None:
-        self.all_words: Set[str] = set(wordlist.words)
+        # Every allowed guess; the candidates are drawn from the answers only.
+        self.all_words = CandidateSet.full(len(wordlist.words))
         self._word_manager = wordlist
+        self._candidate_cache = candidate_cache
+        # Attached by the registry when matching precomputed tables exist.
+        self.opening_book: Optional[OpeningBook] = None
+        self.decision_tree: Optional[DecisionTree] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -32,23 +61,159 @@ class Agent(ABC):
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _apply_history(self, history: Sequence[GuessFeedback]) -> List[str]:
-        candidates: Set[str] = set(self.all_words)
-        for entry in history:
-            guess = entry.guess.upper()
-            feedback = entry.feedback
-            candidates = self._filtered_candidates(candidates, guess, feedback)
-        return sorted(candidates)
+    def _precomputed_response(
+        self, history: Sequence[GuessFeedback], parameters: SolveParameters
+    ) -> Optional[SolveResponse]:
+        """Answer from the compiled decision tree or the opening table, if possible.
+
+        Both are built with default parameters, so requests that change anything
+        but the presentation (allowing repeats, the endgame search, stage widths,
+        ...) are computed live, as are histories the tables do not cover or that
+        hold ``?`` tiles.
+        """
+        if not history or _changes_ranking(parameters):
+            return None
+        if any(WILDCARD in entry.feedback for entry in history):
+            return None
+
+        hit = None
+        if parameters.mode == SolveMode.COMPILED and self.decision_tree is not None:
+            hit = self.decision_tree.walk(history, self._word_manager)
+            source = "Followed the compiled decision tree."
+        if hit is None and self.opening_book is not None and len(history) == 1:
+            hit = self.opening_book.lookup(
+                history[0].guess, self._word_manager.encode_feedback(history[0].feedback)
+            )
+            source = "Served from the precomputed opening table."
+        if hit is None:
+            return None
+
+        ranked, remaining = hit
+        last = history[-1]
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
+        return SolveResponse(
+            next_guess=suggestions[0],
+            suggestions=suggestions,
+            remaining_candidates=remaining,
+            thoughts=[
+                AgentThought(
+                    message=(
+                        f"Processed guess '{last.guess.upper()}' with feedback {last.feedback}."
+                    ),
+                    score=None,
+                ),
+                AgentThought(
+                    message=f"{remaining} candidates remain after filtering.",
+                    score=float(remaining),
+                ),
+                AgentThought(
+                    message=f"Top recommendations: {', '.join(self._to_words(ranked[:3]))}.",
+                    score=None,
+                ),
+                AgentThought(message=source, score=None),
+            ],
+        )
+
+    def _endgame_rerank(
+        self, ranked: np.ndarray, candidates: np.ndarray, parameters: SolveParameters
+    ) -> Tuple[np.ndarray, Optional[AgentThought]]:
+        """Move the exact endgame guess to the front of ``ranked`` if the request opted in."""
+        result = solve_endgame(self._word_manager, candidates, ranked, parameters)
+        if result is None:
+            return ranked, None
+        if result.guess is None:
+            return ranked, AgentThought(
+                message=(
+                    f"Endgame search hit its {parameters.endgame_time_budget:g}s cap after "
+                    f"{result.states} states; kept the strategy's ranking."
+                ),
+                score=None,
+            )
+
+        ranked = np.concatenate(([result.guess], ranked[ranked != result.guess]))
+        measure = (
+            "in the worst case"
+            if parameters.objective == SearchObjective.WORST_CASE
+            else "on average"
+        )
+        return ranked, AgentThought(
+            message=(
+                f"Endgame search: {self._to_words(ranked[:1])[0]} solves the remaining "
+                f"{len(candidates)} candidates in {result.guesses_needed:.3f} guesses "
+                f"{measure} ({result.elapsed * 1000:.0f} ms)."
+            ),
+            score=result.guesses_needed,
+        )
+
+    def _apply_history(self, history: Sequence[GuessFeedback]) -> np.ndarray:
+        """Return the ``int32`` indices of the dictionary words consistent with ``history``.
+
+        The longest already-filtered prefix of ``history`` is taken from the shared
+        candidate cache, so a follow-up request only applies its newest entries.
+        """
+        key = self._history_key(history)
+        depth = len(key)
+        candidates = None
+        while depth > 0:
+            candidates = self._candidate_cache.get(key[:depth])
+            if candidates is not None:
+                break
+            depth -= 1
+
+        if candidates is None:
+            candidates = self._word_manager.answer_indices()
+        for step in range(depth, len(key)):
+            guess, feedback = key[step]
+            candidates = self._candidate_cache.put(
+                key[: step + 1], self._filtered_candidates(candidates, guess, feedback)
+            )
+        return candidates
+
+    @staticmethod
+    def _history_key(history: Sequence[GuessFeedback]) -> HistoryKey:
+        return tuple((entry.guess.upper(), entry.feedback) for entry in history)
 
     def _filtered_candidates(
-        self, candidates: Iterable[str], guess: str, feedback_pattern: str
-    ) -> Set[str]:
-        return {word for word in candidates if self._get_pattern(guess, word) == feedback_pattern}
+        self, candidates: np.ndarray, guess: str, feedback_pattern: str
+    ) -> np.ndarray:
+        return self._word_manager.filter_candidates(candidates, guess, feedback_pattern)
+
+    def _tried_indices(self, history: Sequence[GuessFeedback]) -> np.ndarray:
+        return self._word_manager.words_to_indices([entry.guess for entry in history])
+
+    def _candidate_weights(
+        self, candidates: np.ndarray, parameters: SolveParameters
+    ) -> Optional[np.ndarray]:
+        """The candidates' priors when the request weights entropy by them."""
+        if not parameters.use_priors:
+            return None
+        return self._word_manager.priors()[candidates]
+
+    def _hard_mode_mask(
+        self, history: Sequence[GuessFeedback], parameters: SolveParameters
+    ) -> Optional[np.ndarray]:
+        """Mask of the words hard mode allows: those consistent with every hint so far.
+
+        Remaining candidates always pass, so strategies that only guess
+        candidates need no mask.
+        """
+        if not parameters.hard_mode or not history:
+            return None
+        allowed = np.ones(len(self._word_manager.words), dtype=bool)
+        for guess, feedback in self._history_key(history):
+            allowed &= self._word_manager.consistent_words(guess, feedback)
+        return allowed
 
-    def _get_pattern(self, guess: str, target: str) -> str:
-        guess = guess.upper()
-        target = target.upper()
-        return self._word_manager.get_feedback_pattern(guess, target)
+    @staticmethod
+    def _ranking_depth(history: Sequence[GuessFeedback], parameters: SolveParameters) -> int:
+        """Number of ranked guesses a response can use: suggestions, thoughts, tried words."""
+        depth = max(parameters.max_suggestions, 3)
+        if not parameters.allow_repeats:
+            depth += len(history)
+        return depth
+
+    def _to_words(self, indices: Sequence[int]) -> List[str]:
+        return self._word_manager.indices_to_words(indices)
 
     @staticmethod
     def compute_feedback(guess: str, target: str) -> str:
@@ -76,3 +241,15 @@ class Agent(ABC):
                     pattern[i] = "0"
 
         return "".join(pattern)
+
+
+# Settings that do not change which guesses are ranked, or in which order.
+_PRESENTATION_FIELDS = frozenset({"max_suggestions", "strategy", "mode"})
+
+
+def _changes_ranking(parameters: SolveParameters) -> bool:
+    return any(
+        getattr(parameters, name) != field.default
+        for name, field in SolveParameters.model_fields.items()
+        if name not in _PRESENTATION_FIELDS
+    )
@@ -0,0 +1,40 @@
+"""Solve many requests in one call, sharing work between requests in the same state.
+
+Requests are keyed by strategy, history and parameters, so identical requests are
+solved once. The distinct states are solved in sorted order, which visits the
+histories of a strategy depth-first through their prefix trie: the prefixes of
+the current history are always the most recently filtered, so each shared prefix
+is filtered once and then served from the candidate cache.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+from schema.solve_request import SolveParameters, SolveRequest
+from schema.solve_response import SolveResponse
+
+from . import get_agent
+
+_StateKey = Tuple[str, Tuple[Tuple[str, str], ...], str]
+
+
+def solve_batch(requests: Sequence[SolveRequest]) -> Tuple[List[SolveResponse], int]:
+    """Return the responses in input order and how many distinct states were solved."""
+    keys = [_state_key(request) for request in requests]
+    distinct: Dict[_StateKey, SolveRequest] = {}
+    for key, request in zip(keys, requests):
+        distinct.setdefault(key, request)
+
+    solved: Dict[_StateKey, SolveResponse] = {}
+    for key in sorted(distinct):
+        request = distinct[key]
+        parameters = request.parameters or SolveParameters()
+        solved[key] = get_agent(parameters.strategy).solve(request)
+    return [solved[key] for key in keys], len(solved)
+
+
+def _state_key(request: SolveRequest) -> _StateKey:
+    parameters = request.parameters or SolveParameters()
+    history = tuple((entry.guess.upper(), entry.feedback) for entry in request.history)
+    return parameters.strategy.value, history, parameters.model_dump_json()
@@ -1,8 +1,9 @@
-from typing import Dict, Iterable, List, Sequence
+from typing import List, Sequence, Tuple
 
 import numpy as np
 
 from . import Agent
+from .scoring import shared_scorer, top_k
 from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
 from schema.solve_response import AgentThought, SolveResponse
 
@@ -13,10 +14,8 @@ class BetterEntropyAgent(Agent):
     def __init__(self) -> None:
         super().__init__()
         self.first_guess = "ROATE"
-        self._ordered_words: List[str] = list(self._word_manager.words)
-        self.all_words = set(self._ordered_words)  # ensure base set stays aligned
-        self._pattern_space = 3**5  # 243 possible feedback codes for 5 letters
-        self._batch_size = 64
+        self._ordered_indices = self._word_manager.all_indices()
+        self._scorer = shared_scorer(duplicate_penalty=0.1)
 
     """Agent implementation powering Wordly solving endpoints."""
 
@@ -31,7 +30,7 @@ class BetterEntropyAgent(Agent):
             return SolveResponse(
                 next_guess=opener,
                 suggestions=[opener][: parameters.max_suggestions],
-                remaining_candidates=len(self.all_words),
+                remaining_candidates=self._word_manager.answer_count,
                 thoughts=[
                     AgentThought(
                         message="No prior guesses supplied; using default opener.",
@@ -40,6 +39,10 @@ class BetterEntropyAgent(Agent):
                 ],
             )
 
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
         candidates = self._apply_history(history)
         remaining = len(candidates)
 
@@ -56,47 +59,77 @@ class BetterEntropyAgent(Agent):
                 ],
             )
 
-        ranked = self._rank_candidates(candidates, history, parameters)
-        suggestions = ranked[: parameters.max_suggestions]
+        ranked, pruned = self._rank_candidates(candidates, history, parameters)
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
         next_guess = suggestions[0] if suggestions else None
 
+        thoughts = self._describe_decision(history, remaining, self._to_words(ranked[:3]), pruned)
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
         return SolveResponse(
             next_guess=next_guess,
             suggestions=suggestions,
             remaining_candidates=remaining,
-            thoughts=self._describe_decision(history, remaining, ranked[:3]),
+            thoughts=thoughts,
         )
 
     def _rank_candidates(
         self,
-        candidates: Sequence[str],
+        candidates: np.ndarray,
         history: Sequence[GuessFeedback],
         parameters: SolveParameters,
-    ) -> List[str]:
+    ) -> Tuple[np.ndarray, int]:
+        """Rank all words by entropy over ``candidates``; also return how many were pruned.
+
+        Candidates are scored first: the ``depth``-th best of them is a score the
+        final top ``depth`` must reach, so any other guess whose upper bound is
+        strictly below it is skipped without touching the matrix. Pruned guesses
+        could never enter the top ``depth``, so the ranking is unchanged.
+        """
         if len(candidates) <= 2:
-            return list(candidates)
-
-        # Calculate entropy for ALL words (not just candidates)
-        # This allows exploring words that eliminate more possibilities
-        entropy_scores = self._batched_entropy_scores(self._ordered_words, candidates)
-
-        # Sort by entropy descending, including all words, not just candidates
-        ranked = sorted(
-            self._ordered_words,
-            key=lambda word: entropy_scores[word],
-            reverse=True,
-        )
+            return candidates, 0
+
+        depth = self._ranking_depth(history, parameters)
+        entropy_scores = np.full(len(self._ordered_indices), -np.inf)
+        weights = self._candidate_weights(candidates, parameters)
+        entropy_scores[candidates] = self._scorer.scores(candidates, candidates, weights)
+
+        threshold = -np.inf
+        if len(candidates) >= depth:
+            threshold = entropy_scores[candidates][top_k(entropy_scores[candidates], depth)[-1]]
+
+        # Calculate entropy for the other words too: a non-candidate can split
+        # the candidates better than any candidate does.
+        # In hard mode the mask drops inconsistent words before any scoring.
+        allowed = self._hard_mode_mask(history, parameters)
+        if allowed is None:
+            others = np.ones(len(self._ordered_indices), dtype=bool)
+        else:
+            # A copy: clearing the candidates must not drop them from ``allowed``.
+            others = allowed.copy()
+        others[candidates] = False
+        others = self._ordered_indices[others]
+        bounds = self._scorer.upper_bounds(others, candidates)
+        survivors = others[bounds >= threshold]
+        entropy_scores[survivors] = self._scorer.scores(survivors, candidates, weights)
+
+        # Keep the best entropies across all words, not just candidates
+        ranked = self._ordered_indices[top_k(entropy_scores, depth)]
+        if allowed is not None:
+            ranked = ranked[allowed[ranked]]
 
         if not parameters.allow_repeats:
-            tried = {entry.guess.upper() for entry in history}
-            ranked = [word for word in ranked if word not in tried]
-        return ranked
+            ranked = ranked[~np.isin(ranked, self._tried_indices(history))]
+        return ranked, len(others) - len(survivors)
 
     def _describe_decision(
         self,
         history: Sequence[GuessFeedback],
         remaining_candidates: int,
         top_ranked: Sequence[str],
+        pruned: int = 0,
     ) -> List[AgentThought]:
         thoughts: List[AgentThought] = []
 
@@ -118,6 +151,17 @@ class BetterEntropyAgent(Agent):
             )
         )
 
+        if pruned:
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Skipped {pruned} of {len(self._ordered_indices)} guesses whose "
+                        "entropy upper bound could not reach the top recommendations."
+                    ),
+                    score=float(pruned),
+                )
+            )
+
         if top_ranked:
             joined = ", ".join(top_ranked)
             thoughts.append(
@@ -128,51 +172,3 @@ class BetterEntropyAgent(Agent):
             )
 
         return thoughts
-
-    def _batched_entropy_scores(
-        self,
-        guesses: Iterable[str],
-        candidates: Sequence[str],
-    ) -> Dict[str, float]:
-        guess_list = [word.upper() for word in guesses]
-        candidate_list = [word.upper() for word in candidates]
-        if not guess_list or not candidate_list:
-            return {word: 0.0 for word in guess_list}
-
-        candidate_indices = self._word_manager.words_to_indices(candidate_list)
-        guess_indices = self._word_manager.words_to_indices(guess_list)
-
-        scores: Dict[str, float] = {}
-        chunk_size = max(1, self._batch_size)
-        for start in range(0, len(guess_list), chunk_size):
-            chunk_words = guess_list[start : start + chunk_size]
-            chunk_indices = guess_indices[start : start + chunk_size]
-            codes = self._word_manager.feedback_codes(chunk_indices, candidate_indices)
-            entropies = self._entropy_from_codes(codes)
-            for word, base_entropy in zip(chunk_words, entropies):
-                scores[word] = base_entropy - self._duplicate_penalty(word)
-
-        return scores
-
-    def _entropy_from_codes(self, codes: np.ndarray) -> np.ndarray:
-        if codes.size == 0:
-            return np.zeros(codes.shape[0])
-
-        num_rows = codes.shape[0]
-        offsets = (np.arange(num_rows, dtype=np.int64) * self._pattern_space)[:, None]
-        flattened = codes.astype(np.int64, copy=False) + offsets
-        hist = np.bincount(flattened.ravel(), minlength=num_rows * self._pattern_space).reshape(
-            num_rows, self._pattern_space
-        )
-        hist = hist.astype(np.float64, copy=False)
-
-        totals = hist.sum(axis=1, keepdims=True)
-        with np.errstate(divide="ignore", invalid="ignore"):
-            probs = np.divide(hist, totals, out=np.zeros_like(hist), where=totals != 0)
-            entropy = -np.sum(np.where(probs > 0, probs * np.log2(probs), 0.0), axis=1)
-        return entropy
-
-    @staticmethod
-    def _duplicate_penalty(guess: str) -> float:
-        unique_letters = len(set(guess))
-        return (5 - unique_letters) * 0.1
@@ -0,0 +1,231 @@
+"""Compiled decision trees: a strategy's whole game plan as memory-mapped arrays.
+
+``python -m agent.decision_tree`` plays a strategy against every dictionary word
+at once. Each node is one state the strategy can reach by following its own
+suggestions; it stores the ranked suggestions for that state and one child per
+feedback code the top suggestion can produce. A request in ``compiled`` mode then
+walks the tree with its history, one child lookup per guess, instead of filtering
+and scoring. Histories that leave the tree (a guess other than the tree's, or a
+table built for different settings) are computed live.
+
+Trees are stored as a directory of ``.npy`` arrays in CSR layout:
+
+* ``suggestions`` -- ``nodes x 5`` ``int32`` dictionary indices, ``-1`` padded;
+  column 0 is the guess the node branches on.
+* ``remaining`` -- candidate count of each node.
+* ``child_offsets`` -- ``nodes + 1`` offsets into the edge arrays.
+* ``edge_codes`` / ``edge_children`` -- feedback code and child node of each
+  edge, sorted by code within a node.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+from word_manager.word_manager import WordListManager
+
+from .opening_book import agent_fingerprint
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .base import Agent
+
+_NODE_SUGGESTIONS = 5  # SolveParameters.max_suggestions upper bound
+_SOLVED_CODE = 3**5 - 1
+# Deeper states are left to live computation; no sane strategy gets there.
+_MAX_DEPTH = 12
+_TABLE_DIR = Path(__file__).resolve().parent.parent / "word_manager"
+_ARRAYS = ("suggestions", "remaining", "child_offsets", "edge_codes", "edge_children")
+
+
+class DecisionTree:
+    """Read-only decision tree of one strategy, usually backed by memory maps."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], fingerprint: str) -> None:
+        self.suggestions = arrays["suggestions"]
+        self.remaining = arrays["remaining"]
+        self.child_offsets = arrays["child_offsets"]
+        self.edge_codes = arrays["edge_codes"]
+        self.edge_children = arrays["edge_children"]
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.remaining)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def compile(
+        cls,
+        agent: "Agent",
+        progress: Optional[Callable[[int, int], None]] = None,
+        parameters: Optional[SolveParameters] = None,
+    ) -> "DecisionTree":
+        """Expand every state ``agent`` reaches by following its own top suggestion.
+
+        ``progress`` is called with the number of compiled and discovered nodes;
+        ``parameters`` are the solve settings to compile for (always five
+        suggestions per node). The agent must not have a tree attached,
+        otherwise it would copy itself.
+        """
+        word_manager = agent._word_manager
+        parameters = (parameters or SolveParameters()).model_copy(
+            update={"max_suggestions": _NODE_SUGGESTIONS}
+        )
+        suggestions: List[np.ndarray] = []
+        remaining: List[int] = []
+        child_offsets: List[int] = [0]
+        edge_codes: List[int] = []
+        edge_children: List[int] = []
+
+        # Breadth-first, so node ids are assigned in the order nodes are compiled
+        # and each node's edges are appended contiguously.
+        queue: deque[List[GuessFeedback]] = deque([[]])
+        discovered = 1
+        while queue:
+            history = queue.popleft()
+            response = agent.solve(SolveRequest(history=history, parameters=parameters))
+            row = np.full(_NODE_SUGGESTIONS, -1, dtype=np.int32)
+            if response.suggestions:
+                row[: len(response.suggestions)] = word_manager.words_to_indices(
+                    response.suggestions
+                )
+            suggestions.append(row)
+            remaining.append(response.remaining_candidates)
+
+            guess = response.next_guess
+            if guess and len(history) < _MAX_DEPTH:
+                candidates = agent._apply_history(history)
+                codes, counts = np.unique(
+                    word_manager.feedback_row(guess)[candidates], return_counts=True
+                )
+                for code, count in zip(codes.tolist(), counts.tolist()):
+                    # A guess that does not split its state would loop forever.
+                    if code == _SOLVED_CODE or count == len(candidates):
+                        continue
+                    feedback = word_manager.decode_feedback(code)
+                    queue.append(history + [GuessFeedback(guess=guess, feedback=feedback)])
+                    edge_codes.append(code)
+                    edge_children.append(discovered)
+                    discovered += 1
+            child_offsets.append(len(edge_codes))
+
+            if progress is not None:
+                progress(len(remaining), discovered)
+
+        arrays = {
+            "suggestions": np.array(suggestions, dtype=np.int32).reshape(-1, _NODE_SUGGESTIONS),
+            "remaining": np.array(remaining, dtype=np.int32),
+            "child_offsets": np.array(child_offsets, dtype=np.int32),
+            "edge_codes": np.array(edge_codes, dtype=np.uint8),
+            "edge_children": np.array(edge_children, dtype=np.int32),
+        }
+        return cls(arrays, agent_fingerprint(agent))
+
+    @classmethod
+    def load(cls, agent: "Agent", path: Path) -> Optional["DecisionTree"]:
+        """Memory-map the tree stored at ``path`` if it still matches ``agent``."""
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return None
+        with open(meta_path, "r") as handle:
+            fingerprint = json.load(handle)["fingerprint"]
+        if fingerprint != agent_fingerprint(agent):
+            print(f"⚠️  Ignoring stale decision tree {path.name}; recompile it to use it")
+            return None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        return cls(arrays, fingerprint)
+
+    def save(self, path: Path) -> None:
+        # Write a sibling directory and swap it in, so readers never see half a tree.
+        partial_path = path.with_name(path.name + ".partial")
+        shutil.rmtree(partial_path, ignore_errors=True)
+        partial_path.mkdir(parents=True)
+        for name in _ARRAYS:
+            np.save(partial_path / f"{name}.npy", getattr(self, name))
+        with open(partial_path / "meta.json", "w") as handle:
+            json.dump({"fingerprint": self.fingerprint, "nodes": len(self)}, handle)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(partial_path, path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def walk(
+        self, history: Sequence[GuessFeedback], word_manager: WordListManager
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        """Return ``(ranked indices, remaining)`` of the node ``history`` leads to.
+
+        Returns ``None`` as soon as a guess differs from the node's own guess or
+        its feedback has no child.
+        """
+        index = word_manager.get_index_mapping()
+        node = 0
+        for entry in history:
+            if index.get(entry.guess.upper()) != self.suggestions[node, 0]:
+                return None
+            code = word_manager.encode_feedback(entry.feedback)
+            start, stop = self.child_offsets[node], self.child_offsets[node + 1]
+            position = start + int(np.searchsorted(self.edge_codes[start:stop], code))
+            if position == stop or self.edge_codes[position] != code:
+                return None
+            node = int(self.edge_children[position])
+
+        ranked = self.suggestions[node]
+        ranked = ranked[ranked >= 0]
+        if not ranked.size:
+            return None
+        return ranked, int(self.remaining[node])
+
+
+def tree_path(strategy: SolverStrategy) -> Path:
+    return _TABLE_DIR / f"tree_{strategy.value}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Compile decision trees: ``python -m agent.decision_tree [strategy ...]``."""
+    from . import _STRATEGY_FACTORIES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "strategies",
+        nargs="*",
+        choices=[strategy.value for strategy in SolverStrategy],
+        help="strategies to compile (default: every strategy with a fixed opener)",
+    )
+    args = parser.parse_args(argv)
+    selected = [SolverStrategy(value) for value in args.strategies] or list(_STRATEGY_FACTORIES)
+
+    for strategy in selected:
+        agent = _STRATEGY_FACTORIES[strategy]()
+        if not agent.precomputable or not getattr(agent, "first_guess", None):
+            print(f"⏭️  Skipping {strategy.value}: its guesses are not deterministic")
+            continue
+
+        started = time.perf_counter()
+
+        def report(compiled: int, discovered: int) -> None:
+            if compiled % 1000 == 0 or compiled == discovered:
+                elapsed = time.perf_counter() - started
+                print(f"   {strategy.value}: {compiled}/{discovered} nodes ({elapsed:.1f}s)")
+
+        tree = DecisionTree.compile(agent, progress=report)
+        path = tree_path(strategy)
+        tree.save(path)
+        print(f"✅ Stored {len(tree)}-node decision tree for {strategy.value} at {path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Exact endgame search that any strategy can opt into through ``SolveParameters``.
+
+One-step heuristics often waste a guess on the last few dozen candidates. With
+``endgame`` enabled and at most ``endgame_threshold`` candidates left, the state
+is searched exactly on its candidate submatrix: the candidates themselves plus
+the strategy's own top suggestions are the only guesses, so every node works on
+a ``candidates x (candidates + shortlist)`` block that is sliced once per
+request. A search and its transposition table are kept per objective and guess
+pool, so a state requested again (or reached again with the same shortlist) is
+answered from the table. The search gives up after ``endgame_time_budget``
+seconds, keeping the strategy's ranking.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from schema.solve_request import SearchObjective, SolveParameters
+from word_manager.word_manager import WordListManager, wordlist
+
+from .exact_search import ExactSearch, SearchTimeout
+from .scoring import shared_scorer
+
+# The strategy's own best guesses join the candidates as possible guesses.
+_SHORTLIST = 5
+# Searches kept for recently seen (objective, guess pool) pairs.
+_MAX_SEARCHES = 256
+# Endgame states are small, so each search's table stays small as well.
+_MAX_ENTRIES = 10_000
+
+_SearchKey = Tuple[WordListManager, SearchObjective, bytes]
+_searches: "OrderedDict[_SearchKey, Tuple[ExactSearch, Lock]]" = OrderedDict()
+_searches_lock = Lock()
+
+
+class EndgameResult(NamedTuple):
+    """Outcome of one endgame search; ``guess`` is ``None`` if it ran out of time."""
+
+    guess: Optional[int]
+    guesses_needed: Optional[float]
+    elapsed: float
+    states: int
+
+
+def solve_endgame(
+    word_manager: WordListManager,
+    candidates: np.ndarray,
+    ranked: np.ndarray,
+    parameters: SolveParameters,
+) -> Optional[EndgameResult]:
+    """Search ``candidates`` exactly if the request opted in and the state is small.
+
+    Returns ``None`` when the endgame does not apply; two or fewer candidates are
+    already solved optimally by guessing one of them.
+    """
+    if not parameters.endgame or not 2 < len(candidates) <= parameters.endgame_threshold:
+        return None
+
+    pool = np.union1d(candidates, ranked[:_SHORTLIST]).astype(np.int32)
+    search, lock = _search_for(word_manager, parameters.objective, pool)
+    with lock:
+        started = time.time()
+        nodes = search.nodes
+        try:
+            value, guess = search.solve(
+                candidates, deadline=started + parameters.endgame_time_budget
+            )
+        except SearchTimeout:
+            return EndgameResult(None, None, time.time() - started, search.nodes - nodes)
+        return EndgameResult(
+            guess,
+            search.expected_guesses(value, len(candidates)),
+            time.time() - started,
+            search.nodes - nodes,
+        )
+
+
+def _search_for(
+    word_manager: WordListManager, objective: SearchObjective, pool: np.ndarray
+) -> Tuple[ExactSearch, Lock]:
+    """Return the cached search over ``pool`` and the lock serializing its use."""
+    key = (word_manager, objective, pool.tobytes())
+    with _searches_lock:
+        entry = _searches.get(key)
+        if entry is not None:
+            _searches.move_to_end(key)
+            return entry
+        scorer = shared_scorer() if word_manager is wordlist else None
+        search = ExactSearch(
+            word_manager, objective, max_entries=_MAX_ENTRIES, guess_pool=pool, scorer=scorer
+        )
+        entry = _searches[key] = (search, Lock())
+        while len(_searches) > _MAX_SEARCHES:
+            _searches.popitem(last=False)
+        return entry
@@ -1,8 +1,9 @@
-from typing import Dict, List, Sequence
+from typing import List, Sequence
 
 import numpy as np
 
 from . import Agent
+from .scoring import shared_scorer, top_k
 from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
 from schema.solve_response import AgentThought, SolveResponse
 
@@ -13,8 +14,7 @@ class EntropyAgent(Agent):
     def __init__(self) -> None:
         super().__init__()
         self.first_guess = "ROATE"
-        self._pattern_space = 3**5
-        self._batch_size = 128
+        self._scorer = shared_scorer(duplicate_penalty=0.05)
 
     """Agent implementation powering Wordly solving endpoints."""
 
@@ -29,7 +29,7 @@ class EntropyAgent(Agent):
             return SolveResponse(
                 next_guess=opener,
                 suggestions=[opener][: parameters.max_suggestions],
-                remaining_candidates=len(self.all_words),
+                remaining_candidates=self._word_manager.answer_count,
                 thoughts=[
                     AgentThought(
                         message="No prior guesses supplied; using default opener.",
@@ -38,6 +38,10 @@ class EntropyAgent(Agent):
                 ],
             )
 
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
         candidates = self._apply_history(history)
         remaining = len(candidates)
 
@@ -55,88 +59,40 @@ class EntropyAgent(Agent):
             )
 
         ranked = self._rank_candidates(candidates, history, parameters)
-        suggestions = ranked[: parameters.max_suggestions]
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
         next_guess = suggestions[0] if suggestions else None
 
+        thoughts = self._describe_decision(history, remaining, self._to_words(ranked[:3]))
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
         return SolveResponse(
             next_guess=next_guess,
             suggestions=suggestions,
             remaining_candidates=remaining,
-            thoughts=self._describe_decision(history, remaining, ranked[:3]),
+            thoughts=thoughts,
         )
 
     def _rank_candidates(
         self,
-        candidates: Sequence[str],
+        candidates: np.ndarray,
         history: Sequence[GuessFeedback],
         parameters: SolveParameters,
-    ) -> List[str]:
+    ) -> np.ndarray:
         if len(candidates) <= 2:
-            return list(candidates)
+            return candidates
 
-        entropy_scores = self._batched_entropy_scores(candidates, candidates)
-
-        ranked = sorted(
-            candidates,
-            key=lambda word: entropy_scores[word],
-            reverse=True,
-        )
+        weights = self._candidate_weights(candidates, parameters)
+        entropy_scores = self._scorer.scores(candidates, candidates, weights)
+        ranked = candidates[top_k(entropy_scores, self._ranking_depth(history, parameters))]
 
         if not parameters.allow_repeats:
-            tried = {entry.guess.upper() for entry in history}
-            ranked = [word for word in ranked if word not in tried] or ranked
+            untried = ranked[~np.isin(ranked, self._tried_indices(history))]
+            ranked = untried if untried.size else ranked
 
         return ranked
 
-    def _batched_entropy_scores(
-        self,
-        guesses: Sequence[str],
-        candidates: Sequence[str],
-    ) -> Dict[str, float]:
-        guess_list = [word.upper() for word in guesses]
-        candidate_list = [word.upper() for word in candidates]
-        if not guess_list or not candidate_list:
-            return {word: 0.0 for word in guess_list}
-
-        guess_indices = self._word_manager.words_to_indices(guess_list)
-        candidate_indices = self._word_manager.words_to_indices(candidate_list)
-
-        scores: Dict[str, float] = {}
-        for start in range(0, len(guess_list), self._batch_size):
-            chunk_words = guess_list[start : start + self._batch_size]
-            chunk_indices = guess_indices[start : start + self._batch_size]
-            codes = self._word_manager.feedback_codes(chunk_indices, candidate_indices)
-            entropies = self._entropy_from_codes(codes)
-            for word, entropy in zip(chunk_words, entropies):
-                scores[word] = entropy - self._duplicate_penalty(word)
-
-        return scores
-
-    def _entropy_from_codes(self, codes: np.ndarray) -> np.ndarray:
-        if codes.size == 0:
-            return np.zeros(codes.shape[0])
-
-        num_rows = codes.shape[0]
-        offsets = (np.arange(num_rows, dtype=np.int64) * self._pattern_space)[:, None]
-        flattened = codes.astype(np.int64, copy=False) + offsets
-        hist = np.bincount(flattened.ravel(), minlength=num_rows * self._pattern_space).reshape(
-            num_rows, self._pattern_space
-        )
-        hist = hist.astype(np.float64, copy=False)
-
-        totals = hist.sum(axis=1, keepdims=True)
-        with np.errstate(divide="ignore", invalid="ignore"):
-            probs = np.divide(hist, totals, out=np.zeros_like(hist), where=totals != 0)
-            entropy = -np.sum(np.where(probs > 0, probs * np.log2(probs), 0.0), axis=1)
-        return entropy
-
-    @staticmethod
-    def _duplicate_penalty(word: str) -> float:
-        unique_letters = len(set(word))
-        if unique_letters < 5:
-            return (5 - unique_letters) * 0.05
-        return 0.0
-
     def _describe_decision(
         self,
         history: Sequence[GuessFeedback],
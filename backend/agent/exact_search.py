@@ -0,0 +1,317 @@
+"""Exact branch-and-bound search over the guesses of a candidate state.
+
+A state is a set of candidates that still fit the history. Its value is the total
+number of guesses needed to solve every candidate in it (the expected guess count
+times the candidate count), or the worst-case number of guesses, when each
+guess is chosen optimally. Guesses are tried in entropy order, candidates first.
+A guess is skipped when a lower bound computed from its feedback bucket sizes
+cannot beat the best guess found so far, and each bucket is searched with only
+the budget the guess has left. Solved states and proven lower bounds are kept in
+a transposition table keyed by the candidates' ``CandidateSet``, so a state
+reached through different histories is searched once.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import SearchObjective
+from word_manager.candidate_set import CandidateSet
+from word_manager.word_manager import WordListManager
+
+from .scoring import PATTERN_SPACE, EntropyScorer
+
+_SOLVED_CODE = PATTERN_SPACE - 1
+# Same cache-sized chunking as the entropy kernel.
+_TARGET_CELLS = 1 << 16
+_MIN_CHUNK_GUESSES = 16
+_PROGRESS_INTERVAL = 10_000
+
+# (value, best guess or -1, exact?) -- inexact entries hold a proven lower bound.
+TableEntry = Tuple[int, int, bool]
+PlanStep = Tuple[np.ndarray, int, int]
+
+
+class SearchTimeout(RuntimeError):
+    """Raised when an exact search runs past its deadline."""
+
+
+class ExactSearch:
+    """Branch-and-bound search for the optimal guess of a candidate state.
+
+    ``guess_limit`` caps how many non-candidate guesses are tried per state, best
+    entropy first; without it the search is exact over the whole dictionary, or
+    over ``guess_pool`` (ascending dictionary indices that must include every
+    searched candidate) when one is given. The transposition table is kept between
+    calls and cleared once it holds more than ``max_entries`` states. ``scorer``
+    lets callers share an existing scorer's per-word tables.
+    """
+
+    def __init__(
+        self,
+        word_manager: WordListManager,
+        objective: SearchObjective = SearchObjective.EXPECTED_GUESSES,
+        guess_limit: Optional[int] = None,
+        max_entries: int = 1_000_000,
+        progress: Optional[Callable[[int], None]] = None,
+        guess_pool: Optional[np.ndarray] = None,
+        scorer: Optional[EntropyScorer] = None,
+    ) -> None:
+        self._word_manager = word_manager
+        self.objective = objective
+        self.guess_limit = guess_limit
+        self.max_entries = max_entries
+        self.progress = progress
+        self.table: Dict[CandidateSet, TableEntry] = {}
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._universe = word_manager.answer_count
+        self._full_pool = guess_pool is None
+        self._guess_pool = word_manager.all_indices() if guess_pool is None else guess_pool
+        self._scorer = scorer or EntropyScorer(word_manager)
+
+        counts = np.arange(self._universe + 1, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            self._log2 = np.where(counts > 0, np.log2(counts), 0.0)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def solve(self, candidates: np.ndarray, deadline: Optional[float] = None) -> Tuple[int, int]:
+        """Return ``(value, best guess index)`` for the ascending ``candidates``.
+
+        ``deadline`` is a ``time.time()`` timestamp; past it ``SearchTimeout`` is
+        raised. Everything proven before that stays in the table.
+        """
+        known = self.lookup(candidates)
+        if known is not None:
+            return known
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+
+        self._deadline = deadline
+        block = np.asarray(self._word_manager.target_codes(candidates))
+        if not self._full_pool:
+            block = block[:, self._guess_pool]
+        self._search(candidates, block, math.inf)
+        return self.lookup(candidates)
+
+    def lookup(self, candidates: np.ndarray) -> Optional[Tuple[int, int]]:
+        """Return ``(value, best guess index)`` if the state is already solved."""
+        if len(candidates) <= 2:
+            return self._trivial_value(len(candidates)), int(candidates[0])
+        entry = self.table.get(CandidateSet.from_indices(candidates, self._universe))
+        if entry is None or not entry[2]:
+            return None
+        return entry[0], entry[1]
+
+    def plan(self, candidates: np.ndarray) -> List[PlanStep]:
+        """Return ``(candidates, guess, value)`` for every solved state of the optimal plan."""
+        steps: List[PlanStep] = []
+        stack = [np.asarray(candidates, dtype=np.int32)]
+        while stack:
+            state = stack.pop()
+            if len(state) <= 2:
+                continue
+            value, guess = self.lookup(state)
+            steps.append((state, guess, value))
+            codes = self._word_manager.feedback_row(self._word_manager.words[guess])[state]
+            for code in np.unique(codes):
+                if code != _SOLVED_CODE:
+                    stack.append(state[codes == code])
+        return steps
+
+    def adopt(self, steps: Sequence[PlanStep]) -> None:
+        """Load solved states, e.g. a plan certified by another process."""
+        for state, guess, value in steps:
+            key = CandidateSet.from_indices(state, self._universe)
+            self.table[key] = (int(value), int(guess), True)
+
+    def expected_guesses(self, value: int, candidate_count: int) -> float:
+        if self.objective == SearchObjective.WORST_CASE:
+            return float(value)
+        return value / candidate_count
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _search(self, candidates: np.ndarray, block: np.ndarray, beta: float) -> int:
+        """Return the state's value if it is below ``beta``, else a lower bound ``>= beta``."""
+        candidate_count = len(candidates)
+        if candidate_count <= 2:
+            return self._trivial_value(candidate_count)
+
+        key = CandidateSet.from_indices(candidates, self._universe)
+        entry = self.table.get(key)
+        if entry is not None and (entry[2] or entry[0] >= beta):
+            return entry[0]
+        floor = self._state_floor(candidate_count)
+        if entry is not None:
+            floor = max(floor, entry[0])
+        if floor >= beta:
+            return floor
+        self._tick()
+
+        # Candidates first: one of them often reaches the floor, and a guess
+        # outside the state can never do better than splitting it into singletons.
+        inside = np.searchsorted(self._guess_pool, candidates)
+        best, best_guess = self._best_of(candidates, block, inside, floor, math.inf, -1, beta)
+        if best > floor and min(best, beta) > self._outsider_floor(candidate_count):
+            others = np.ones(len(self._guess_pool), dtype=bool)
+            others[inside] = False
+            others = np.flatnonzero(others)
+            # Letters absent from every candidate cap how many codes a guess can
+            # produce; drop guesses whose resulting bound already loses.
+            reachable = self._scorer.reachable_codes(self._guess_pool[others], candidates)
+            others = others[self._outsider_bound(reachable, candidate_count) < min(best, beta)]
+            best, best_guess = self._best_of(
+                candidates, block, others, floor, best, best_guess, beta, self.guess_limit
+            )
+
+        if best < beta:
+            self.table[key] = (int(best), best_guess, True)
+            return int(best)
+        # Every guess needs at least ``beta``; remember that as the state's bound.
+        bound = int(math.ceil(beta))
+        self.table[key] = (bound, -1, False)
+        return bound
+
+    def _best_of(
+        self,
+        candidates: np.ndarray,
+        block: np.ndarray,
+        columns: np.ndarray,
+        floor: int,
+        best: float,
+        best_guess: int,
+        beta: float,
+        limit_guesses: Optional[int] = None,
+    ) -> Tuple[float, int]:
+        """Try the pool's ``columns`` in entropy order; return the improved ``(best, guess)``."""
+        codes = block[:, columns]
+        if not codes.shape[1]:
+            return best, best_guess
+        entropy, bound, splits = self._guess_stats(codes)
+        order = np.flatnonzero(splits & (bound < min(best, beta)))
+        order = order[np.argsort(-entropy[order], kind="stable")][:limit_guesses]
+        # Guesses with identical code columns split the state identically.
+        _, first = np.unique(codes[:, order].T, axis=0, return_index=True)
+        order = order[np.sort(first)]
+
+        for column, column_bound in zip(order.tolist(), bound[order].tolist()):
+            limit = min(best, beta)
+            if column_bound >= limit:
+                continue
+            value = self._evaluate(candidates, block, codes[:, column], limit)
+            if value < limit:
+                best, best_guess = value, int(self._guess_pool[columns[column]])
+                if best == floor:
+                    break
+        return best, best_guess
+
+    def _evaluate(
+        self, candidates: np.ndarray, block: np.ndarray, column: np.ndarray, limit: float
+    ) -> float:
+        """Value of guessing ``column``'s word, or any value ``>= limit`` once it cannot win."""
+        order = np.argsort(column, kind="stable")
+        sorted_codes = column[order]
+        edges = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+        buckets = [
+            rows
+            for rows, code in zip(np.split(order, edges), sorted_codes[np.r_[0, edges]])
+            if code != _SOLVED_CODE
+        ]
+        # Largest buckets first: they dominate the value and fail fastest.
+        buckets.sort(key=len, reverse=True)
+
+        if self.objective == SearchObjective.WORST_CASE:
+            worst = 1 + max((self._state_floor(len(rows)) for rows in buckets), default=0)
+            for rows in buckets:
+                if worst >= limit:
+                    break
+                value = self._search(candidates[rows], block[rows], limit - 1)
+                worst = max(worst, 1 + value)
+            return worst
+
+        total = len(candidates) + sum(self._state_floor(len(rows)) for rows in buckets)
+        for rows in buckets:
+            if total >= limit:
+                break
+            floor = self._state_floor(len(rows))
+            value = self._search(candidates[rows], block[rows], limit - (total - floor))
+            total += value - floor
+        return total
+
+    def _guess_stats(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return entropy, value lower bound and "splits the state" for each column."""
+        candidate_count, guess_count = codes.shape
+        entropy = np.empty(guess_count, dtype=np.float64)
+        bound = np.empty(guess_count, dtype=np.int64)
+        splits = np.empty(guess_count, dtype=bool)
+
+        chunk = max(_MIN_CHUNK_GUESSES, _TARGET_CELLS // candidate_count)
+        offsets = (np.arange(chunk, dtype=np.intp) * PATTERN_SPACE)[None, :]
+        log_total = np.log2(candidate_count)
+        for start in range(0, guess_count, chunk):
+            part = codes[:, start : start + chunk]
+            width = part.shape[1]
+            keys = np.add(part, offsets[:, :width], dtype=np.intp)
+            sizes = np.bincount(keys.ravel(), minlength=width * PATTERN_SPACE)[keys]
+            window = slice(start, start + width)
+
+            entropy[window] = log_total - self._log2[sizes].sum(axis=0) / candidate_count
+            open_rows = part != _SOLVED_CODE
+            largest = np.where(open_rows, sizes, 0).max(axis=0)
+            splits[window] = largest < candidate_count
+            if self.objective == SearchObjective.WORST_CASE:
+                bound[window] = 1 + np.where(
+                    largest == 0, 0, np.where(largest == 1, 1, np.where(largest <= 243, 2, 3))
+                )
+            else:
+                # Every open bucket of size s needs at least 2s - 1 more guesses.
+                open_buckets = np.rint((open_rows / sizes).sum(axis=0)).astype(np.int64)
+                bound[window] = candidate_count + 2 * open_rows.sum(axis=0) - open_buckets
+        return entropy, bound, splits
+
+    def _state_floor(self, candidate_count: int) -> int:
+        """Lower bound on a state's value from its size alone."""
+        if self.objective == SearchObjective.WORST_CASE:
+            if candidate_count <= 1:
+                return candidate_count
+            return 2 if candidate_count <= PATTERN_SPACE else 3
+        # Best case: one guess solves a candidate and splits the rest into singletons,
+        # which holds for at most 242 of them.
+        if candidate_count == 0:
+            return 0
+        return 2 * candidate_count - 1 + max(0, candidate_count - PATTERN_SPACE)
+
+    def _outsider_floor(self, candidate_count: int) -> int:
+        """Lower bound on a state's value when guessing a word outside it."""
+        if self.objective == SearchObjective.WORST_CASE:
+            return 2 if candidate_count < PATTERN_SPACE else 3
+        return 2 * candidate_count + max(0, candidate_count - (PATTERN_SPACE - 1))
+
+    def _outsider_bound(self, reachable: np.ndarray, candidate_count: int) -> np.ndarray:
+        """Per-guess lower bound for outside guesses that produce at most ``reachable`` codes."""
+        if self.objective == SearchObjective.WORST_CASE:
+            return np.where(reachable >= candidate_count, 2, 3)
+        # n for this guess plus 2s - 1 per bucket, over at most ``reachable`` buckets.
+        return 3 * candidate_count - np.minimum(reachable, candidate_count)
+
+    def _trivial_value(self, candidate_count: int) -> int:
+        if self.objective == SearchObjective.WORST_CASE:
+            return candidate_count
+        return {0: 0, 1: 1, 2: 3}[candidate_count]
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self._deadline is not None and time.time() > self._deadline:
+            raise SearchTimeout(f"Exact search stopped after {self.nodes} states")
+        if self.progress is not None and self.nodes % _PROGRESS_INTERVAL == 0:
+            self.progress(self.nodes)
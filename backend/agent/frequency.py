@@ -3,10 +3,12 @@ Systematic exploration with frequency-based scoring.
 This algorithm uses letter and position frequency to choose the best guess.
 """
 
-from collections import Counter
-from typing import Dict, List, Sequence
+from typing import List, Sequence
+
+import numpy as np
 
 from agent.base import Agent
+from agent.letter_stats import shared_letter_statistics
 from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
 from schema.solve_response import AgentThought, SolveResponse
 
@@ -17,6 +19,7 @@ class FrequencyAgent(Agent):
     def __init__(self) -> None:
         super().__init__()
         self.first_guess = "TARES"
+        self._letter_stats = shared_letter_statistics(duplicate_penalty=0.1)
 
     """Agent implementation powering Wordly solving endpoints."""
 
@@ -31,7 +34,7 @@ class FrequencyAgent(Agent):
             return SolveResponse(
                 next_guess=opener,
                 suggestions=[opener][: parameters.max_suggestions],
-                remaining_candidates=len(self.all_words),
+                remaining_candidates=self._word_manager.answer_count,
                 thoughts=[
                     AgentThought(
                         message="No prior guesses supplied; using default opener.",
@@ -40,6 +43,10 @@ class FrequencyAgent(Agent):
                 ],
             )
 
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
         candidates = self._apply_history(history)
         remaining = len(candidates)
 
@@ -57,75 +64,40 @@ class FrequencyAgent(Agent):
             )
 
         ranked = self._rank_candidates(candidates, history, parameters)
-        suggestions = ranked[: parameters.max_suggestions]
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
         next_guess = suggestions[0] if suggestions else None
 
+        thoughts = self._describe_decision(history, remaining, self._to_words(ranked[:3]))
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
         return SolveResponse(
             next_guess=next_guess,
             suggestions=suggestions,
             remaining_candidates=remaining,
-            thoughts=self._describe_decision(history, remaining, ranked[:3]),
+            thoughts=thoughts,
         )
 
     def _rank_candidates(
         self,
-        candidates: Sequence[str],
+        candidates: np.ndarray,
         history: Sequence[GuessFeedback],
         parameters: SolveParameters,
-    ) -> List[str]:
+    ) -> np.ndarray:
         if len(candidates) <= 2:
-            return list(candidates)
-
-        position_counts = self._build_position_counts(candidates)
-        total_candidates = len(candidates)
-        frequency_scores = {
-            candidate: self._score_candidate(candidate, position_counts, total_candidates)
-            for candidate in candidates
-        }
-
-        ranked = sorted(
-            candidates,
-            key=lambda word: frequency_scores[word],
-            reverse=True,
+            return candidates
+
+        ranked = self._letter_stats.best(
+            candidates, candidates, self._ranking_depth(history, parameters)
         )
 
         if not parameters.allow_repeats:
-            tried = {entry.guess.upper() for entry in history}
-            ranked = [word for word in ranked if word not in tried] or ranked
+            untried = ranked[~np.isin(ranked, self._tried_indices(history))]
+            ranked = untried if untried.size else ranked
 
         return ranked
 
-    def _build_position_counts(self, candidates: Sequence[str]) -> List[Dict[str, int]]:
-        counts: List[Dict[str, int]] = [Counter() for _ in range(5)]
-        for word in candidates:
-            for idx, letter in enumerate(word):
-                counts[idx][letter] += 1
-        return counts
-
-    def _score_candidate(
-        self,
-        candidate: str,
-        position_counts: Sequence[Dict[str, int]],
-        total_candidates: int,
-    ) -> float:
-        """Score a word using precomputed position frequencies."""
-
-        if total_candidates == 0:
-            return 0.0
-
-        score = 0.0
-        seen_letters = set()
-        for idx, letter in enumerate(candidate):
-            letter_freq = position_counts[idx].get(letter, 0)
-            score += letter_freq / total_candidates
-
-            # Penalize duplicate letters to encourage broader coverage.
-            if letter in seen_letters:
-                score -= 0.1
-            seen_letters.add(letter)
-
-        return score
-
     def _describe_decision(
         self,
         history: Sequence[GuessFeedback],
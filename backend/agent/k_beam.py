@@ -1,24 +1,59 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict, List, Sequence
+import time
+from typing import List, NamedTuple, Optional, Sequence
 
 import numpy as np
 
 from .base import Agent
+from .letter_stats import shared_letter_statistics
+from .scoring import shared_scorer, top_k
 from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
 from schema.solve_response import AgentThought, SolveResponse
+from word_manager.code_block_cache import code_block_cache
+
+
+class StageWidths(NamedTuple):
+    """Words kept by the frequency filter and guesses expanded by the lookahead."""
+
+    filter: int
+    lookahead: int
+
+
+class StageReport(NamedTuple):
+    """What one pipeline stage did, for the response thoughts."""
+
+    name: str
+    kept: int
+    considered: int
+    elapsed: float
+
+
+def stage_widths(remaining: int) -> StageWidths:
+    """Default stage widths for a state with ``remaining`` candidates.
+
+    Large states need more outside guesses to find a good split, so the filter
+    keeps about four words per candidate (50 to 1000). The lookahead costs a pass
+    over the filtered block per expanded guess and only runs on small states.
+    """
+    filter_width = int(np.clip(4 * remaining, 50, 1000))
+    lookahead_width = 6 if remaining <= 256 else 0
+    return StageWidths(filter_width, lookahead_width)
 
 
 class KBeamAgent(Agent):
-    """Two-phase beam-search agent combining frequency and entropy heuristics."""
+    """Multi-stage beam-search agent: frequency filter, entropy, optional lookahead.
 
-    def __init__(self, beam_width: int = 50) -> None:
+    Stage widths come from ``stage_widths`` unless the request overrides them; a
+    ``beam_width`` given to the constructor fixes the filter width instead.
+    """
+
+    def __init__(self, beam_width: Optional[int] = None) -> None:
         super().__init__()
         self.beam_width = beam_width
         self.first_guess = "ROATE"
-        self._pattern_space = 3**5
-        self._batch_size = 64
+        self._scorer = shared_scorer()
+        self._letter_stats = shared_letter_statistics(duplicate_penalty=0.1)
 
     # ------------------------------------------------------------------
     # Public API
@@ -32,7 +67,7 @@ class KBeamAgent(Agent):
             return SolveResponse(
                 next_guess=opener,
                 suggestions=[opener][: parameters.max_suggestions],
-                remaining_candidates=len(self.all_words),
+                remaining_candidates=self._word_manager.answer_count,
                 thoughts=[
                     AgentThought(
                         message="No prior guesses supplied; using default opener.",
@@ -41,6 +76,10 @@ class KBeamAgent(Agent):
                 ],
             )
 
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
         candidates = self._apply_history(history)
         remaining = len(candidates)
 
@@ -57,15 +96,21 @@ class KBeamAgent(Agent):
                 ],
             )
 
-        ranked = self._rank_with_beam(candidates, history, parameters)
-        suggestions = ranked[: parameters.max_suggestions]
+        stages: List[StageReport] = []
+        ranked = self._rank_with_beam(candidates, history, parameters, stages)
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
         next_guess = suggestions[0] if suggestions else None
 
+        thoughts = self._describe_decision(history, remaining, self._to_words(ranked[:3]), stages)
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
         return SolveResponse(
             next_guess=next_guess,
             suggestions=suggestions,
             remaining_candidates=remaining,
-            thoughts=self._describe_decision(history, remaining, ranked[:3], candidates),
+            thoughts=thoughts,
         )
 
     # ------------------------------------------------------------------
@@ -73,120 +118,77 @@ class KBeamAgent(Agent):
     # ------------------------------------------------------------------
     def _rank_with_beam(
         self,
-        candidates: Sequence[str],
+        candidates: np.ndarray,
         history: Sequence[GuessFeedback],
         parameters: SolveParameters,
-    ) -> List[str]:
+        stages: Optional[List[StageReport]] = None,
+    ) -> np.ndarray:
+        """Rank guesses through the stage pipeline; each stage is appended to ``stages``."""
         if len(candidates) <= 2:
-            return list(candidates)
-
-        beam_width = min(self.beam_width, len(self.all_words))
-        frequency_scores = self._letter_frequency_scores(candidates)
-
-        ordered_by_frequency = sorted(
-            self.all_words,
-            key=lambda word: frequency_scores[word],
-            reverse=True,
-        )
-        beam = ordered_by_frequency[:beam_width]
-
-        entropy_scores = self._batched_entropy_scores(beam, candidates)
-
-        ranked = sorted(
-            beam,
-            key=lambda word: entropy_scores[word],
-            reverse=True,
-        )
+            return candidates
+
+        stages = stages if stages is not None else []
+        widths = self._stage_widths(len(candidates), parameters)
+        depth = self._ranking_depth(history, parameters)
+
+        started = time.perf_counter()
+        pool = self.all_words.indices()
+        allowed = self._hard_mode_mask(history, parameters)
+        if allowed is not None:
+            pool = pool[allowed[pool]]
+        beam = self._letter_stats.best(pool, candidates, min(widths.filter, len(pool)))
+        stages.append(StageReport("frequency", len(beam), len(pool), time.perf_counter() - started))
+
+        started = time.perf_counter()
+        weights = self._candidate_weights(candidates, parameters)
+        entropy_scores = self._scorer.entropies(beam, candidates, weights)
+        order = top_k(entropy_scores, max(depth, widths.lookahead))
+        ranked = beam[order]
+        stages.append(StageReport("entropy", len(ranked), len(beam), time.perf_counter() - started))
+
+        expand = min(widths.lookahead, len(ranked))
+        if expand > 1:
+            started = time.perf_counter()
+            # Second guesses come from the filtered beam, already sliced for stage 2.
+            block = code_block_cache.block(candidates)
+            second_ply = block[:, beam]
+            totals = entropy_scores[order[:expand]] + np.array(
+                [
+                    self._scorer.expected_next_entropy(block[:, guess], second_ply)
+                    for guess in ranked[:expand].tolist()
+                ]
+            )
+            ranked = np.concatenate(
+                (ranked[:expand][np.argsort(-totals, kind="stable")], ranked[expand:])
+            )
+            elapsed = time.perf_counter() - started
+            stages.append(StageReport("two-step lookahead", expand, len(ranked), elapsed))
 
+        ranked = ranked[:depth]
         if not parameters.allow_repeats:
-            tried = {entry.guess.upper() for entry in history}
-            filtered = [word for word in ranked if word not in tried]
-            if filtered:
+            filtered = ranked[~np.isin(ranked, self._tried_indices(history))]
+            if filtered.size:
                 ranked = filtered
 
         return ranked
 
-    def _letter_frequency_scores(self, candidates: Sequence[str]) -> Dict[str, float]:
-        position_counts = self._build_position_counts(candidates)
-        total_candidates = len(candidates)
-        if total_candidates == 0:
-            return {word: 0.0 for word in self.all_words}
-
-        scores: Dict[str, float] = {}
-        for word in self.all_words:
-            scores[word] = self._score_candidate(word, position_counts, total_candidates)
-        return scores
-
-    def _build_position_counts(self, candidates: Sequence[str]) -> List[Counter[str]]:
-        counts: List[Counter[str]] = [Counter() for _ in range(5)]
-        for word in candidates:
-            for idx, letter in enumerate(word):
-                counts[idx][letter] += 1
-        return counts
-
-    def _score_candidate(
-        self,
-        candidate: str,
-        position_counts: Sequence[Counter[str]],
-        total_candidates: int,
-    ) -> float:
-        score = 0.0
-        seen_letters = set()
-        for idx, letter in enumerate(candidate):
-            score += position_counts[idx].get(letter, 0) / total_candidates
-            if letter in seen_letters:
-                score -= 0.1
-            seen_letters.add(letter)
-        return score
-
-    def _batched_entropy_scores(
-        self,
-        guesses: Sequence[str],
-        candidates: Sequence[str],
-    ) -> Dict[str, float]:
-        if not guesses or not candidates:
-            return {word: 0.0 for word in guesses}
-
-        guess_indices = self._word_manager.words_to_indices([word.upper() for word in guesses])
-        candidate_indices = self._word_manager.words_to_indices(
-            [word.upper() for word in candidates]
-        )
-
-        scores: Dict[str, float] = {}
-        for start in range(0, len(guesses), self._batch_size):
-            chunk_words = guesses[start : start + self._batch_size]
-            chunk_indices = guess_indices[start : start + self._batch_size]
-            codes = self._word_manager.feedback_codes(chunk_indices, candidate_indices)
-            entropies = self._entropy_from_codes(codes)
-            for word, entropy in zip(chunk_words, entropies):
-                scores[word] = float(entropy)
-
-        return scores
-
-    def _entropy_from_codes(self, codes: np.ndarray) -> np.ndarray:
-        if codes.size == 0:
-            return np.zeros(codes.shape[0])
-
-        num_rows = codes.shape[0]
-        offsets = (np.arange(num_rows, dtype=np.int64) * self._pattern_space)[:, None]
-        flattened = codes.astype(np.int64, copy=False) + offsets
-        hist = np.bincount(flattened.ravel(), minlength=num_rows * self._pattern_space).reshape(
-            num_rows, self._pattern_space
-        )
-        hist = hist.astype(np.float64, copy=False)
-
-        totals = hist.sum(axis=1, keepdims=True)
-        with np.errstate(divide="ignore", invalid="ignore"):
-            probs = np.divide(hist, totals, out=np.zeros_like(hist), where=totals != 0)
-            entropy = -np.sum(np.where(probs > 0, probs * np.log2(probs), 0.0), axis=1)
-        return entropy
+    def _stage_widths(self, remaining: int, parameters: SolveParameters) -> StageWidths:
+        widths = stage_widths(remaining)
+        if self.beam_width is not None:
+            widths = widths._replace(filter=self.beam_width)
+        if parameters.beam_filter_width is not None:
+            widths = widths._replace(filter=parameters.beam_filter_width)
+        if parameters.beam_lookahead_width is not None:
+            widths = widths._replace(lookahead=parameters.beam_lookahead_width)
+        # The dictionary size comes from the word list, so it is only known here.
+        return widths._replace(filter=min(widths.filter, len(self._word_manager.words)))
 
     def _describe_decision(
         self,
         history: Sequence[GuessFeedback],
         remaining_candidates: int,
         top_ranked: Sequence[str],
-        candidates: Sequence[str],
+        stages: Sequence[StageReport],
     ) -> List[AgentThought]:
         thoughts: List[AgentThought] = []
 
@@ -201,17 +203,21 @@ class KBeamAgent(Agent):
                 )
             )
 
-        thoughts.append(
-            AgentThought(
-                message=f"Phase 1 (frequency) reduced search to top {self.beam_width} of {len(self.all_words)} words.",
-                score=float(min(self.beam_width, len(self.all_words))),
+        for number, stage in enumerate(stages, start=1):
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Stage {number} ({stage.name}) kept {stage.kept} of "
+                        f"{stage.considered} words in {stage.elapsed * 1000:.1f} ms."
+                    ),
+                    score=float(stage.kept),
+                )
             )
-        )
 
         if top_ranked:
             thoughts.append(
                 AgentThought(
-                    message=f"Phase 2 entropy favors: {', '.join(top_ranked)}.",
+                    message=f"Pipeline favors: {', '.join(top_ranked)}.",
                     score=None,
                 )
             )
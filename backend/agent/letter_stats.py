@@ -0,0 +1,72 @@
+"""Vectorized letter statistics shared by the frequency-based agents.
+
+Words are scored by how many candidates share each of their letters at the same
+position, normalized by the candidate count, minus a penalty per repeated letter.
+Everything works on the dictionary's ``N x 5`` letter-index array: position
+counts are one ``bincount`` per position over the candidates' letters, a word's
+score is five lookups into those counts, and the repeated-letter mask is built
+once per dictionary.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+from word_manager.word_manager import WordListManager, wordlist
+
+from .scoring import is_full_range, top_k
+
+_ALPHABET = 26
+
+
+class LetterStatistics:
+    """Positional letter-frequency scores for any words against any candidate set."""
+
+    def __init__(self, word_manager: WordListManager, duplicate_penalty: float = 0.1) -> None:
+        self._letters = word_manager.letter_array()
+        # Position-major copy: scoring gathers one contiguous row per position.
+        self._by_position = np.ascontiguousarray(self._letters.T)
+
+        # A letter is a repeat if it already occurred earlier in the word.
+        repeats = np.zeros(self._letters.shape, dtype=bool)
+        for position in range(1, 5):
+            repeats[:, position] = (
+                self._letters[:, :position] == self._letters[:, position, None]
+            ).any(axis=1)
+        self.penalties = repeats.sum(axis=1) * duplicate_penalty
+
+    def position_counts(self, candidates: np.ndarray) -> np.ndarray:
+        """Return the ``5 x 26`` table of letter counts per position over ``candidates``."""
+        letters = self._letters[candidates]
+        return np.stack(
+            [np.bincount(letters[:, position], minlength=_ALPHABET) for position in range(5)]
+        )
+
+    def scores(self, words: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Return the frequency score of each of ``words`` over ``candidates``."""
+        if not len(candidates):
+            return np.zeros(len(words), dtype=np.float64)
+        counts = self.position_counts(candidates)
+        letters = self._by_position
+        if not is_full_range(words, letters.shape[1]):
+            letters = letters[:, words]
+        # Integer sums first, so words with the same counts tie exactly.
+        matches = counts[0][letters[0]]
+        for position in range(1, 5):
+            matches = matches + counts[position][letters[position]]
+        return matches / len(candidates) - self.penalties[words]
+
+    def best(self, words: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+        """Return the ``k`` best of ``words`` over ``candidates``, best first.
+
+        Ties keep the order of ``words``, as a stable sort of all scores would.
+        """
+        return words[top_k(self.scores(words, candidates), k)]
+
+
+@lru_cache(maxsize=None)
+def shared_letter_statistics(duplicate_penalty: float = 0.1) -> LetterStatistics:
+    """Return the process-wide statistics for a given duplicate-letter penalty."""
+    return LetterStatistics(wordlist, duplicate_penalty)
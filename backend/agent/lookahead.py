@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from schema.solve_response import AgentThought, SolveResponse
+from word_manager.code_block_cache import code_block_cache
+
+from .base import Agent
+from .scoring import shared_scorer, top_k
+
+# Second guesses are drawn from this many of the best first-ply guesses (plus the
+# candidates themselves on small states).
+_SECOND_PLY_POOL = 256
+
+
+class LookaheadAgent(Agent):
+    """Two-ply entropy agent: a guess is worth its entropy plus the best next one.
+
+    Only the ``lookahead_beam`` best guesses by plain entropy are expanded. For
+    each of them the candidates are split by its feedback, and every second-ply
+    guess is scored in every bucket at once; the guess's score is its own entropy
+    plus the size-weighted best entropy available in each bucket. Expansion stops
+    at ``lookahead_time_budget`` and unexpanded guesses keep their entropy order.
+    """
+
+    precomputable = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_guess = "ROATE"
+        self._ordered_indices = self._word_manager.all_indices()
+        self._scorer = shared_scorer()
+
+    def solve(self, request: SolveRequest) -> SolveResponse:
+        """Produce the next guess recommendation for the given history."""
+
+        parameters = request.parameters or SolveParameters()
+        history = request.history
+
+        if not history:
+            opener = self.first_guess
+            return SolveResponse(
+                next_guess=opener,
+                suggestions=[opener][: parameters.max_suggestions],
+                remaining_candidates=self._word_manager.answer_count,
+                thoughts=[
+                    AgentThought(
+                        message="No prior guesses supplied; using default opener.",
+                        score=None,
+                    )
+                ],
+            )
+
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
+        candidates = self._apply_history(history)
+        remaining = len(candidates)
+
+        if remaining == 0:
+            return SolveResponse(
+                next_guess=None,
+                suggestions=[],
+                remaining_candidates=0,
+                thoughts=[
+                    AgentThought(
+                        message="No candidates match the provided feedback history.",
+                        score=None,
+                    )
+                ],
+            )
+
+        started = time.time()
+        ranked, expanded, best_score = self._rank_candidates(candidates, history, parameters)
+        elapsed = time.time() - started
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
+        next_guess = suggestions[0] if suggestions else None
+
+        thoughts = self._describe_decision(
+            history,
+            remaining,
+            self._to_words(ranked[:3]),
+            parameters,
+            expanded,
+            best_score,
+            elapsed,
+        )
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
+        return SolveResponse(
+            next_guess=next_guess,
+            suggestions=suggestions,
+            remaining_candidates=remaining,
+            thoughts=thoughts,
+        )
+
+    def _rank_candidates(
+        self,
+        candidates: np.ndarray,
+        history: Sequence[GuessFeedback],
+        parameters: SolveParameters,
+    ) -> Tuple[np.ndarray, int, float]:
+        """Rank guesses by two-ply score; also return how many were expanded and the best score.
+
+        Expanded guesses come first, best two-ply score first, followed by the rest
+        of the first-ply ranking.
+        """
+        if len(candidates) <= 2:
+            return candidates, 0, 0.0
+
+        deadline = time.time() + parameters.lookahead_time_budget
+        scores = self._scorer.scores(self._ordered_indices, candidates)
+        if not parameters.allow_repeats:
+            scores[self._tried_indices(history)] = -np.inf
+        depth = max(self._ranking_depth(history, parameters), parameters.lookahead_beam)
+        allowed = self._hard_mode_mask(history, parameters)
+        if allowed is not None:
+            scores[~allowed] = -np.inf
+        first_ply = self._ordered_indices[top_k(scores, max(depth, _SECOND_PLY_POOL))]
+        if allowed is not None:
+            first_ply = first_ply[allowed[first_ply]]
+
+        pool = first_ply[:_SECOND_PLY_POOL]
+        if len(candidates) <= _SECOND_PLY_POOL:
+            pool = np.union1d(pool, candidates)
+        block = code_block_cache.block(candidates)
+        second_ply = block[:, pool]
+
+        beam = first_ply[: parameters.lookahead_beam]
+        totals: List[float] = []
+        for guess in beam.tolist():
+            if totals and time.time() > deadline:
+                break
+            totals.append(
+                scores[guess] + self._scorer.expected_next_entropy(block[:, guess], second_ply)
+            )
+
+        expanded = beam[: len(totals)]
+        # Ties (common once two guesses can settle everything) go to candidates,
+        # which might win outright.
+        rounded = np.round(np.asarray(totals), 9)
+        order = np.lexsort((~np.isin(expanded, candidates), -rounded))
+        ranked = np.concatenate((expanded[order], first_ply[len(totals) : depth]))
+        if not parameters.allow_repeats:
+            ranked = ranked[~np.isin(ranked, self._tried_indices(history))]
+        return ranked, len(totals), float(totals[order[0]])
+
+    def _describe_decision(
+        self,
+        history: Sequence[GuessFeedback],
+        remaining_candidates: int,
+        top_ranked: Sequence[str],
+        parameters: SolveParameters,
+        expanded: int,
+        best_score: float,
+        elapsed: float,
+    ) -> List[AgentThought]:
+        thoughts: List[AgentThought] = []
+
+        last = history[-1]
+        thoughts.append(
+            AgentThought(
+                message=f"Processed guess '{last.guess.upper()}' with feedback {last.feedback}.",
+                score=None,
+            )
+        )
+        thoughts.append(
+            AgentThought(
+                message=f"{remaining_candidates} candidates remain after filtering.",
+                score=float(remaining_candidates),
+            )
+        )
+
+        if expanded:
+            cut_short = (
+                f" (stopped at the {parameters.lookahead_time_budget:g}s budget)"
+                if expanded < parameters.lookahead_beam
+                else ""
+            )
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Looked two guesses ahead for {expanded} of the top "
+                        f"{parameters.lookahead_beam} guesses{cut_short}: best expects "
+                        f"{best_score:.2f} bits over two turns ({elapsed * 1000:.0f} ms)."
+                    ),
+                    score=best_score,
+                )
+            )
+
+        if top_ranked:
+            thoughts.append(
+                AgentThought(
+                    message=f"Top recommendations: {', '.join(top_ranked)}.",
+                    score=None,
+                )
+            )
+
+        return thoughts
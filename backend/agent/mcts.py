@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from schema.solve_response import AgentThought, SolveResponse
+from word_manager.code_block_cache import code_block_cache
+
+from .base import Agent
+from .letter_stats import shared_letter_statistics
+from .scoring import shared_scorer, top_k
+
+# Root actions: this many best guesses by frequency and by entropy.
+_ROOT_ACTIONS = 8
+# Deeper states only consider their best few candidates by frequency.
+_CHILD_ACTIONS = 4
+# Hidden answers sampled per simulation; they travel through the tree together.
+_ROLLOUT_BATCH = 32
+_EXPLORATION = 1.0
+
+
+class _Node:
+    """A state of the search tree: its candidates, actions and per-action statistics.
+
+    ``square`` holds the feedback codes of every candidate guessed against every
+    candidate (target-major) and ``action_codes`` those of the actions, so a
+    simulation below the root never reads the feedback matrix again.
+    """
+
+    __slots__ = ("state", "square", "actions", "action_codes", "visits", "costs", "children")
+
+    def __init__(
+        self, state: np.ndarray, square: np.ndarray, actions: np.ndarray, action_codes: np.ndarray
+    ) -> None:
+        self.state = state
+        self.square = square
+        self.actions = actions
+        self.action_codes = action_codes
+        self.visits = np.zeros(len(actions), dtype=np.float64)
+        self.costs = np.zeros(len(actions), dtype=np.float64)
+        self.children: Dict[Tuple[int, int], _Node] = {}
+
+
+class MCTSAgent(Agent):
+    """Monte Carlo tree search agent with an anytime time budget.
+
+    Each simulation samples a batch of hidden answers from the candidates and
+    sends them down the tree together: a node picks one action by UCB1, the
+    feedback matrix splits the batch by feedback code, and each group continues
+    in its child state. A new child is scored by a rollout that plays the
+    frequency strategy to the end for every answer of its group at once. The
+    root action visited most when ``mcts_time_budget`` runs out is suggested.
+
+    With ``workers > 1`` each thread grows its own tree for the whole budget and
+    the root statistics are summed (root parallelization); the NumPy kernels
+    release the GIL for most of a rollout.
+    """
+
+    precomputable = False
+
+    def __init__(self, workers: int = 1, seed: Optional[int] = None) -> None:
+        super().__init__()
+        self.first_guess = "ROATE"
+        self.workers = workers
+        self._seed = np.random.SeedSequence(seed)
+        self._ordered_indices = self._word_manager.all_indices()
+        self._scorer = shared_scorer()
+
+        letters = self._word_manager.letter_array()
+        self._letter_hot = np.zeros((len(letters), 5 * 26), dtype=np.float32)
+        rows = np.repeat(np.arange(len(letters)), 5)
+        self._letter_hot[rows, (np.arange(5) * 26 + letters).ravel()] = 1.0
+        # Same duplicate-letter penalty as FrequencyAgent.
+        self._penalties = shared_letter_statistics(duplicate_penalty=0.1).penalties
+        self._executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def solve(self, request: SolveRequest) -> SolveResponse:
+        """Produce the next guess recommendation for the given history."""
+
+        parameters = request.parameters or SolveParameters()
+        history = request.history
+
+        if not history:
+            opener = self.first_guess
+            return SolveResponse(
+                next_guess=opener,
+                suggestions=[opener][: parameters.max_suggestions],
+                remaining_candidates=self._word_manager.answer_count,
+                thoughts=[
+                    AgentThought(
+                        message="No prior guesses supplied; using default opener.",
+                        score=None,
+                    )
+                ],
+            )
+
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
+        candidates = self._apply_history(history)
+        remaining = len(candidates)
+
+        if remaining == 0:
+            return SolveResponse(
+                next_guess=None,
+                suggestions=[],
+                remaining_candidates=0,
+                thoughts=[
+                    AgentThought(
+                        message="No candidates match the provided feedback history.",
+                        score=None,
+                    )
+                ],
+            )
+
+        started = time.time()
+        ranked, visits, costs = self._search(candidates, history, parameters)
+        elapsed = time.time() - started
+        ranked, endgame_thought = self._endgame_rerank(ranked, candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
+        next_guess = suggestions[0] if suggestions else None
+
+        thoughts = self._describe_decision(
+            history, remaining, self._to_words(ranked[:3]), visits, costs, elapsed
+        )
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
+
+        return SolveResponse(
+            next_guess=next_guess,
+            suggestions=suggestions,
+            remaining_candidates=remaining,
+            thoughts=thoughts,
+        )
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _search(
+        self,
+        candidates: np.ndarray,
+        history: Sequence[GuessFeedback],
+        parameters: SolveParameters,
+    ) -> Tuple[np.ndarray, float, float]:
+        """Rank the root actions; also return the best one's visits and mean cost."""
+        if len(candidates) <= 2:
+            return candidates, 0.0, 0.0
+
+        block = code_block_cache.block(candidates)
+        square = block[:, candidates]
+        actions = self._root_actions(candidates, history, parameters)
+        root_codes = block[:, actions]
+        deadline = time.time() + parameters.mcts_time_budget
+
+        seeds = self._seed.spawn(self.workers)
+        if self._executor is None:
+            trees = [self._grow(candidates, square, actions, root_codes, deadline, seeds[0])]
+        else:
+            futures = [
+                self._executor.submit(
+                    self._grow, candidates, square, actions, root_codes, deadline, seed
+                )
+                for seed in seeds
+            ]
+            trees = [future.result() for future in futures]
+
+        visits = sum(tree.visits for tree in trees)
+        costs = sum(tree.costs for tree in trees)
+        mean_costs = costs / np.maximum(visits, 1)
+        order = np.lexsort((mean_costs, -visits))
+        best = order[0]
+        return actions[order], float(visits[best]), float(mean_costs[best])
+
+    def _root_actions(
+        self,
+        candidates: np.ndarray,
+        history: Sequence[GuessFeedback],
+        parameters: SolveParameters,
+    ) -> np.ndarray:
+        """The best candidates by frequency plus the best guesses by entropy."""
+        frequency = self._frequency_scores(np.ones((1, len(candidates)), dtype=bool), candidates)
+        by_frequency = candidates[top_k(frequency[0], _ROOT_ACTIONS)]
+        entropy = self._scorer.scores(self._ordered_indices, candidates)
+        allowed = self._hard_mode_mask(history, parameters)
+        if allowed is not None:
+            entropy[~allowed] = -np.inf
+        by_entropy = self._ordered_indices[top_k(entropy, _ROOT_ACTIONS)]
+        if allowed is not None:
+            by_entropy = by_entropy[allowed[by_entropy]]
+
+        actions = np.concatenate((by_frequency, by_entropy))
+        actions = actions[np.sort(np.unique(actions, return_index=True)[1])]
+        if not parameters.allow_repeats:
+            untried = actions[~np.isin(actions, self._tried_indices(history))]
+            actions = untried if untried.size else actions
+        return actions
+
+    def _grow(
+        self,
+        candidates: np.ndarray,
+        square: np.ndarray,
+        actions: np.ndarray,
+        root_codes: np.ndarray,
+        deadline: float,
+        seed: np.random.SeedSequence,
+    ) -> _Node:
+        """Run simulations on a fresh tree until ``deadline`` (at least one per action)."""
+        rng = np.random.default_rng(seed)
+        root = _Node(candidates, square, actions, root_codes)
+        while not root.visits.all() or time.time() < deadline:
+            targets = rng.integers(0, len(candidates), size=_ROLLOUT_BATCH)
+            self._simulate(root, targets)
+        return root
+
+    def _simulate(self, node: _Node, targets: np.ndarray) -> np.ndarray:
+        """Play ``targets`` (positions in ``node.state``) down the tree; return guesses used."""
+        action = self._select(node)
+        codes = node.action_codes[targets, action]
+        guess = node.actions[action]
+        cost = np.ones(len(targets), dtype=np.float64)
+
+        unsolved = node.state[targets] != guess
+        for code in np.unique(codes[unsolved]).tolist():
+            group = np.flatnonzero(unsolved & (codes == code))
+            child = node.children.get((action, code))
+            if child is None:
+                child = node.children[(action, code)] = self._expand(node, action, code)
+                playout = self._rollout
+            else:
+                playout = self._simulate
+            positions = np.searchsorted(child.state, node.state[targets[group]])
+            cost[group] += playout(child, positions)
+
+        node.visits[action] += len(targets)
+        node.costs[action] += cost.sum()
+        return cost
+
+    def _select(self, node: _Node) -> int:
+        """UCB1 on mean guesses still needed; unvisited actions first."""
+        unvisited = np.flatnonzero(node.visits == 0)
+        if unvisited.size:
+            return int(unvisited[0])
+        mean_costs = node.costs / node.visits
+        bonus = _EXPLORATION * np.sqrt(np.log(node.visits.sum()) / node.visits)
+        return int(np.argmax(bonus - mean_costs))
+
+    def _expand(self, node: _Node, action: int, code: int) -> _Node:
+        members = np.flatnonzero(node.action_codes[:, action] == code)
+        state = node.state[members]
+        square = node.square[np.ix_(members, members)]
+        if len(state) <= 2:
+            picks = np.arange(len(state))
+        else:
+            scores = self._frequency_scores(np.ones((1, len(state)), dtype=bool), state)
+            picks = top_k(scores[0], _CHILD_ACTIONS)
+        return _Node(state, square, state[picks], square[:, picks])
+
+    def _rollout(self, node: _Node, targets: np.ndarray) -> np.ndarray:
+        """Play the frequency strategy from ``node`` for every target at once."""
+        active = np.ones((len(targets), len(node.state)), dtype=bool)
+        cost = np.zeros(len(targets), dtype=np.float64)
+        playing = np.ones(len(targets), dtype=bool)
+        # Every guess is a remaining candidate, so each step removes at least one.
+        while playing.any():
+            guesses = np.argmax(self._frequency_scores(active, node.state), axis=1)
+            cost[playing] += 1
+            playing &= guesses != targets
+            feedback = node.square[targets, guesses]
+            active &= node.square[:, guesses].T == feedback[:, None]
+        return cost
+
+    def _frequency_scores(self, active: np.ndarray, state: np.ndarray) -> np.ndarray:
+        """FrequencyAgent's score of every word in ``state`` for each row of ``active``.
+
+        Rows are candidate masks; inactive words score ``-inf``. Letter counts per
+        position are one matrix product over one-hot letters and the scores another.
+        """
+        letters = self._letter_hot[state]
+        masks = active.astype(np.float32)
+        counts = masks @ letters
+        totals = np.maximum(masks.sum(axis=1, keepdims=True), 1.0)
+        scores = (counts @ letters.T) / totals - self._penalties[state]
+        scores[~active] = -np.inf
+        return scores
+
+    def _describe_decision(
+        self,
+        history: Sequence[GuessFeedback],
+        remaining_candidates: int,
+        top_ranked: Sequence[str],
+        visits: float,
+        mean_cost: float,
+        elapsed: float,
+    ) -> List[AgentThought]:
+        thoughts: List[AgentThought] = []
+
+        last = history[-1]
+        thoughts.append(
+            AgentThought(
+                message=f"Processed guess '{last.guess.upper()}' with feedback {last.feedback}.",
+                score=None,
+            )
+        )
+        thoughts.append(
+            AgentThought(
+                message=f"{remaining_candidates} candidates remain after filtering.",
+                score=float(remaining_candidates),
+            )
+        )
+
+        if visits:
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Tree search over {self.workers} worker(s) for "
+                        f"{elapsed * 1000:.0f} ms: {top_ranked[0]} was simulated "
+                        f"{visits:.0f} times and needs {mean_cost:.2f} guesses on average."
+                    ),
+                    score=mean_cost,
+                )
+            )
+
+        if top_ranked:
+            thoughts.append(
+                AgentThought(
+                    message=f"Top recommendations: {', '.join(top_ranked)}.",
+                    score=None,
+                )
+            )
+
+        return thoughts
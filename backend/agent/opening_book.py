@@ -0,0 +1,221 @@
+"""Precomputed second-guess tables for each strategy's fixed opener.
+
+Every deterministic agent opens with the same word, so its second turn only ever
+sees one of 243 feedback codes. ``python -m agent.opening_book`` runs the agents
+once for each code and stores their ranked suggestions next to the feedback
+matrix; ``solve()`` then answers a one-guess history with a single row lookup.
+
+Each table records a fingerprint of the dictionary, the agent's configuration and
+the source of the modules its ranking depends on. A table whose fingerprint no
+longer matches is ignored, so editing the word list or a scoring rule falls back
+to live computation until the table is rebuilt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .base import Agent
+
+_FORMAT_VERSION = 1
+_PATTERN_SPACE = 3**5
+_BOOK_DEPTH = 5  # SolveParameters.max_suggestions upper bound
+_TABLE_DIR = Path(__file__).resolve().parent.parent / "word_manager"
+
+# Packages whose source can change a stored ranking.
+_SOURCE_PACKAGES = ("agent", "word_manager")
+
+
+class OpeningBook:
+    """Ranked second-guess suggestions for every feedback code after an opener.
+
+    ``ranked`` is a ``243 x 5`` ``int32`` table of dictionary indices padded with
+    ``-1``, and ``remaining`` holds the candidate count for each code. Rows of
+    codes that no target can produce have no suggestions and are not served.
+    """
+
+    def __init__(
+        self, opener: str, ranked: np.ndarray, remaining: np.ndarray, fingerprint: str
+    ) -> None:
+        self.opener = opener.upper()
+        self.ranked = ranked
+        self.remaining = remaining
+        self.fingerprint = fingerprint
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, agent: "Agent") -> "OpeningBook":
+        """Run ``agent`` on every feedback code of its opener and record the results.
+
+        The agent must not have a book attached, otherwise it would copy itself.
+        """
+        opener = agent.first_guess
+        parameters = SolveParameters(max_suggestions=_BOOK_DEPTH)
+        word_manager = agent._word_manager
+        ranked = np.full((_PATTERN_SPACE, _BOOK_DEPTH), -1, dtype=np.int32)
+        remaining = np.zeros(_PATTERN_SPACE, dtype=np.int32)
+
+        for code in range(_PATTERN_SPACE):
+            feedback = word_manager.decode_feedback(code)
+            request = SolveRequest(
+                history=[GuessFeedback(guess=opener, feedback=feedback)],
+                parameters=parameters,
+            )
+            response = agent.solve(request)
+            remaining[code] = response.remaining_candidates
+            if response.suggestions:
+                indices = word_manager.words_to_indices(response.suggestions)
+                ranked[code, : len(indices)] = indices
+
+        return cls(opener, ranked, remaining, agent_fingerprint(agent))
+
+    @classmethod
+    def load(cls, agent: "Agent", path: Path) -> Optional["OpeningBook"]:
+        """Return the table stored at ``path`` if it still matches ``agent``."""
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            fingerprint = str(data["fingerprint"])
+            if fingerprint != agent_fingerprint(agent):
+                print(f"⚠️  Ignoring stale opening table {path.name}; rebuild it to use it")
+                return None
+            return cls(str(data["opener"]), data["ranked"], data["remaining"], fingerprint)
+
+    def save(self, path: Path) -> None:
+        # Write next to the final path so a reader never sees a partial table.
+        partial_path = path.with_suffix(".partial.npz")
+        with open(partial_path, "wb") as handle:
+            np.savez(
+                handle,
+                opener=np.array(self.opener),
+                ranked=self.ranked,
+                remaining=self.remaining,
+                fingerprint=np.array(self.fingerprint),
+            )
+        partial_path.replace(path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def lookup(self, guess: str, code: int) -> Optional[Tuple[np.ndarray, int]]:
+        """Return ``(ranked indices, remaining)`` after the opener got feedback ``code``."""
+        if guess.upper() != self.opener:
+            return None
+        ranked = self.ranked[code]
+        ranked = ranked[ranked >= 0]
+        if not ranked.size:
+            return None
+        return ranked, int(self.remaining[code])
+
+
+def table_path(strategy: SolverStrategy) -> Path:
+    return _TABLE_DIR / f"opening_{strategy.value}.npz"
+
+
+def agent_fingerprint(agent: "Agent") -> str:
+    """Hash everything a stored ranking depends on.
+
+    That is the dictionary, the agent's word pool and scalar settings (opener,
+    beam width, ...) and the source of every ``agent``/``word_manager`` module its
+    class hierarchy imports, directly or through other such modules.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{_FORMAT_VERSION}".encode())
+    digest.update("\n".join(agent._word_manager.words).encode())
+    digest.update(f"answers={agent._word_manager.answer_count}".encode())
+    digest.update(agent.all_words.indices().tobytes())
+
+    settings = sorted(
+        (name, value)
+        for name, value in vars(agent).items()
+        if isinstance(value, (bool, int, float, str))
+    )
+    digest.update(repr(settings).encode())
+
+    for name in source_modules(agent):
+        digest.update(name.encode())
+        digest.update(_read_source(name))
+    return digest.hexdigest()
+
+
+def source_modules(agent: "Agent") -> List[str]:
+    """Return the ``agent``/``word_manager`` modules ``agent``'s code depends on.
+
+    Starts from the modules of the agent's class hierarchy and its declared
+    ``source_dependencies``, and follows every module, class, function or shared
+    instance they import from those packages. Imports made inside functions are
+    not seen, so an agent declares those modules itself.
+    """
+    pending = [cls.__module__ for cls in type(agent).__mro__]
+    pending.extend(type(agent).source_dependencies)
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen or name.split(".")[0] not in _SOURCE_PACKAGES:
+            continue
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        seen.add(name)
+        for value in vars(module).values():
+            if isinstance(value, ModuleType):
+                pending.append(value.__name__)
+            else:
+                owner = getattr(value, "__module__", None)
+                if isinstance(owner, str):
+                    pending.append(owner)
+    return sorted(seen)
+
+
+def _read_source(name: str) -> bytes:
+    source = getattr(sys.modules[name], "__file__", None)
+    return Path(source).read_bytes() if source else b""
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Build the opening tables: ``python -m agent.opening_book [strategy ...]``."""
+    from . import _STRATEGY_FACTORIES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "strategies",
+        nargs="*",
+        choices=[strategy.value for strategy in SolverStrategy],
+        help="strategies to build (default: every strategy with a fixed opener)",
+    )
+    args = parser.parse_args(argv)
+    selected = [SolverStrategy(value) for value in args.strategies] or list(_STRATEGY_FACTORIES)
+
+    for strategy in selected:
+        agent = _STRATEGY_FACTORIES[strategy]()
+        if not getattr(agent, "first_guess", None):
+            print(f"⏭️  Skipping {strategy.value}: no fixed opener")
+            continue
+        if not agent.precomputable:
+            print(f"⏭️  Skipping {strategy.value}: its answers depend on a time budget")
+            continue
+        started = time.perf_counter()
+        book = OpeningBook.build(agent)
+        path = table_path(strategy)
+        book.save(path)
+        elapsed = time.perf_counter() - started
+        print(f"✅ Stored opening table for {strategy.value} at {path.name} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Exact optimal solving strategy.
+
+``OptimalAgent`` runs the exact search of ``agent.exact_search`` online for small
+states under a time budget. ``python -m agent.optimal`` certifies the plan below
+an opener offline, one process per opener bucket, and compiles it into the
+``optimal`` strategy's decision tree and opening table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import (
+    GuessFeedback,
+    SearchObjective,
+    SolveParameters,
+    SolveRequest,
+    SolverStrategy,
+)
+from schema.solve_response import AgentThought, SolveResponse
+from word_manager.word_manager import wordlist
+
+from .base import Agent
+from .exact_search import ExactSearch, PlanStep, SearchTimeout
+from .scoring import PATTERN_SPACE, shared_scorer, top_k
+
+_SOLVED_CODE = PATTERN_SPACE - 1
+
+
+class OptimalAgent(Agent):
+    """Wordly solving agent that plays exactly optimal moves on small states.
+
+    States with at most ``max_exact_candidates`` candidates, or solved offline,
+    get the guess minimizing the requested objective; larger states, and searches
+    that run past ``time_budget`` seconds, fall back to entropy ranking.
+    """
+
+    # The certified tables are written by ``main`` from this search's plans.
+    source_dependencies = ("agent.exact_search",)
+
+    def __init__(
+        self,
+        max_exact_candidates: int = 64,
+        time_budget: float = 1.0,
+        guess_limit: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.first_guess = "ROATE"
+        self.max_exact_candidates = max_exact_candidates
+        self.time_budget = time_budget
+        self.guess_limit = guess_limit
+        self._ordered_indices = self._word_manager.all_indices()
+        self._scorer = shared_scorer()
+        self._searches: Dict[SearchObjective, ExactSearch] = {}
+        self._lock = Lock()
+
+    def search(self, objective: SearchObjective) -> ExactSearch:
+        """Return the agent's search (and transposition table) for ``objective``."""
+        with self._lock:
+            if objective not in self._searches:
+                self._searches[objective] = ExactSearch(
+                    self._word_manager, objective, self.guess_limit
+                )
+            return self._searches[objective]
+
+    def solve(self, request: SolveRequest) -> SolveResponse:
+        """Produce the next guess recommendation for the given history."""
+
+        parameters = request.parameters or SolveParameters()
+        history = request.history
+
+        if not history:
+            opener = self.first_guess
+            return SolveResponse(
+                next_guess=opener,
+                suggestions=[opener][: parameters.max_suggestions],
+                remaining_candidates=self._word_manager.answer_count,
+                thoughts=[
+                    AgentThought(
+                        message="No prior guesses supplied; using default opener.",
+                        score=None,
+                    )
+                ],
+            )
+
+        precomputed = self._precomputed_response(history, parameters)
+        if precomputed is not None:
+            return precomputed
+
+        candidates = self._apply_history(history)
+        remaining = len(candidates)
+
+        if remaining == 0:
+            return SolveResponse(
+                next_guess=None,
+                suggestions=[],
+                remaining_candidates=0,
+                thoughts=[
+                    AgentThought(
+                        message="No candidates match the provided feedback history.",
+                        score=None,
+                    )
+                ],
+            )
+
+        search = self.search(parameters.objective)
+        started = time.time()
+        exact = search.lookup(candidates)
+        timed_out = False
+        if exact is None and remaining <= self.max_exact_candidates:
+            try:
+                with self._lock:
+                    exact = search.solve(candidates, deadline=started + self.time_budget)
+            except SearchTimeout:
+                timed_out = True
+
+        allowed = self._hard_mode_mask(history, parameters)
+        ranked = self._rank_by_entropy(candidates, history, parameters, allowed)
+        if exact is not None and allowed is not None and not allowed[exact[1]]:
+            # The stored search plays without hard mode; keep its move only if allowed.
+            exact = None
+        if exact is not None:
+            ranked = np.concatenate(([exact[1]], ranked[ranked != exact[1]]))
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
+
+        return SolveResponse(
+            next_guess=suggestions[0] if suggestions else None,
+            suggestions=suggestions,
+            remaining_candidates=remaining,
+            thoughts=self._describe_decision(
+                history,
+                remaining,
+                self._to_words(ranked[:3]),
+                search,
+                exact,
+                timed_out,
+                time.time() - started,
+            ),
+        )
+
+    def _rank_by_entropy(
+        self,
+        candidates: np.ndarray,
+        history: Sequence[GuessFeedback],
+        parameters: SolveParameters,
+        allowed: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        if len(candidates) <= 2:
+            return candidates
+        depth = self._ranking_depth(history, parameters)
+        scores = self._scorer.scores(self._ordered_indices, candidates)
+        if allowed is not None:
+            scores[~allowed] = -np.inf
+        ranked = self._ordered_indices[top_k(scores, depth)]
+        if allowed is not None:
+            ranked = ranked[allowed[ranked]]
+        if not parameters.allow_repeats:
+            ranked = ranked[~np.isin(ranked, self._tried_indices(history))]
+        return ranked
+
+    def _describe_decision(
+        self,
+        history: Sequence[GuessFeedback],
+        remaining_candidates: int,
+        top_ranked: Sequence[str],
+        search: ExactSearch,
+        exact: Optional[Tuple[int, int]],
+        timed_out: bool,
+        elapsed: float,
+    ) -> List[AgentThought]:
+        thoughts: List[AgentThought] = []
+
+        last = history[-1]
+        thoughts.append(
+            AgentThought(
+                message=f"Processed guess '{last.guess.upper()}' with feedback {last.feedback}.",
+                score=None,
+            )
+        )
+        thoughts.append(
+            AgentThought(
+                message=f"{remaining_candidates} candidates remain after filtering.",
+                score=float(remaining_candidates),
+            )
+        )
+
+        if exact is not None:
+            guesses = search.expected_guesses(exact[0], remaining_candidates)
+            measure = (
+                "in the worst case"
+                if search.objective == SearchObjective.WORST_CASE
+                else "on average"
+            )
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Exact search: {top_ranked[0]} solves every candidate in "
+                        f"{guesses:.3f} guesses {measure} ({elapsed * 1000:.0f} ms)."
+                    ),
+                    score=guesses,
+                )
+            )
+        elif timed_out:
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"Exact search exceeded its {self.time_budget:g}s budget; "
+                        "ranked by entropy instead."
+                    ),
+                    score=None,
+                )
+            )
+        else:
+            thoughts.append(
+                AgentThought(
+                    message=(
+                        f"More than {self.max_exact_candidates} candidates remain; "
+                        "ranked by entropy instead of exact search."
+                    ),
+                    score=None,
+                )
+            )
+
+        if top_ranked:
+            thoughts.append(
+                AgentThought(
+                    message=f"Top recommendations: {', '.join(top_ranked)}.",
+                    score=None,
+                )
+            )
+
+        return thoughts
+
+
+# ----------------------------------------------------------------------
+# Offline certification
+# ----------------------------------------------------------------------
+
+
+def _solve_subtree(
+    candidates: np.ndarray,
+    objective: SearchObjective,
+    guess_limit: Optional[int],
+    deadline: float,
+) -> Tuple[Optional[int], List[PlanStep], int]:
+    """Worker: solve one opener bucket and return its value, plan and searched states."""
+    search = ExactSearch(wordlist, objective, guess_limit)
+    try:
+        value, _ = search.solve(candidates, deadline=deadline)
+    except SearchTimeout:
+        return None, [], search.nodes
+    return value, search.plan(candidates), search.nodes
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Certify the optimal plan below an opener: ``python -m agent.optimal``."""
+    from .decision_tree import DecisionTree, tree_path
+    from .opening_book import OpeningBook, table_path
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--objective",
+        default=SearchObjective.EXPECTED_GUESSES.value,
+        choices=[objective.value for objective in SearchObjective],
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=3600.0,
+        help="seconds before unfinished buckets are given up",
+    )
+    parser.add_argument(
+        "--guess-limit",
+        type=int,
+        default=None,
+        help="non-candidate guesses tried per state (default: all, which is exact)",
+    )
+    args = parser.parse_args(argv)
+    objective = SearchObjective(args.objective)
+
+    # Tables are served only to an agent with the registry's default settings.
+    agent = OptimalAgent()
+    opener = agent.first_guess
+    root = wordlist.answer_indices()
+    codes = wordlist.feedback_row(opener)[root]
+    buckets = sorted(
+        (root[codes == code] for code in np.unique(codes) if code != _SOLVED_CODE),
+        key=len,
+        reverse=True,
+    )
+
+    started = time.time()
+    deadline = started + args.time_budget
+    total = len(root)
+    certified = True
+    print(f"🔎 Searching {len(buckets)} buckets below {opener} on {args.workers} worker(s)")
+
+    def record(done: int, bucket: np.ndarray, result) -> None:
+        nonlocal total, certified
+        value, plan, nodes = result
+        elapsed = time.time() - started
+        if value is None:
+            certified = False
+            print(
+                f"   [{done}/{len(buckets)}] {len(bucket)} candidates: timed out "
+                f"after {nodes} states ({elapsed:.0f}s)"
+            )
+            return
+        agent.search(objective).adopt(plan)
+        total += value
+        average = agent.search(objective).expected_guesses(value, len(bucket))
+        print(
+            f"   [{done}/{len(buckets)}] {len(bucket)} candidates: {average:.3f} "
+            f"guesses, {nodes} states ({elapsed:.0f}s)"
+        )
+
+    if args.workers <= 1:
+        for done, bucket in enumerate(buckets, start=1):
+            record(done, bucket, _solve_subtree(bucket, objective, args.guess_limit, deadline))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = {
+                executor.submit(
+                    _solve_subtree, bucket, objective, args.guess_limit, deadline
+                ): bucket
+                for bucket in buckets
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                record(done, futures[future], future.result())
+
+    if certified and objective == SearchObjective.EXPECTED_GUESSES:
+        print(f"✅ Certified {opener}: {total / len(root):.4f} guesses on average")
+    elif certified:
+        print(f"✅ Certified the worst case below {opener}")
+    else:
+        print("⚠️  Some buckets timed out; their states fall back to the online agent")
+
+    # Served tables answer requests with default parameters only.
+    if objective != SearchObjective.EXPECTED_GUESSES:
+        return
+    tree = DecisionTree.compile(agent)
+    tree.save(tree_path(SolverStrategy.OPTIMAL))
+    OpeningBook.build(agent).save(table_path(SolverStrategy.OPTIMAL))
+    print(f"✅ Stored {len(tree)}-node optimal decision tree and opening table")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,20 +35,25 @@ class RandomAgent(Agent):
                 ],
             )
 
-        suggestions = random.sample(
-            candidates,
-            k=min(parameters.max_suggestions, len(candidates)),
+        picks = random.sample(
+            range(remaining),
+            k=min(parameters.max_suggestions, remaining),
         )
+        ranked, endgame_thought = self._endgame_rerank(candidates[picks], candidates, parameters)
+        suggestions = self._to_words(ranked[: parameters.max_suggestions])
         next_guess = suggestions[0] if suggestions else None
 
+        thoughts = [
+            AgentThought(
+                message=f"Selected {next_guess} at random from {remaining} candidates.",
+                score=None,
+            )
+        ]
+        if endgame_thought is not None:
+            thoughts.append(endgame_thought)
         return SolveResponse(
             next_guess=next_guess,
             suggestions=suggestions,
             remaining_candidates=remaining,
-            thoughts=[
-                AgentThought(
-                    message=f"Selected {next_guess} at random from {remaining} candidates.",
-                    score=None,
-                )
-            ],
+            thoughts=thoughts,
         )
\ No newline at end of file
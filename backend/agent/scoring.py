@@ -0,0 +1,283 @@
+"""Shared entropy scoring kernel used by the entropy-based agents."""
+
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from word_manager.code_block_cache import CodeBlockCache, code_block_cache
+from word_manager.word_manager import WordListManager, wordlist
+
+PATTERN_SPACE = 3**5  # 243 possible feedback codes for 5 letters
+
+# Roughly this many (candidate, guess) cells are histogrammed per chunk so the
+# bincount keys stay cache-resident whatever the candidate count.
+_TARGET_CELLS = 1 << 16
+_MIN_CHUNK_GUESSES = 16
+_TINY = np.finfo(np.float64).tiny
+
+
+class EntropyScorer:
+    """Score guesses by the Shannon entropy of their feedback partition.
+
+    Codes come from the target-major matrix, so the candidates are contiguous rows,
+    or from a ``CodeBlockCache`` that narrows blocks already in RAM.
+    Entropy is computed from integer bucket counts as ``log2(n) - sum(c*log2(c))/n``
+    with a precomputed ``c*log2(c)`` table, and the per-word duplicate-letter
+    penalty is a precomputed vector, so a scoring pass never touches Python objects
+    per word. Histogram key buffers are allocated once per thread and reused.
+
+    With ``weights`` (one per candidate, e.g. the dictionary priors) buckets hold
+    the candidates' total weight instead of their count, via the ``weights``
+    argument of the same ``bincount``, so likely answers dominate the partition.
+    """
+
+    def __init__(
+        self,
+        word_manager: WordListManager,
+        duplicate_penalty: float = 0.0,
+        blocks: Optional[CodeBlockCache] = None,
+    ) -> None:
+        self._word_manager = word_manager
+        self._blocks = blocks
+        word_count = len(word_manager.words)
+
+        counts = np.arange(word_count + 1, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._log2 = np.where(counts > 0, np.log2(counts), 0.0)
+        self._nlogn = counts * self._log2
+
+        unique_letters = _unique_letter_counts(word_manager.letter_array())
+        self.penalties = (5 - unique_letters) * duplicate_penalty
+        self._letters = word_manager.letter_array()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def scores(
+        self,
+        guesses: np.ndarray,
+        candidates: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Return penalized entropy scores aligned with ``guesses``."""
+        return self.entropies(guesses, candidates, weights) - self.penalties[guesses]
+
+    def entropies(
+        self,
+        guesses: np.ndarray,
+        candidates: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Return the raw feedback entropy of each guess over ``candidates``.
+
+        ``weights`` are aligned with ``candidates``; without them every candidate
+        counts once.
+        """
+        if not len(guesses) or not len(candidates):
+            return np.zeros(len(guesses), dtype=np.float64)
+
+        if self._blocks is not None:
+            block = self._blocks.block(candidates)
+        else:
+            block = self._word_manager.target_codes(candidates)
+        if not is_full_range(guesses, block.shape[1]):
+            block = block[:, guesses]
+        if weights is not None:
+            return self.weighted_entropy_from_block(block, weights)
+        return self.entropy_from_block(block)
+
+    def entropy_from_block(self, block: np.ndarray) -> np.ndarray:
+        """Return the entropy of every column of a ``candidates x guesses`` code block."""
+        candidate_count, guess_count = block.shape
+        entropies = np.zeros(guess_count, dtype=np.float64)
+        if candidate_count == 0 or guess_count == 0:
+            return entropies
+
+        chunk = max(_MIN_CHUNK_GUESSES, _TARGET_CELLS // candidate_count)
+        log_total = np.log2(candidate_count)
+        for start in range(0, guess_count, chunk):
+            codes = block[:, start : start + chunk]
+            width = codes.shape[1]
+            keys = self._bucket_keys(codes)
+            counts = np.bincount(keys.ravel(), minlength=width * PATTERN_SPACE)
+            if candidate_count < PATTERN_SPACE:
+                # Fewer candidates than buckets: sum log2(bucket size) per candidate.
+                spread = self._log2[counts[keys]].sum(axis=0)
+            else:
+                spread = self._nlogn[counts.reshape(width, PATTERN_SPACE)].sum(axis=1)
+            entropies[start : start + width] = log_total - spread / candidate_count
+        return entropies
+
+    def weighted_entropy_from_block(self, block: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Like ``entropy_from_block`` with each row counted ``weights[row]`` times.
+
+        The bucket masses are ``W_b``, so the entropy is
+        ``log2(W) - sum(W_b*log2(W_b))/W``; zero-weight rows drop out.
+        """
+        candidate_count, guess_count = block.shape
+        entropies = np.zeros(guess_count, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if candidate_count == 0 or guess_count == 0 or total <= 0:
+            return entropies
+
+        chunk = max(_MIN_CHUNK_GUESSES, _TARGET_CELLS // candidate_count)
+        for start in range(0, guess_count, chunk):
+            codes = block[:, start : start + chunk]
+            width = codes.shape[1]
+            keys = self._bucket_keys(codes)
+            row_weights = np.broadcast_to(weights[:, None], keys.shape).ravel()
+            masses = np.bincount(keys.ravel(), row_weights, minlength=width * PATTERN_SPACE)
+            # An empty bucket's log2 is only ever multiplied by zero weight.
+            if candidate_count < PATTERN_SPACE:
+                spread = weights @ np.log2(np.maximum(masses[keys], _TINY))
+            else:
+                spread = masses * np.log2(np.maximum(masses, _TINY))
+                spread = spread.reshape(width, PATTERN_SPACE).sum(axis=1)
+            entropies[start : start + width] = np.log2(total) - spread / total
+        return entropies
+
+    def partition_entropies(
+        self, block: np.ndarray, labels: np.ndarray, partitions: int
+    ) -> np.ndarray:
+        """Return the entropy of every column within every partition of a code block.
+
+        ``labels`` assigns each row of ``block`` to one of ``partitions`` groups and
+        the result is ``partitions x guesses``. All groups are histogrammed by the
+        same ``bincount`` (the group label is one more key offset), so scoring a
+        second guess in every feedback bucket of a first guess is one pass over
+        the block.
+        """
+        candidate_count, guess_count = block.shape
+        entropies = np.zeros((partitions, guess_count), dtype=np.float64)
+        if candidate_count == 0 or guess_count == 0:
+            return entropies
+
+        order = np.argsort(labels, kind="stable")
+        sizes = np.bincount(labels, minlength=partitions)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        present = sizes > 0
+        log_sizes = self._log2[sizes][:, None]
+
+        # Both the keys and the per-group histograms should stay cache-sized.
+        histogram_cells = _TARGET_CELLS * 16 // (partitions * PATTERN_SPACE)
+        chunk = max(_MIN_CHUNK_GUESSES, min(_TARGET_CELLS // candidate_count, histogram_cells))
+        group_offsets = (labels[order].astype(np.intp) * (chunk * PATTERN_SPACE))[:, None]
+        for start in range(0, guess_count, chunk):
+            codes = block[order, start : start + chunk]
+            width = codes.shape[1]
+            keys = self._bucket_keys(codes)
+            keys += group_offsets
+            counts = np.bincount(keys.ravel(), minlength=partitions * chunk * PATTERN_SPACE)
+            # sum(c * log2(c)) over a group's buckets == sum(log2(c)) over its rows.
+            spread = np.add.reduceat(self._log2[counts[keys]], starts[present], axis=0)
+            entropies[present, start : start + width] = (
+                log_sizes[present] - spread / sizes[present][:, None]
+            )
+        return entropies
+
+    def expected_next_entropy(self, codes: np.ndarray, second_ply: np.ndarray) -> float:
+        """Size-weighted best entropy a second guess reaches in each feedback bucket.
+
+        ``codes`` are a first guess's feedback codes over the candidates and
+        ``second_ply`` the ``candidates x guesses`` block of the second guesses
+        considered. Solved and single-word buckets need no second guess.
+        """
+        labels, sizes = np.unique(codes, return_inverse=True, return_counts=True)[1:]
+        open_rows = (sizes[labels] > 1) & (codes != PATTERN_SPACE - 1)
+        if not open_rows.any():
+            return 0.0
+        labels = np.unique(labels[open_rows], return_inverse=True)[1]
+        partitions = int(labels.max()) + 1
+        best = self.partition_entropies(second_ply[open_rows], labels, partitions).max(axis=1)
+        weights = np.bincount(labels, minlength=partitions)
+        return float(best @ weights) / len(codes)
+
+    def upper_bounds(self, guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Return a cheap upper bound on ``scores(guesses, candidates)``.
+
+        A guess letter can only come back yellow if some candidate contains it and
+        green if some candidate has it at that position, so the product of those
+        per-position options bounds the number of distinct feedback codes, and the
+        entropy is at most ``log2`` of that (or of the candidate count).
+        """
+        reachable = self.reachable_codes(guesses, candidates)
+        return np.log2(np.maximum(reachable, 1)) - self.penalties[guesses]
+
+    def reachable_codes(self, guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Return an upper bound on how many distinct codes each guess can produce."""
+        candidate_letters = self._letters[candidates]
+        positions = np.arange(5)
+        at_position = np.zeros((5, 26), dtype=bool)
+        at_position[positions, candidate_letters] = True
+        anywhere = at_position.any(axis=0)
+
+        guess_letters = self._letters[guesses]
+        options = 1 + anywhere[guess_letters] + at_position[positions, guess_letters]
+        return np.minimum(options.prod(axis=1), min(len(candidates), PATTERN_SPACE))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _bucket_keys(self, codes: np.ndarray) -> np.ndarray:
+        """Offset each guess column's codes into its own run of ``PATTERN_SPACE`` keys."""
+        rows, columns = codes.shape
+        keys = self._workspace(rows * columns).reshape(rows, columns)
+        np.add(codes, self._column_offsets(columns), out=keys, casting="unsafe")
+        return keys
+
+    def _workspace(self, size: int) -> np.ndarray:
+        buffer: Optional[np.ndarray] = getattr(self._local, "keys", None)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=np.intp)
+            self._local.keys = buffer
+        return buffer[:size]
+
+    def _column_offsets(self, columns: int) -> np.ndarray:
+        offsets: Optional[np.ndarray] = getattr(self._local, "offsets", None)
+        if offsets is None or offsets.shape[1] < columns:
+            offsets = (np.arange(columns, dtype=np.intp) * PATTERN_SPACE)[None, :]
+            self._local.offsets = offsets
+        return offsets[:, :columns]
+
+
+@lru_cache(maxsize=None)
+def shared_scorer(duplicate_penalty: float = 0.0) -> EntropyScorer:
+    """Return the process-wide scorer for a given duplicate-letter penalty."""
+    return EntropyScorer(wordlist, duplicate_penalty, code_block_cache)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return positions of the ``k`` highest scores, best first.
+
+    Ties keep their original order, so the result equals the first ``k`` entries of
+    a stable descending sort while only sorting the selected slice.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+
+    threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    selected = np.flatnonzero(scores >= threshold)
+    return selected[np.argsort(-scores[selected], kind="stable")][:k]
+
+
+def is_full_range(indices: np.ndarray, size: int) -> bool:
+    """Whether ``indices`` is exactly ``0..size-1`` in order, so a column gather is a no-op.
+
+    The comparison is one pass over the indices, far cheaper than the gather it saves.
+    """
+    return len(indices) == size and bool(np.array_equal(indices, np.arange(size)))
+
+
+def _unique_letter_counts(letters: np.ndarray) -> np.ndarray:
+    ordered = np.sort(letters, axis=1)
+    return 1 + (ordered[:, 1:] != ordered[:, :-1]).sum(axis=1)
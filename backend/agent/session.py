@@ -0,0 +1,121 @@
+"""Play one game turn by turn without re-filtering its history every turn.
+
+An agent's ``solve`` rebuilds the candidates from the full history, so driving a
+game through it costs a filter per history entry per turn. A ``GameSession``
+keeps the surviving candidates between turns and, once the agent has scored a
+small enough state, that state's code block (every guess's feedback code for
+each candidate): recording a guess then narrows both with one column
+comparison. Each state is put into the shared candidate and code block
+caches, where the agent looks first, so it neither filters the history nor
+gathers matrix rows again. Agents that never read code
+blocks (frequency, random) leave the session without one.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from schema.solve_response import SolveResponse
+from word_manager.candidate_cache import HistoryKey, candidate_cache
+from word_manager.code_block_cache import code_block_cache
+from word_manager.word_manager import wordlist
+
+from .base import Agent
+
+# States at or below this many candidates keep their code block (about 13 KB per row).
+_BLOCK_ROWS = 512
+# Every strategy answers states this small without scoring, so they need no block.
+_UNSCORED_ROWS = 2
+
+
+class GameSession:
+    """One game's history, surviving candidates and their code block."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        parameters: Optional[SolveParameters] = None,
+        history: Sequence[GuessFeedback] = (),
+    ) -> None:
+        self.agent = agent
+        self.parameters = parameters or SolveParameters()
+        self.history: List[GuessFeedback] = []
+        self.candidates = wordlist.answer_indices()
+        self._key: HistoryKey = ()
+        self._block: Optional[np.ndarray] = None
+        for entry in history:
+            self.record(entry.guess, entry.feedback)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def solved(self) -> bool:
+        return bool(self.history) and self.history[-1].feedback == "22222"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the carried state (the block is shared with the code block cache)."""
+        block = self._block.nbytes if self._block is not None else 0
+        return self.candidates.nbytes + block
+
+    def suggest(self) -> SolveResponse:
+        """Ask the agent for the next guess in the current state."""
+        scored = self.remaining > _UNSCORED_ROWS
+        if scored and self._block is not None:
+            code_block_cache.seed(self.candidates, self._block)
+        request = SolveRequest(history=list(self.history), parameters=self.parameters)
+        response = self.agent.solve(request)
+        if scored and self._block is None and self._key and self.remaining <= _BLOCK_ROWS:
+            self._block = code_block_cache.peek(self.candidates)
+        return response
+
+    def park(self) -> None:
+        """Drop the carried code block while the game waits for its next guess.
+
+        The block stays in the shared code block cache as long as that has room,
+        so a session resumed soon is still served from RAM; otherwise the agent
+        gathers it again.
+        """
+        self._block = None
+
+    def record(self, guess: str, feedback: str) -> GuessFeedback:
+        """Apply ``guess`` and its feedback; raises ``ValueError`` for unknown words."""
+        entry = GuessFeedback(guess=guess.upper(), feedback=feedback)
+        word_index = wordlist.get_index_mapping().get(entry.guess)
+        if word_index is None:
+            raise ValueError(f"'{entry.guess}' is not in the dictionary.")
+
+        key = self._key + ((entry.guess, entry.feedback),)
+        if self._block is not None:
+            keep = wordlist.feedback_mask(self._block[:, word_index], entry.feedback)
+            self.candidates = candidate_cache.put(key, self.candidates[keep])
+            self._block = self._block[keep]
+        else:
+            # Other games may have reached this state already.
+            candidates = candidate_cache.get(key)
+            if candidates is None:
+                candidates = candidate_cache.put(
+                    key,
+                    wordlist.filter_candidates(self.candidates, entry.guess, entry.feedback),
+                )
+            self.candidates = candidates
+
+        self.history.append(entry)
+        self._key = key
+        return entry
+
+    def play(self, answer: str) -> Tuple[SolveResponse, Optional[GuessFeedback]]:
+        """Take one turn against a known answer: suggest, score and record the guess.
+
+        The entry is ``None`` when the agent has no guess left to make.
+        """
+        response = self.suggest()
+        guess = response.next_guess or (response.suggestions[0] if response.suggestions else None)
+        if not guess:
+            return response, None
+        return response, self.record(guess, wordlist.get_feedback_pattern(guess, answer))
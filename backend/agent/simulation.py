@@ -0,0 +1,93 @@
+"""Play a strategy against many answers at once.
+
+Games are played in lockstep: every turn, the still-running games are grouped by
+their history, the agent is asked once per distinct history, and its guess is
+scored against every answer of the group. All games open in the same state and
+keep sharing states until their feedback differs, so a full-dictionary run asks
+the agent for a few thousand states instead of one per game and turn.
+
+``split_by_opener`` cuts a run into independent batches along the first
+guess's feedback, which is where games stop sharing anything; each batch is one
+task for a process pool (see ``play_batch``).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from word_manager.word_manager import wordlist
+
+from .base import Agent
+
+_SOLVED = "22222"
+
+
+class GameResult(NamedTuple):
+    """Outcome of one game: the answer, whether it was found, and every guess."""
+
+    answer: str
+    solved: bool
+    guesses: Tuple[str, ...]
+
+
+def play_lockstep(
+    agent: Agent,
+    answers: Sequence[str],
+    parameters: SolveParameters,
+    max_attempts: int,
+) -> List[GameResult]:
+    """Play one game per answer, asking ``agent`` once per distinct state and turn."""
+    histories: List[Tuple[GuessFeedback, ...]] = [()] * len(answers)
+    solved = [False] * len(answers)
+    playing = list(range(len(answers)))
+
+    for _ in range(max_attempts):
+        groups: Dict[Tuple[Tuple[str, str], ...], List[int]] = {}
+        for game in playing:
+            key = tuple((entry.guess, entry.feedback) for entry in histories[game])
+            groups.setdefault(key, []).append(game)
+
+        playing = []
+        for members in groups.values():
+            history = list(histories[members[0]])
+            guess = agent.solve(SolveRequest(history=history, parameters=parameters)).next_guess
+            if not guess:
+                continue
+            for game in members:
+                feedback = wordlist.get_feedback_pattern(guess, answers[game])
+                entry = GuessFeedback(guess=guess, feedback=feedback)
+                histories[game] = histories[game] + (entry,)
+                if feedback == _SOLVED:
+                    solved[game] = True
+                else:
+                    playing.append(game)
+        if not playing:
+            break
+
+    return [
+        GameResult(answer, solved[game], tuple(entry.guess for entry in histories[game]))
+        for game, answer in enumerate(answers)
+    ]
+
+
+def split_by_opener(
+    agent: Agent, answers: Sequence[str], parameters: SolveParameters
+) -> List[List[int]]:
+    """Group answer positions by the feedback they give to the agent's opening guess."""
+    opener = agent.solve(SolveRequest(history=[], parameters=parameters)).next_guess
+    if not opener:
+        return [list(range(len(answers)))] if answers else []
+    batches: Dict[int, List[int]] = {}
+    for position, answer in enumerate(answers):
+        batches.setdefault(wordlist.get_feedback_code(opener, answer), []).append(position)
+    return list(batches.values())
+
+
+def play_batch(parameters_json: str, answers: Sequence[str], max_attempts: int) -> List[GameResult]:
+    """Process-pool entry point: build (or reuse) the worker's agent and play ``answers``."""
+    from . import get_agent
+
+    parameters = SolveParameters.model_validate_json(parameters_json)
+    agent = get_agent(parameters.strategy)
+    return play_lockstep(agent, answers, parameters, max_attempts)
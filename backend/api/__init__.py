@@ -1,18 +1,25 @@
-"""API module."""
-
 """API route handlers."""
 
 from datetime import datetime, timezone
+import json
 import random
-from typing import List
+from typing import Iterator, List, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from schema import (
     AutoplayRequest,
     AutoplayResponse,
     AutoplayStep,
+    BatchSolveRequest,
+    BatchSolveResponse,
     GuessFeedback,
+    SimulationProgress,
+    SimulationRequest,
+    SessionResponse,
+    SessionStats,
     SolveParameters,
     SolveRequest,
     SolveResponse,
@@ -21,9 +28,13 @@ from schema import (
     HealthResponse,
 )
 from agent import get_agent, SolverStrategy
-from agent.base import Agent as BaseAgent
+from agent.batch import solve_batch
+from agent.session import GameSession
 from word_manager.word_manager import wordlist
 
+from .sessions import StoredSession, sessions
+from .simulation import SimulationBusy, SimulationRun, simulations
+
 router = APIRouter()
 
 
@@ -66,68 +77,256 @@ async def solve_wordle(request: SolveRequest):
     return response
 
 
+@router.post("/api/solve/batch", response_model=BatchSolveResponse)
+async def solve_wordle_batch(request: BatchSolveRequest):
+    """Solve many histories at once; identical states are solved once."""
+    try:
+        results, solved_states = await run_in_threadpool(solve_batch, request.requests)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return BatchSolveResponse(results=results, solved_states=solved_states)
+
+
+@router.post("/api/session", response_model=SessionResponse)
+async def create_session(request: SolveRequest):
+    """Start a session from an optional history; the server keeps its candidates.
+
+    Later guesses on the session (``POST /api/session/{id}/guess``) only apply
+    the new entry instead of replaying the whole history.
+    """
+    parameters = request.parameters or SolveParameters()
+    try:
+        game = GameSession(get_agent(parameters.strategy), parameters, request.history)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        result = await run_in_threadpool(_session_result, game)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return _session_response(sessions.add(game, result))
+
+
+@router.get("/api/session/stats", response_model=SessionStats)
+async def session_stats():
+    """Size and hit/eviction counters of the session store."""
+    return sessions.stats()
+
+
+@router.get("/api/session/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str):
+    """Current state of a session and its last suggestion."""
+    return await run_in_threadpool(_session_snapshot, _stored_session(session_id))
+
+
+@router.post("/api/session/{session_id}/guess", response_model=SessionResponse)
+async def guess_in_session(session_id: str, entry: GuessFeedback):
+    """Apply one guess and its feedback, then suggest the next guess."""
+    stored = _stored_session(session_id)
+    try:
+        return await run_in_threadpool(_apply_session_guess, stored, entry)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def _stored_session(session_id: str) -> StoredSession:
+    stored = sessions.get(session_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session.")
+    return stored
+
+
+def _apply_session_guess(stored: StoredSession, entry: GuessFeedback) -> SessionResponse:
+    with stored.lock:
+        if stored.game.solved:
+            raise HTTPException(status_code=409, detail="The session is already solved.")
+        try:
+            stored.game.record(entry.guess, entry.feedback)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        stored.result = _session_result(stored.game)
+        sessions.update(stored)
+        return _session_response(stored)
+
+
+def _session_snapshot(stored: StoredSession) -> SessionResponse:
+    # Waits for a guess in progress on the same session.
+    with stored.lock:
+        return _session_response(stored)
+
+
+def _session_result(game: GameSession) -> Optional[SolveResponse]:
+    result = None if game.solved else game.suggest()
+    # Stored sessions keep no code block of their own; the shared cache may still hold it.
+    game.park()
+    return result
+
+
+def _session_response(stored: StoredSession) -> SessionResponse:
+    return SessionResponse(
+        id=stored.id,
+        strategy=stored.game.parameters.strategy,
+        state=stored.state(),
+        result=stored.result,
+        expires_in=sessions.expires_in(stored),
+    )
+
+
 @router.post("/api/autoplay", response_model=AutoplayResponse)
 async def autoplay(request: AutoplayRequest):
     """Run a fully automated solving session for a hidden answer."""
 
-    answer = request.answer.upper() if request.answer else random.choice(wordlist.words)
+    answer = _autoplay_answer(request)
+    steps: List[AutoplayStep] = []
+    try:
+        for step in _autoplay_steps(request, answer):
+            steps.append(step)
+    except Exception as exc:  # pragma: no cover - agent errors bubbled up
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    return _autoplay_response(answer, steps)
+
+
+@router.post("/api/autoplay/stream")
+async def autoplay_stream(request: AutoplayRequest):
+    """Run an autoplay session as Server-Sent Events.
+
+    Emits ``start`` with the answer, one ``step`` per ``AutoplayStep`` as soon as
+    its guess is computed, and ``done`` with the full ``AutoplayResponse`` (or
+    ``error`` if the agent fails).
+    """
+    answer = _autoplay_answer(request)
+
+    def events() -> Iterator[str]:
+        yield _sse("start", json.dumps({"answer": answer}))
+        steps: List[AutoplayStep] = []
+        try:
+            for step in _autoplay_steps(request, answer):
+                steps.append(step)
+                yield _sse("step", step.model_dump_json())
+        except Exception as exc:  # pragma: no cover - agent errors end the stream
+            yield _sse("error", json.dumps({"detail": str(exc)}))
+            return
+        yield _sse("done", _autoplay_response(answer, steps).model_dump_json())
+
+    # A sync generator is iterated in the threadpool, one solve per step.
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _autoplay_answer(request: AutoplayRequest) -> str:
+    answer = request.answer.upper() if request.answer else random.choice(wordlist.answers)
     answer = answer.strip().upper()
 
     if len(answer) != 5:
         raise HTTPException(status_code=400, detail="Answer must be 5 letters long.")
     if not wordlist.is_valid(answer):
         raise HTTPException(status_code=400, detail="Answer is not in the dictionary.")
+    if not wordlist.is_answer(answer):
+        # Allowed-only guesses are never candidates, so no strategy could find them.
+        raise HTTPException(status_code=400, detail="Answer is not in the answer list.")
+    return answer
 
-    agent = get_agent(request.strategy)
-    history: List[GuessFeedback] = []
-    steps: List[AutoplayStep] = []
-    solved = False
 
-    for _ in range(request.max_attempts):
-        parameters = SolveParameters(
-            strategy=request.strategy,
-            max_suggestions=1,
-            allow_repeats=request.allow_repeats,
-        )
-        solve_request = SolveRequest(history=history, parameters=parameters)
-        try:
-            result = agent.solve(solve_request)
-        except Exception as exc:  # pragma: no cover - agent errors bubbled up
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
+def _autoplay_steps(request: AutoplayRequest, answer: str) -> Iterator[AutoplayStep]:
+    """Play the game, yielding each step as soon as its guess is known."""
+    parameters = SolveParameters(
+        strategy=request.strategy,
+        max_suggestions=1,
+        allow_repeats=request.allow_repeats,
+        hard_mode=request.hard_mode,
+    )
+    session = GameSession(get_agent(request.strategy), parameters)
 
-        guess = result.next_guess or (result.suggestions[0] if result.suggestions else None)
-        if not guess:
+    for _ in range(request.max_attempts):
+        result, attempt = session.play(answer)
+        if attempt is None:
             break
 
-        feedback_pattern = BaseAgent.compute_feedback(guess, answer)
-        attempt = GuessFeedback(guess=guess, feedback=feedback_pattern)
-        history.append(attempt)
-        steps.append(
-            AutoplayStep(
-                guess=guess,
-                feedback=feedback_pattern,
-                thoughts=result.thoughts,
-                remaining_candidates=result.remaining_candidates,
-            )
+        yield AutoplayStep(
+            guess=attempt.guess,
+            feedback=attempt.feedback,
+            thoughts=result.thoughts,
+            remaining_candidates=result.remaining_candidates,
         )
 
-        if feedback_pattern == "2" * len(answer):
-            solved = True
+        if session.solved:
             break
 
+
+def _autoplay_response(answer: str, steps: List[AutoplayStep]) -> AutoplayResponse:
     return AutoplayResponse(
         answer=answer,
-        solved=solved,
-        attempts_used=len(history),
+        solved=bool(steps) and steps[-1].feedback == "2" * len(answer),
+        attempts_used=len(steps),
         steps=steps,
     )
 
 
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/api/simulate")
+async def simulate(request: SimulationRequest):
+    """Play a strategy against many answers, streaming one NDJSON line per game.
+
+    The last line is a summary. The run's id is in the ``X-Simulation-Id`` header
+    for ``GET``/``DELETE /api/simulate/{id}``.
+    """
+    answers = [answer.strip().upper() for answer in request.answers or wordlist.answers]
+    # Allowed-only guesses are never candidates, so games against them cannot be won.
+    unknown = [answer for answer in answers if not wordlist.is_answer(answer)]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Answers not in the answer list: {', '.join(unknown[:10])}"
+        )
+
+    parameters = SolveParameters(
+        strategy=request.strategy,
+        max_suggestions=1,
+        allow_repeats=request.allow_repeats,
+        hard_mode=request.hard_mode,
+    )
+    run = SimulationRun(request.strategy, answers, parameters, request.max_attempts)
+    try:
+        lines = simulations.start(run)
+    except SimulationBusy as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    return StreamingResponse(
+        lines, media_type="application/x-ndjson", headers={"X-Simulation-Id": run.id}
+    )
+
+
+@router.get("/api/simulate/{run_id}", response_model=SimulationProgress)
+async def simulation_progress(run_id: str):
+    """Progress of a running or recently finished simulation."""
+    run = simulations.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown simulation.")
+    return run.progress()
+
+
+@router.delete("/api/simulate/{run_id}", response_model=SimulationProgress)
+async def cancel_simulation(run_id: str):
+    """Cancel a simulation; its stream ends with a summary of the games finished so far."""
+    run = simulations.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown simulation.")
+    run.cancel()
+    return run.progress()
+
+
 @router.get("/api/words/all")
 async def get_all_words():
     """Get complete word list for frontend validation."""
     return {
         "words": wordlist.words,
+        "answers": wordlist.answers,
         "total": len(wordlist.words),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
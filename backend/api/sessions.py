@@ -0,0 +1,164 @@
+"""In-memory store of ``/api/session`` games between requests."""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+from agent.session import GameSession
+from schema import GameState, GuessState, SessionStats, SolveResponse
+
+# Sessions idle this long are discarded.
+SESSION_TTL = 30 * 60.0
+MAX_SESSIONS = 10_000
+MAX_SESSION_BYTES = 256 * 1024 * 1024
+# Rough size of the Python objects around a session's arrays: the session and its
+# last response, plus each history entry.
+_SESSION_OVERHEAD = 4096
+_ENTRY_OVERHEAD = 512
+
+
+class StoredSession:
+    """A game session, the response last computed for it, and its bookkeeping."""
+
+    __slots__ = ("id", "game", "result", "lock", "last_used", "nbytes")
+
+    def __init__(self, game: GameSession, result: Optional[SolveResponse]) -> None:
+        self.id = uuid.uuid4().hex
+        self.game = game
+        self.result = result
+        # Guesses on one session are applied one at a time.
+        self.lock = Lock()
+        self.last_used = 0.0
+        self.nbytes = 0
+
+    def state(self) -> GameState:
+        game = self.game
+        return GameState(
+            history=[
+                GuessState(guess=entry.guess, feedback=entry.feedback) for entry in game.history
+            ],
+            remaining_candidates=game.remaining,
+            solved=game.solved,
+            solution=game.history[-1].guess if game.solved else None,
+        )
+
+    def measure(self) -> int:
+        return self.game.nbytes + _SESSION_OVERHEAD + _ENTRY_OVERHEAD * len(self.game.history)
+
+
+class SessionStore:
+    """Sessions keyed by id, evicted by idle time, count and estimated bytes.
+
+    Entries are kept in least-recently-used order, so expired sessions are always
+    at the front and are dropped there on every access; the count and byte caps
+    then evict from the front as well.
+    """
+
+    def __init__(
+        self,
+        ttl: float = SESSION_TTL,
+        max_sessions: int = MAX_SESSIONS,
+        max_bytes: int = MAX_SESSION_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, StoredSession]" = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def add(self, game: GameSession, result: Optional[SolveResponse]) -> StoredSession:
+        stored = StoredSession(game, result)
+        with self._lock:
+            stored.last_used = self._clock()
+            stored.nbytes = stored.measure()
+            self._entries[stored.id] = stored
+            self._bytes += stored.nbytes
+            self.created += 1
+            self._evict()
+        return stored
+
+    def get(self, session_id: str) -> Optional[StoredSession]:
+        """Return the live session and mark it used, or ``None`` if unknown or expired."""
+        with self._lock:
+            self._evict()
+            stored = self._entries.get(session_id)
+            if stored is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            stored.last_used = self._clock()
+            self.hits += 1
+            return stored
+
+    def update(self, stored: StoredSession) -> None:
+        """Re-measure ``stored`` after a guess and enforce the byte budget."""
+        with self._lock:
+            if self._entries.get(stored.id) is not stored:
+                return
+            nbytes = stored.measure()
+            self._bytes += nbytes - stored.nbytes
+            stored.nbytes = nbytes
+            self._evict()
+
+    def expires_in(self, stored: StoredSession) -> float:
+        return max(0.0, stored.last_used + self.ttl - self._clock())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.created = self.hits = self.misses = self.expired = self.evicted = 0
+
+    def stats(self) -> SessionStats:
+        with self._lock:
+            self._evict()
+            return SessionStats(
+                sessions=len(self._entries),
+                bytes=self._bytes,
+                max_sessions=self.max_sessions,
+                max_bytes=self.max_bytes,
+                ttl=self.ttl,
+                created=self.created,
+                hits=self.hits,
+                misses=self.misses,
+                expired=self.expired,
+                evicted=self.evicted,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        """Drop expired sessions, then the least recently used ones over a cap."""
+        cutoff = self._clock() - self.ttl
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest.last_used > cutoff:
+                break
+            self._drop(oldest)
+            self.expired += 1
+        # The newest session stays even if it alone exceeds the byte budget.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries.values())))
+            self.evicted += 1
+
+    def _drop(self, stored: StoredSession) -> None:
+        del self._entries[stored.id]
+        self._bytes -= stored.nbytes
+
+
+sessions = SessionStore()
@@ -0,0 +1,227 @@
+"""Bookkeeping and NDJSON streaming for ``POST /api/simulate`` runs."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+
+from agent import get_agent
+from agent.simulation import GameResult, play_batch, split_by_opener
+from schema import (
+    SimulatedGame,
+    SimulationProgress,
+    SimulationSummary,
+    SolveParameters,
+    SolverStrategy,
+)
+
+# Simulations allowed to run at once; further requests are turned away.
+MAX_CONCURRENT_SIMULATIONS = 2
+# Finished runs kept around so their progress can still be queried.
+_FINISHED_HISTORY = 32
+
+
+class SimulationBusy(RuntimeError):
+    """Raised when ``MAX_CONCURRENT_SIMULATIONS`` runs are already in progress."""
+
+
+class SimulationRun:
+    """One simulation: its batches in the process pool and its running totals."""
+
+    def __init__(
+        self,
+        strategy: SolverStrategy,
+        answers: Sequence[str],
+        parameters: SolveParameters,
+        max_attempts: int,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.strategy = strategy
+        self.answers = list(answers)
+        self.parameters = parameters
+        self.max_attempts = max_attempts
+        self.status = "running"
+        self.completed = 0
+        self.solved = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._distribution: Counter = Counter()
+        self._failed: List[str] = []
+        self._futures: List[Future] = []
+        self._cancel = asyncio.Event()
+
+    def progress(self) -> SimulationProgress:
+        return SimulationProgress(
+            id=self.id,
+            strategy=self.strategy,
+            status=self.status,
+            completed=self.completed,
+            solved=self.solved,
+            total=len(self.answers),
+            elapsed=self._elapsed(),
+        )
+
+    def cancel(self) -> None:
+        """Stop the run: queued batches are dropped, running ones are discarded."""
+        for future in self._futures:
+            future.cancel()
+        self._cancel.set()
+
+    async def stream(self, registry: "SimulationRegistry") -> AsyncIterator[str]:
+        """Yield one NDJSON line per finished game, then the summary line.
+
+        The run holds a concurrency slot only while this generator runs, so a
+        stream that is never iterated (the client left before the first chunk)
+        never takes one. A worker error ends the stream early with the error in
+        the summary. If the client goes away the generator is closed, which
+        cancels the run too.
+        """
+        try:
+            pool = registry.acquire(self)
+        except SimulationBusy as exc:  # another run took the last slot meanwhile
+            self.status = "failed"
+            self.finished = time.perf_counter()
+            registry.finish(self)
+            yield self._summary(str(exc)).model_dump_json() + "\n"
+            return
+
+        error: Optional[str] = None
+        cancel = asyncio.ensure_future(self._cancel.wait())
+        try:
+            batches = await run_in_threadpool(self._opener_batches)
+            parameters_json = self.parameters.model_dump_json()
+            positions: Dict[asyncio.Future, List[int]] = {}
+            for batch in batches:
+                future = pool.submit(
+                    play_batch,
+                    parameters_json,
+                    [self.answers[position] for position in batch],
+                    self.max_attempts,
+                )
+                self._futures.append(future)
+                positions[asyncio.wrap_future(future)] = batch
+            pending = set(positions)
+
+            while pending and not self._cancel.is_set():
+                done, pending = await asyncio.wait(
+                    pending | {cancel}, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending.discard(cancel)
+                for batch in done:
+                    if batch is cancel or batch.cancelled():
+                        continue
+                    for position, result in zip(positions[batch], batch.result()):
+                        yield self._record(position, result).model_dump_json() + "\n"
+        except Exception as exc:  # a failed batch ends the stream
+            error = str(exc) or type(exc).__name__
+        finally:
+            cancel.cancel()
+            self.cancel()
+            self.finished = time.perf_counter()
+            if error:
+                self.status = "failed"
+            elif self.completed < len(self.answers):
+                self.status = "cancelled"
+            else:
+                self.status = "completed"
+            registry.finish(self)
+        yield self._summary(error).model_dump_json() + "\n"
+
+    def _opener_batches(self) -> List[List[int]]:
+        return split_by_opener(get_agent(self.strategy), self.answers, self.parameters)
+
+    def _record(self, position: int, result: GameResult) -> SimulatedGame:
+        self.completed += 1
+        if result.solved:
+            self.solved += 1
+            self._distribution[len(result.guesses)] += 1
+        else:
+            self._failed.append(result.answer)
+        return SimulatedGame(
+            index=position,
+            answer=result.answer,
+            solved=result.solved,
+            guesses=list(result.guesses),
+            completed=self.completed,
+            total=len(self.answers),
+        )
+
+    def _summary(self, error: Optional[str]) -> SimulationSummary:
+        total_guesses = sum(guesses * count for guesses, count in self._distribution.items())
+        return SimulationSummary(
+            id=self.id,
+            strategy=self.strategy,
+            games=self.completed,
+            solved=self.solved,
+            average_guesses=total_guesses / self.solved if self.solved else None,
+            distribution=dict(sorted(self._distribution.items())),
+            failed=self._failed,
+            elapsed=self._elapsed(),
+            cancelled=self.status == "cancelled",
+            error=error,
+        )
+
+    def _elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class SimulationRegistry:
+    """Running and recently finished simulations, sharing one process pool."""
+
+    def __init__(self, max_running: int = MAX_CONCURRENT_SIMULATIONS) -> None:
+        self.max_running = max_running
+        self._running: Dict[str, SimulationRun] = {}
+        self._finished: "OrderedDict[str, SimulationRun]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    def start(self, run: SimulationRun) -> AsyncIterator[str]:
+        """Return ``run``'s stream; raises ``SimulationBusy`` if no slot is free now.
+
+        The slot itself is taken when the stream starts (see ``acquire``).
+        """
+        with self._lock:
+            self._check_capacity()
+        return run.stream(self)
+
+    def acquire(self, run: SimulationRun) -> ProcessPoolExecutor:
+        """Register ``run`` as running and return the pool; raises ``SimulationBusy``."""
+        with self._lock:
+            self._check_capacity()
+            self._running[run.id] = run
+            if self._pool is None:
+                # The server is multi-threaded, so workers are not forked from it.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            return self._pool
+
+    def get(self, run_id: str) -> Optional[SimulationRun]:
+        with self._lock:
+            return self._running.get(run_id) or self._finished.get(run_id)
+
+    def _check_capacity(self) -> None:
+        if len(self._running) >= self.max_running:
+            raise SimulationBusy(
+                f"{self.max_running} simulations are already running; try again later."
+            )
+
+    def finish(self, run: SimulationRun) -> None:
+        with self._lock:
+            self._running.pop(run.id, None)
+            self._finished[run.id] = run
+            while len(self._finished) > _FINISHED_HISTORY:
+                self._finished.popitem(last=False)
+
+
+simulations = SimulationRegistry()
@@ -4,6 +4,16 @@ from .solve_response import *
 from .game_state import *
 from .validate import *
 from .autoplay import *
+from .simulate import (
+    SimulatedGame as SimulatedGame,
+    SimulationProgress as SimulationProgress,
+    SimulationRequest as SimulationRequest,
+    SimulationSummary as SimulationSummary,
+)
+from .session import (
+    SessionResponse as SessionResponse,
+    SessionStats as SessionStats,
+)
 
 class HealthResponse(BaseModel):
     """Health check response."""
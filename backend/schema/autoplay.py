@@ -32,6 +32,10 @@ class AutoplayRequest(BaseModel):
         default=False,
         description="Whether the bot may repeat previous guesses.",
     )
+    hard_mode: bool = Field(
+        default=False,
+        description="Whether every guess must be consistent with the hints revealed so far.",
+    )
 
 
 class AutoplayStep(BaseModel):
@@ -9,7 +9,7 @@ class GuessState(BaseModel):
     """Represents a submitted guess and its feedback."""
 
     guess: str = Field(..., min_length=5, max_length=5)
-    feedback: str = Field(..., pattern=r"^[012]{5}$")
+    feedback: str = Field(..., pattern=r"^[012?]{5}$")
 
 
 class GameState(BaseModel):
@@ -0,0 +1,40 @@
+"""Pydantic models for stateful solver sessions."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .game_state import GameState
+from .solve_request import SolverStrategy
+from .solve_response import SolveResponse
+
+
+class SessionResponse(BaseModel):
+    """A session's game state and the agent's suggestion for its next guess."""
+
+    id: str = Field(..., description="Session id for the follow-up guess and state calls.")
+    strategy: SolverStrategy
+    state: GameState
+    result: Optional[SolveResponse] = Field(
+        default=None, description="Next-guess recommendation; empty once the game is solved."
+    )
+    expires_in: float = Field(
+        ..., ge=0, description="Seconds of inactivity before the session is discarded."
+    )
+
+
+class SessionStats(BaseModel):
+    """Size and activity counters of the session store."""
+
+    sessions: int = Field(..., ge=0)
+    bytes: int = Field(..., ge=0, description="Estimated memory held by live sessions.")
+    max_sessions: int = Field(..., ge=0)
+    max_bytes: int = Field(..., ge=0)
+    ttl: float = Field(..., ge=0, description="Seconds of inactivity before a session expires.")
+    created: int = Field(..., ge=0)
+    hits: int = Field(..., ge=0)
+    misses: int = Field(..., ge=0, description="Lookups of unknown or expired sessions.")
+    expired: int = Field(..., ge=0)
+    evicted: int = Field(..., ge=0, description="Sessions dropped to stay under a cap.")
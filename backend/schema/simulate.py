@@ -0,0 +1,82 @@
+"""Pydantic models for server-side bulk simulation."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .solve_request import SolverStrategy
+
+
+class SimulationRequest(BaseModel):
+    """A strategy to play against many hidden answers inside the server."""
+
+    strategy: SolverStrategy = Field(
+        default=SolverStrategy.ENTROPY,
+        description="Agent strategy used for every game.",
+    )
+    answers: Optional[List[str]] = Field(
+        default=None,
+        min_length=1,
+        max_length=10000,
+        description="Hidden answers to play; defaults to every answer in the dictionary.",
+    )
+    max_attempts: int = Field(
+        default=6,
+        ge=1,
+        le=100,
+        description="Maximum number of guesses per game.",
+    )
+    allow_repeats: bool = Field(
+        default=False,
+        description="Whether the bot may repeat previous guesses.",
+    )
+    hard_mode: bool = Field(
+        default=False,
+        description="Whether every guess must be consistent with the hints revealed so far.",
+    )
+
+
+class SimulatedGame(BaseModel):
+    """One finished game, streamed as soon as its batch completes."""
+
+    type: Literal["game"] = "game"
+    index: int = Field(..., ge=0, description="Position of the answer in the request.")
+    answer: str = Field(..., min_length=5, max_length=5)
+    solved: bool
+    guesses: List[str] = Field(default_factory=list)
+    completed: int = Field(..., ge=0, description="Games finished so far, this one included.")
+    total: int = Field(..., ge=0)
+
+
+class SimulationSummary(BaseModel):
+    """Final line of a simulation stream."""
+
+    type: Literal["summary"] = "summary"
+    id: str
+    strategy: SolverStrategy
+    games: int = Field(..., ge=0, description="Games finished before the stream ended.")
+    solved: int = Field(..., ge=0)
+    average_guesses: Optional[float] = Field(
+        default=None, description="Mean guesses over solved games."
+    )
+    distribution: Dict[int, int] = Field(
+        default_factory=dict, description="Solved games per number of guesses."
+    )
+    failed: List[str] = Field(default_factory=list, description="Answers that were not solved.")
+    elapsed: float = Field(..., ge=0, description="Seconds from start to the last game.")
+    cancelled: bool = False
+    error: Optional[str] = None
+
+
+class SimulationProgress(BaseModel):
+    """Status of a running or recently finished simulation."""
+
+    id: str
+    strategy: SolverStrategy
+    status: Literal["running", "completed", "cancelled", "failed"]
+    completed: int = Field(..., ge=0)
+    solved: int = Field(..., ge=0)
+    total: int = Field(..., ge=0)
+    elapsed: float = Field(..., ge=0)
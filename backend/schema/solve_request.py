@@ -14,8 +14,8 @@ class GuessFeedback(BaseModel):
     guess: str = Field(..., min_length=5, max_length=5, description="Guessed word")
     feedback: str = Field(
         ...,
-        pattern=r"^[012]{5}$",
-        description="Encoded feedback where 2=correct,1=present,0=absent",
+        pattern=r"^[012?]{5}$",
+        description="Encoded feedback where 2=correct,1=present,0=absent,?=unknown",
     )
 
 
@@ -27,6 +27,23 @@ class SolverStrategy(str, Enum):
     FREQUENCY = "frequency"
     BETTER_ENTROPY = "better_entropy"
     K_BEAM = "k_beam"
+    OPTIMAL = "optimal"
+    LOOKAHEAD = "lookahead"
+    MCTS = "mcts"
+
+
+class SolveMode(str, Enum):
+    """How the agent produces its answer."""
+
+    LIVE = "live"
+    COMPILED = "compiled"
+
+
+class SearchObjective(str, Enum):
+    """Quantity minimized by the exact search."""
+
+    EXPECTED_GUESSES = "expected_guesses"
+    WORST_CASE = "worst_case"
 
 
 class SolveParameters(BaseModel):
@@ -46,6 +63,79 @@ class SolveParameters(BaseModel):
         default=SolverStrategy.ENTROPY,
         description="Solver strategy used to rank candidate guesses.",
     )
+    objective: SearchObjective = Field(
+        default=SearchObjective.EXPECTED_GUESSES,
+        description="What the optimal strategy minimizes: average or worst-case guesses.",
+    )
+    hard_mode: bool = Field(
+        False,
+        description="Only suggest guesses consistent with every hint revealed so far.",
+    )
+    use_priors: bool = Field(
+        False,
+        description=(
+            "Weight each candidate's share of the entropy by its word-list prior "
+            "(entropy, better_entropy and k_beam)."
+        ),
+    )
+    endgame: bool = Field(
+        False,
+        description="Pick the next guess by exact search once few candidates remain.",
+    )
+    endgame_threshold: int = Field(
+        64,
+        ge=3,
+        le=242,
+        description="Largest candidate count the endgame search takes over.",
+    )
+    endgame_time_budget: float = Field(
+        0.25,
+        gt=0,
+        le=5.0,
+        description="Seconds the endgame search may run before the strategy's ranking is kept.",
+    )
+    beam_filter_width: Optional[int] = Field(
+        None,
+        ge=1,
+        description=(
+            "Words the k_beam frequency stage keeps for entropy scoring, at most the "
+            "whole dictionary (default: chosen from the candidate count)."
+        ),
+    )
+    beam_lookahead_width: Optional[int] = Field(
+        None,
+        ge=0,
+        le=64,
+        description=(
+            "Guesses the k_beam lookahead stage expands; 0 disables it "
+            "(default: chosen from the candidate count)."
+        ),
+    )
+    lookahead_beam: int = Field(
+        8,
+        ge=1,
+        le=64,
+        description="How many of the best entropy guesses the lookahead strategy expands.",
+    )
+    lookahead_time_budget: float = Field(
+        0.5,
+        gt=0,
+        le=10.0,
+        description="Seconds the lookahead strategy may spend expanding guesses.",
+    )
+    mcts_time_budget: float = Field(
+        0.5,
+        gt=0,
+        le=10.0,
+        description="Seconds the tree search strategy simulates games before answering.",
+    )
+    mode: SolveMode = Field(
+        default=SolveMode.LIVE,
+        description=(
+            "'compiled' walks the strategy's precompiled decision tree and falls back "
+            "to live computation once the history leaves it."
+        ),
+    )
 
 
 class SolveRequest(BaseModel):
@@ -59,3 +149,14 @@ class SolveRequest(BaseModel):
         default=None,
         description="Optional solver tuning parameters.",
     )
+
+
+class BatchSolveRequest(BaseModel):
+    """Many solve requests answered in one call."""
+
+    requests: List[SolveRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="Requests to solve; responses come back in the same order.",
+    )
@@ -37,4 +37,12 @@ class SolveResponse(BaseModel):
     )
 
 
-
+class BatchSolveResponse(BaseModel):
+    """Responses to a batch of solve requests, in request order."""
+
+    results: List[SolveResponse] = Field(default_factory=list)
+    solved_states: int = Field(
+        0,
+        ge=0,
+        description="Distinct strategy, history and parameter combinations actually solved.",
+    )
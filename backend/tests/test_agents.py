@@ -105,3 +105,58 @@ def test_agent_with_history():
     assert "S" not in suggestion
     assert "O" not in suggestion
     assert "E" not in suggestion
+
+
+def test_better_entropy_pruning_matches_exhaustive_ranking():
+    """Bound-based pruning must not change the returned ranking."""
+    import numpy as np
+
+    from agent.scoring import top_k
+    from schema.solve_request import GuessFeedback, SolveParameters
+
+    agent = get_agent(SolverStrategy.BETTER_ENTROPY)
+    parameters = SolveParameters(max_suggestions=5)
+    histories = [
+        [GuessFeedback(guess="ROATE", feedback="01000")],
+        [
+            GuessFeedback(guess="ROATE", feedback="00100"),
+            GuessFeedback(guess="CLIPS", feedback="00000"),
+        ],
+        [GuessFeedback(guess="FUZZY", feedback="00000")],
+    ]
+
+    for history in histories:
+        candidates = agent._apply_history(history)
+        ranked, pruned = agent._rank_candidates(candidates, history, parameters)
+
+        scores = agent._scorer.scores(agent._ordered_indices, candidates)
+        expected = agent._ordered_indices[top_k(scores, agent._ranking_depth(history, parameters))]
+        expected = expected[~np.isin(expected, agent._tried_indices(history))]
+
+        assert ranked.tolist() == expected.tolist()
+        assert pruned >= 0
+
+
+def test_better_entropy_ranks_by_prior_weighted_entropy(monkeypatch):
+    """With use_priors, pruning must still reproduce the weighted exhaustive ranking."""
+    import numpy as np
+
+    from agent.scoring import top_k
+    from schema.solve_request import GuessFeedback, SolveParameters
+
+    agent = get_agent(SolverStrategy.BETTER_ENTROPY)
+    priors = np.random.default_rng(11).random(len(wordlist.words)).astype(np.float32) ** 4
+    monkeypatch.setattr(wordlist, "_priors", priors)
+    history = [GuessFeedback(guess="ROATE", feedback="00000")]
+    parameters = SolveParameters(max_suggestions=5, use_priors=True)
+
+    candidates = agent._apply_history(history)
+    ranked, _ = agent._rank_candidates(candidates, history, parameters)
+
+    scores = agent._scorer.scores(agent._ordered_indices, candidates, priors[candidates])
+    expected = agent._ordered_indices[top_k(scores, agent._ranking_depth(history, parameters))]
+    expected = expected[~np.isin(expected, agent._tried_indices(history))]
+    assert ranked.tolist() == expected.tolist()
+
+    unweighted, _ = agent._rank_candidates(candidates, history, SolveParameters(max_suggestions=5))
+    assert ranked.tolist() != unweighted.tolist()
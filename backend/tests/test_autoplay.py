@@ -1,6 +1,8 @@
 """Tests for autoplay endpoint."""
 import pytest
 
+from word_manager.word_manager import wordlist
+
 
 def test_autoplay_basic(client, sample_strategies):
     """Test basic autoplay functionality."""
@@ -22,12 +24,12 @@ def test_autoplay_with_custom_answer(client):
     """Test autoplay with specific answer."""
     response = client.post("/api/autoplay", json={
         "strategy": "entropy",
-        "answer": "aleph",
+        "answer": "cigar",
         "max_attempts": 6
     })
     assert response.status_code == 200
     data = response.json()
-    assert data["answer"] == "ALEPH"
+    assert data["answer"] == "CIGAR"
     assert "steps" in data
     assert len(data["steps"]) > 0
 
@@ -75,3 +77,62 @@ def test_autoplay_solved_flag(client):
     if data["solved"]:
         last_step = data["steps"][-1]
         assert all(c == "2" for c in last_step["feedback"])
+
+
+def test_autoplay_hard_mode(client):
+    """Every hard-mode guess must agree with the feedback of the guesses before it."""
+    from word_manager.word_manager import _compute_pattern
+
+    response = client.post("/api/autoplay", json={
+        "strategy": "better_entropy",
+        "answer": "ought",
+        "hard_mode": True
+    })
+    assert response.status_code == 200
+    steps = response.json()["steps"]
+    for position, step in enumerate(steps):
+        for earlier in steps[:position]:
+            assert _compute_pattern(earlier["guess"], step["guess"]) == earlier["feedback"]
+
+
+def _parse_events(body):
+    import json
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_autoplay_stream_emits_steps_then_result(client):
+    """The SSE variant streams each step, then the same response as /api/autoplay."""
+    payload = {"strategy": "better_entropy", "answer": "cigar"}
+    response = client.post("/api/autoplay/stream", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "done"
+    assert events[0][1] == {"answer": "CIGAR"}
+
+    steps = [data for name, data in events if name == "step"]
+    done = events[-1][1]
+    assert steps == done["steps"]
+    assert done == client.post("/api/autoplay", json=payload).json()
+
+
+def test_autoplay_stream_validates_before_streaming(client):
+    response = client.post("/api/autoplay/stream", json={"answer": "zzzzz"})
+    assert response.status_code == 400
+
+
+def test_autoplay_rejects_allowed_only_answers(client):
+    """Words that can be guessed but are never answers cannot be solved."""
+    answer = wordlist.words[-1]
+    assert wordlist.is_valid(answer) and not wordlist.is_answer(answer)
+    for path in ("/api/autoplay", "/api/autoplay/stream"):
+        response = client.post(path, json={"answer": answer})
+        assert response.status_code == 400
+        assert "answer list" in response.json()["detail"]
@@ -0,0 +1,54 @@
+"""Tests for the shared history-prefix candidate cache."""
+
+import numpy as np
+
+from agent import get_agent
+from schema import SolverStrategy
+from schema.solve_request import GuessFeedback
+from word_manager.candidate_cache import CandidateCache, candidate_cache
+
+
+def test_cache_counts_hits_misses_and_evictions():
+    """LRU bookkeeping should evict the oldest entry once over capacity."""
+    cache = CandidateCache(max_entries=2)
+    first = (("ROATE", "00000"),)
+    second = (("SLATE", "00000"),)
+    third = (("CRANE", "00000"),)
+
+    assert cache.get(first) is None
+    cache.put(first, np.arange(3, dtype=np.int32))
+    cache.put(second, np.arange(4, dtype=np.int32))
+    assert cache.get(first) is not None
+    cache.put(third, np.arange(5, dtype=np.int32))
+
+    assert cache.get(second) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_respects_memory_cap():
+    """Entries should be evicted to keep stored arrays under the byte cap."""
+    cache = CandidateCache(max_bytes=1000)
+    cache.put((("ROATE", "00000"),), np.zeros(200, dtype=np.int32))
+    cache.put((("SLATE", "00000"),), np.zeros(200, dtype=np.int32))
+
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] <= 1000
+
+
+def test_agents_share_prefix_results():
+    """A longer history should reuse the prefix filtered by another strategy."""
+    history = [
+        GuessFeedback(guess="ROATE", feedback="01000"),
+        GuessFeedback(guess="LINOS", feedback="00110"),
+    ]
+    candidate_cache.clear()
+
+    prefix = get_agent(SolverStrategy.FREQUENCY)._apply_history(history[:1])
+    hits_before = candidate_cache.hits
+    full = get_agent(SolverStrategy.ENTROPY)._apply_history(history)
+
+    assert candidate_cache.hits == hits_before + 1
+    assert np.isin(full, prefix).all()
+    assert len(full) < len(prefix)
@@ -0,0 +1,31 @@
+"""Tests for the packed bitset candidate set."""
+
+import numpy as np
+
+from word_manager.candidate_set import CandidateSet
+
+
+def test_candidate_set_algebra_and_iteration():
+    """AND, popcount and iteration should agree with Python sets."""
+    left = CandidateSet.from_indices([0, 3, 64, 127, 12971], 12972)
+    right = CandidateSet.from_indices(np.array([3, 64, 65, 12971]), 12972)
+
+    both = left & right
+    assert list(both) == [3, 64, 12971]
+    assert len(both) == 3
+    assert len(left | right) == 6
+    assert list(left - right) == [0, 127]
+    assert 64 in both and 65 not in both
+    assert both.indices().dtype == np.int32
+
+
+def test_candidate_set_is_hashable_and_compact():
+    """Equal members should hash equally so sets can key caches."""
+    first = CandidateSet.from_indices([5, 10, 15], 12972)
+    second = CandidateSet.from_indices(np.array([15, 10, 5]), 12972)
+
+    assert first == second
+    assert len({first, second}) == 1
+    assert first.nbytes <= 1624
+    assert len(CandidateSet.full(12972)) == 12972
+    assert len(CandidateSet.empty(12972)) == 0
@@ -0,0 +1,52 @@
+"""Tests for the narrowing code block cache."""
+
+import numpy as np
+
+from word_manager.code_block_cache import CodeBlockCache
+from word_manager.word_manager import wordlist
+
+
+def test_block_cache_narrows_subsets_from_ram():
+    """A later, smaller state should be cut out of the cached parent block."""
+    cache = CodeBlockCache(wordlist)
+    parent = wordlist.targets_for("ROATE", "01000")
+    child = wordlist.filter_candidates(parent, "LINOS", "00110")
+
+    parent_block = cache.block(parent)
+    child_block = cache.block(child)
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["narrowed"] == 1
+    assert np.array_equal(child_block, wordlist.target_codes(child))
+    assert np.array_equal(parent_block, wordlist.target_codes(parent))
+
+    cache.block(child)
+    assert cache.stats()["hits"] == 1
+
+
+def test_block_cache_evicts_by_bytes():
+    """Stored blocks should stay under the configured byte budget."""
+    row_bytes = len(wordlist.words)
+    cache = CodeBlockCache(wordlist, max_bytes=row_bytes * 40)
+    cache.block(np.arange(0, 15, dtype=np.int32))
+    cache.block(np.arange(100, 115, dtype=np.int32))
+    cache.block(np.arange(200, 215, dtype=np.int32))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= row_bytes * 40
+    assert stats["evictions"] == 1
+
+
+def test_seeded_block_is_served_without_reading_the_matrix():
+    cache = CodeBlockCache(wordlist)
+    candidates = wordlist.targets_for("ROATE", "00100")
+    assert cache.peek(candidates) is None
+
+    block = np.array(wordlist.target_codes(candidates))
+    cache.seed(candidates, block)
+
+    assert cache.peek(candidates) is block
+    assert cache.block(candidates) is block
+    assert not block.flags.writeable
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,53 @@
+"""Tests for compiled decision trees."""
+
+import pytest
+
+from agent.base import Agent
+from agent.decision_tree import DecisionTree
+from agent.frequency import FrequencyAgent
+from schema.solve_request import GuessFeedback, SolveMode, SolveParameters, SolveRequest
+
+
+@pytest.fixture(scope="module")
+def compiled_agent(tmp_path_factory):
+    path = tmp_path_factory.mktemp("trees") / "tree_frequency"
+    DecisionTree.compile(FrequencyAgent()).save(path)
+    agent = FrequencyAgent()
+    agent.decision_tree = DecisionTree.load(agent, path)
+    assert agent.decision_tree is not None
+    return agent
+
+
+def _solve(agent, history, mode):
+    parameters = SolveParameters(max_suggestions=3, mode=mode)
+    return agent.solve(SolveRequest(history=history, parameters=parameters))
+
+
+def test_compiled_mode_matches_live_play(compiled_agent):
+    """Following the tree should give the live answers for every step of a game."""
+    live = FrequencyAgent()
+    for answer in ("CRANE", "JAZZY", "EERIE"):
+        history = []
+        while True:
+            expected = _solve(live, history, SolveMode.LIVE)
+            actual = _solve(compiled_agent, history, SolveMode.COMPILED)
+            assert actual.suggestions == expected.suggestions
+            assert actual.remaining_candidates == expected.remaining_candidates
+            if history:
+                assert "compiled" in actual.thoughts[-1].message
+
+            guess = actual.next_guess
+            if guess == answer:
+                break
+            feedback = Agent.compute_feedback(guess, answer)
+            history = history + [GuessFeedback(guess=guess, feedback=feedback)]
+
+
+def test_off_tree_history_falls_back_to_live(compiled_agent):
+    """A guess the tree never makes should be computed live."""
+    history = [GuessFeedback(guess="CRANE", feedback="00100")]
+    response = _solve(compiled_agent, history, SolveMode.COMPILED)
+
+    assert compiled_agent.decision_tree.walk(history, compiled_agent._word_manager) is None
+    assert response.suggestions == _solve(FrequencyAgent(), history, SolveMode.LIVE).suggestions
+    assert all("compiled" not in thought.message for thought in response.thoughts)
@@ -0,0 +1,61 @@
+"""Tests for the opt-in exact endgame search."""
+
+import numpy as np
+
+from agent.endgame import _search_for, solve_endgame
+from agent.entropy import EntropyAgent
+from agent.frequency import FrequencyAgent
+from agent.scoring import shared_scorer
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+
+_SMALL = [GuessFeedback(guess="ROATE", feedback="00222")]
+_TRAP = [GuessFeedback(guess="ROATE", feedback="00120")]
+
+
+def _solve(agent, history, **parameters):
+    return agent.solve(SolveRequest(history=history, parameters=SolveParameters(**parameters)))
+
+
+def test_endgame_is_off_by_default():
+    agent = EntropyAgent()
+    response = _solve(agent, _SMALL)
+    assert all("Endgame" not in thought.message for thought in response.thoughts)
+
+
+def test_endgame_moves_the_exact_guess_first():
+    agent = FrequencyAgent()
+    baseline = _solve(agent, _SMALL)
+    response = _solve(agent, _SMALL, endgame=True)
+
+    thought = response.thoughts[-1]
+    assert thought.message.startswith(f"Endgame search: {response.next_guess}")
+    assert response.remaining_candidates == baseline.remaining_candidates
+    # Nothing can beat guessing a candidate and splitting the rest perfectly.
+    assert thought.score >= (2 * response.remaining_candidates - 1) / response.remaining_candidates
+
+
+def test_endgame_respects_threshold_and_time_cap():
+    agent = EntropyAgent()
+    response = _solve(agent, _SMALL, endgame=True, endgame_threshold=3)
+    assert all("Endgame" not in thought.message for thought in response.thoughts)
+
+    baseline = _solve(agent, _TRAP)
+    response = _solve(agent, _TRAP, endgame=True, endgame_time_budget=1e-6)
+    assert response.suggestions == baseline.suggestions
+    assert "cap" in response.thoughts[-1].message
+
+
+def test_endgame_reuses_its_search_between_requests():
+    agent = FrequencyAgent()
+    candidates = agent._apply_history(_SMALL)
+    ranked = agent._word_manager.words_to_indices(_solve(agent, _SMALL).suggestions)
+    parameters = SolveParameters(endgame=True)
+
+    first = solve_endgame(agent._word_manager, candidates, ranked, parameters)
+    again = solve_endgame(agent._word_manager, candidates, ranked, parameters)
+    assert again.guess == first.guess and again.guesses_needed == first.guesses_needed
+    assert again.states == 0
+
+    pool = np.union1d(candidates, ranked[:5]).astype(np.int32)
+    search, _ = _search_for(agent._word_manager, parameters.objective, pool)
+    assert search._scorer is shared_scorer()
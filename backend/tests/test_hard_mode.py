@@ -0,0 +1,81 @@
+"""Tests for hard-mode guess restriction."""
+
+import numpy as np
+import pytest
+
+from agent import get_agent
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+from word_manager.word_manager import _compute_pattern, wordlist
+
+_HISTORY = [GuessFeedback(guess="ROATE", feedback="00100")]
+
+
+def _consistent(word, history):
+    return all(_compute_pattern(entry.guess, word) == entry.feedback for entry in history)
+
+
+def test_consistent_words_matches_scalar_check():
+    """Answer columns and computed allowed-only codes should agree with the reference."""
+    mask = wordlist.consistent_words("ROATE", "00100")
+    words = wordlist.words
+    for index in np.random.default_rng(5).choice(len(words), 600, replace=False).tolist():
+        assert mask[index] == _consistent(words[index], _HISTORY), words[index]
+    # Every remaining candidate is allowed.
+    assert mask[wordlist.targets_for("ROATE", "00100")].all()
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        SolverStrategy.BETTER_ENTROPY,
+        SolverStrategy.K_BEAM,
+        SolverStrategy.LOOKAHEAD,
+        SolverStrategy.MCTS,
+        SolverStrategy.OPTIMAL,
+    ],
+)
+def test_hard_mode_only_suggests_consistent_guesses(strategy):
+    agent = get_agent(strategy)
+    parameters = SolveParameters(
+        strategy=strategy, max_suggestions=5, hard_mode=True, mcts_time_budget=0.05
+    )
+    response = agent.solve(SolveRequest(history=_HISTORY, parameters=parameters))
+    assert response.suggestions
+    assert all(_consistent(word, _HISTORY) for word in response.suggestions)
+
+
+def test_hard_mode_replaces_an_inconsistent_probe():
+    agent = get_agent(SolverStrategy.BETTER_ENTROPY)
+    free = agent.solve(SolveRequest(history=_HISTORY, parameters=SolveParameters()))
+    hard = agent.solve(SolveRequest(history=_HISTORY, parameters=SolveParameters(hard_mode=True)))
+    assert not _consistent(free.next_guess, _HISTORY)
+    assert hard.next_guess != free.next_guess
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        SolverStrategy.BETTER_ENTROPY,
+        SolverStrategy.K_BEAM,
+        SolverStrategy.LOOKAHEAD,
+        SolverStrategy.OPTIMAL,
+    ],
+)
+def test_hard_mode_keeps_candidates_among_full_suggestions(strategy):
+    agent = get_agent(strategy)
+    parameters = SolveParameters(strategy=strategy, max_suggestions=5, hard_mode=True)
+
+    opened = [GuessFeedback(guess="ROATE", feedback="00000")]
+    response = agent.solve(SolveRequest(history=opened, parameters=parameters))
+    assert len(response.suggestions) == parameters.max_suggestions
+
+    # Only QUAIL, QUALM and AVAIL remain; one of them must be on offer.
+    history = [
+        GuessFeedback(guess="ROATE", feedback="00200"),
+        GuessFeedback(guess="CLASP", feedback="01200"),
+    ]
+    candidates = set(wordlist.indices_to_words(agent._apply_history(history)))
+    assert candidates == {"QUAIL", "QUALM", "AVAIL"}
+    response = agent.solve(SolveRequest(history=history, parameters=parameters))
+    assert candidates & set(response.suggestions)
+    assert all(_consistent(word, history) for word in response.suggestions)
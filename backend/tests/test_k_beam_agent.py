@@ -2,12 +2,16 @@
 
 from agent.k_beam import KBeamAgent
 from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from word_manager.candidate_set import CandidateSet
+from word_manager.word_manager import wordlist
 
 
 def _make_agent(words: list[str], beam_width: int = 50) -> KBeamAgent:
     """Create a KBeamAgent with the given word list and beam width."""
     agent = KBeamAgent(beam_width=beam_width)
-    agent.all_words = set(word.upper() for word in words)
+    agent.all_words = CandidateSet.from_indices(
+        wordlist.words_to_indices(words), len(wordlist.words)
+    )
     return agent
 
 
@@ -18,13 +22,13 @@ def test_kbeam_respects_beam_width():
     agent = _make_agent(words, beam_width=2)
 
     ranked = agent._rank_with_beam(
-        candidates=sorted(agent.all_words),
+        candidates=agent.all_words.indices(),
         history=[],
         parameters=SolveParameters(),
     )
 
     assert len(ranked) <= 2
-    assert set(ranked).issubset(agent.all_words)
+    assert all(index in agent.all_words for index in ranked)
 
 
 def test_kbeam_returns_filtered_candidate_when_only_one_remains():
@@ -39,3 +43,34 @@ def test_kbeam_returns_filtered_candidate_when_only_one_remains():
     assert response.next_guess == "CRATE"
     assert response.remaining_candidates == 1
     assert response.suggestions == ["CRATE"]
+
+
+def test_kbeam_stage_widths_adapt_and_can_be_overridden():
+    """Each stage reports itself; request parameters override the default widths."""
+
+    agent = KBeamAgent()
+    history = [GuessFeedback(guess="ROATE", feedback="00222")]
+
+    response = agent.solve(SolveRequest(history=history))
+    stages = [thought.message for thought in response.thoughts if "Stage" in thought.message]
+    assert len(stages) == 3
+    assert stages[0].startswith("Stage 1 (frequency) kept 50 of 12972 words")
+    assert stages[2].startswith("Stage 3 (two-step lookahead) kept 6")
+
+    parameters = SolveParameters(beam_filter_width=20, beam_lookahead_width=0)
+    response = agent.solve(SolveRequest(history=history, parameters=parameters))
+    stages = [thought.message for thought in response.thoughts if "Stage" in thought.message]
+    assert len(stages) == 2
+    assert stages[0].startswith("Stage 1 (frequency) kept 20 of 12972 words")
+    assert stages[1].startswith("Stage 2 (entropy) kept 4 of 20 words")
+
+
+def test_k_beam_filter_width_is_clamped_to_the_dictionary():
+    agent = KBeamAgent()
+    history = [GuessFeedback(guess="ROATE", feedback="00222")]
+    word_count = len(wordlist.words)
+
+    parameters = SolveParameters(beam_filter_width=word_count * 10, beam_lookahead_width=0)
+    response = agent.solve(SolveRequest(history=history, parameters=parameters))
+    stages = [thought.message for thought in response.thoughts if "Stage" in thought.message]
+    assert stages[0].startswith(f"Stage 1 (frequency) kept {word_count} of {word_count} words")
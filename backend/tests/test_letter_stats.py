@@ -0,0 +1,51 @@
+"""Tests for the vectorized letter statistics."""
+
+import numpy as np
+
+from agent.letter_stats import shared_letter_statistics
+from word_manager.word_manager import wordlist
+
+
+def _reference_scores(words, candidates):
+    """Score words the straightforward way, one letter at a time."""
+    counts = [dict() for _ in range(5)]
+    for word in candidates:
+        for position, letter in enumerate(word):
+            counts[position][letter] = counts[position].get(letter, 0) + 1
+
+    scores = []
+    for word in words:
+        score = sum(counts[position].get(letter, 0) for position, letter in enumerate(word))
+        score = score / len(candidates) - 0.1 * (len(word) - len(set(word)))
+        scores.append(score)
+    return np.array(scores)
+
+
+def test_scores_match_reference():
+    stats = shared_letter_statistics()
+    candidates = wordlist.targets_for("ROATE", "00100")
+    words = np.arange(0, len(wordlist.words), 7, dtype=np.int32)
+
+    expected = _reference_scores(
+        wordlist.indices_to_words(words), wordlist.indices_to_words(candidates)
+    )
+    np.testing.assert_allclose(stats.scores(words, candidates), expected, atol=1e-12)
+
+    full = wordlist.all_indices()
+    np.testing.assert_allclose(stats.scores(full, candidates)[words], expected, atol=1e-12)
+
+    # Same length, same first and last index, different order.
+    permuted = np.concatenate(([0], full[-2:0:-1], [full[-1]]))
+    np.testing.assert_array_equal(
+        stats.scores(permuted, candidates), stats.scores(full, candidates)[permuted]
+    )
+
+
+def test_best_is_a_stable_descending_sort():
+    stats = shared_letter_statistics()
+    candidates = wordlist.targets_for("SLATE", "01000")
+    pool = wordlist.all_indices()
+
+    scores = stats.scores(pool, candidates)
+    expected = pool[np.argsort(-scores, kind="stable")[:50]]
+    np.testing.assert_array_equal(stats.best(pool, candidates, 50), expected)
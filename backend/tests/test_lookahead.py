@@ -0,0 +1,55 @@
+"""Tests for the two-ply lookahead strategy."""
+
+import numpy as np
+import pytest
+
+from agent.lookahead import LookaheadAgent
+from agent.scoring import shared_scorer
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from word_manager.word_manager import wordlist
+
+
+def test_partition_entropies_match_scoring_each_partition():
+    candidates = wordlist.targets_for("ROATE", "00100")
+    block = wordlist.target_codes(candidates)[:, :500]
+    labels = np.unique(wordlist.feedback_row("CURLY")[candidates], return_inverse=True)[1]
+    partitions = int(labels.max()) + 1
+
+    scorer = shared_scorer()
+    entropies = scorer.partition_entropies(block, labels, partitions)
+    for partition in range(partitions):
+        expected = scorer.entropy_from_block(block[labels == partition])
+        np.testing.assert_allclose(entropies[partition], expected, atol=1e-9)
+
+
+def _solve(history, **parameters):
+    request = SolveRequest(
+        history=history, parameters=SolveParameters(max_suggestions=5, **parameters)
+    )
+    return LookaheadAgent().solve(request)
+
+
+def test_lookahead_expands_the_beam():
+    history = [GuessFeedback(guess="ROATE", feedback="00100")]
+    response = _solve(history, lookahead_beam=4)
+
+    assert len(response.suggestions) == 5
+    assert "ROATE" not in response.suggestions
+    lookahead = response.thoughts[2]
+    assert lookahead.message.startswith("Looked two guesses ahead for 4 of the top 4")
+    # Two guesses cannot learn more than there is to know.
+    assert 0 < lookahead.score <= np.log2(response.remaining_candidates) + 1e-9
+
+
+def test_lookahead_sees_states_two_guesses_settle():
+    history = [GuessFeedback(guess="ROATE", feedback="00222")]
+    response = _solve(history)
+    # One of the top guesses leaves every bucket splittable by a second guess.
+    assert response.thoughts[2].score == pytest.approx(np.log2(response.remaining_candidates))
+
+
+def test_lookahead_stops_at_time_budget():
+    history = [GuessFeedback(guess="ROATE", feedback="00000")]
+    response = _solve(history, lookahead_time_budget=1e-6)
+    assert "stopped at the" in response.thoughts[2].message
+    assert len(response.suggestions) == 5
@@ -0,0 +1,47 @@
+"""Tests for the Monte Carlo tree search strategy."""
+
+import time
+
+import numpy as np
+
+from agent.frequency import FrequencyAgent
+from agent.mcts import MCTSAgent
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest
+from word_manager.word_manager import wordlist
+
+
+def test_rollout_policy_matches_frequency_agent():
+    """Vectorized rollout scores should rank a state like FrequencyAgent does."""
+    agent = MCTSAgent(seed=0)
+    history = [GuessFeedback(guess="ROATE", feedback="00100")]
+    candidates = wordlist.targets_for("ROATE", "00100")
+
+    scores = agent._frequency_scores(np.ones((1, len(candidates)), dtype=bool), candidates)[0]
+    expected = FrequencyAgent()._rank_candidates(candidates, history, SolveParameters())
+    assert candidates[np.argmax(scores)] == expected[0]
+
+
+def test_rollouts_finish_every_game():
+    agent = MCTSAgent(seed=0)
+    candidates = wordlist.targets_for("ROATE", "00221")
+    block = wordlist.target_codes(candidates)
+    root_codes = block[:, candidates[:1]]
+    root = agent._grow(candidates, block[:, candidates], candidates[:1], root_codes, 0.0, None)
+    # One simulation per action: 32 sampled answers, each solved in at most n guesses.
+    assert root.visits[0] > 0
+    assert 1 <= root.costs[0] / root.visits[0] <= len(candidates)
+
+
+def test_mcts_answers_within_its_budget():
+    history = [GuessFeedback(guess="ROATE", feedback="00100")]
+    for workers in (1, 2):
+        agent = MCTSAgent(workers=workers, seed=0)
+        parameters = SolveParameters(max_suggestions=3, mcts_time_budget=0.2)
+        started = time.time()
+        response = agent.solve(SolveRequest(history=history, parameters=parameters))
+        assert time.time() - started < 2.0
+
+        assert len(set(response.suggestions)) == 3
+        search = response.thoughts[2]
+        assert f"{workers} worker(s)" in search.message
+        assert 1 < search.score < 6
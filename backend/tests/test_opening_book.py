@@ -0,0 +1,92 @@
+"""Tests for the precomputed opening tables."""
+
+import pytest
+
+import agent.session  # noqa: F401 - declared as a dependency below
+from agent import _build_agent, opening_book
+from agent.decision_tree import DecisionTree
+from agent.entropy import EntropyAgent
+from agent.opening_book import OpeningBook, source_modules
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+
+
+def _second_turn(agent, feedback, **parameters):
+    request = SolveRequest(
+        history=[GuessFeedback(guess=agent.first_guess, feedback=feedback)],
+        parameters=SolveParameters(**parameters),
+    )
+    return agent.solve(request)
+
+
+def test_opening_book_matches_live_ranking(tmp_path):
+    """A stored table should answer exactly like the live agent after the opener."""
+    live = EntropyAgent()
+    path = tmp_path / "opening_entropy.npz"
+    OpeningBook.build(live).save(path)
+
+    served = EntropyAgent()
+    served.opening_book = OpeningBook.load(served, path)
+    assert served.opening_book is not None
+
+    for feedback in ("00000", "01000", "10102", "20001"):
+        expected = _second_turn(live, feedback, max_suggestions=3)
+        actual = _second_turn(served, feedback, max_suggestions=3)
+        assert actual.suggestions == expected.suggestions
+        assert actual.remaining_candidates == expected.remaining_candidates
+        assert "precomputed" in actual.thoughts[-1].message
+
+
+def test_opening_book_is_ignored_when_stale(tmp_path):
+    """Changing anything the ranking depends on should invalidate the table."""
+    agent = EntropyAgent()
+    path = tmp_path / "opening_entropy.npz"
+    OpeningBook.build(agent).save(path)
+
+    changed = EntropyAgent()
+    changed.first_guess = "SLATE"
+    assert OpeningBook.load(changed, path) is None
+
+
+def test_opening_book_follows_imported_modules():
+    modules = source_modules(EntropyAgent())
+    assert {"agent.entropy", "agent.base", "agent.scoring"} <= set(modules)
+    # Reached only through what those modules import.
+    assert {"agent.endgame", "agent.exact_search", "word_manager.code_block_cache"} <= set(modules)
+
+
+def test_opening_book_is_ignored_when_a_dependency_changes(tmp_path, monkeypatch):
+    agent = EntropyAgent()
+    path = tmp_path / "opening_entropy.npz"
+    OpeningBook.build(agent).save(path)
+    assert OpeningBook.load(agent, path) is not None
+
+    read_source = opening_book._read_source
+    monkeypatch.setattr(
+        opening_book,
+        "_read_source",
+        lambda name: read_source(name) + (b"# edited" if name == "agent.exact_search" else b""),
+    )
+    assert OpeningBook.load(agent, path) is None
+
+
+def test_opening_book_hashes_declared_dependencies():
+    class SessionAwareAgent(EntropyAgent):
+        source_dependencies = ("agent.session",)
+
+    assert "agent.session" not in source_modules(EntropyAgent())
+    assert "agent.session" in source_modules(SessionAwareAgent())
+
+
+@pytest.mark.parametrize("strategy", [SolverStrategy.LOOKAHEAD, SolverStrategy.MCTS])
+def test_time_budgeted_agents_get_no_tables(strategy, monkeypatch, capsys):
+    """Their stored answers would be one machine's run, not the search they do."""
+    loaded = []
+    monkeypatch.setattr(OpeningBook, "load", classmethod(lambda cls, *args: loaded.append(args)))
+    monkeypatch.setattr(DecisionTree, "load", classmethod(lambda cls, *args: loaded.append(args)))
+    agent = _build_agent.__wrapped__(strategy)
+    assert agent.opening_book is None and agent.decision_tree is None
+    assert not loaded
+
+    monkeypatch.setattr(opening_book, "table_path", lambda _: pytest.fail("table was built"))
+    opening_book.main([strategy.value])
+    assert "Skipping" in capsys.readouterr().out
@@ -0,0 +1,85 @@
+"""Tests for the exact optimal search and agent."""
+
+import numpy as np
+
+from agent import opening_book
+from agent.exact_search import ExactSearch
+from agent.opening_book import agent_fingerprint, source_modules
+from agent.optimal import OptimalAgent
+from schema.solve_request import GuessFeedback, SearchObjective, SolveParameters, SolveRequest
+from word_manager.word_manager import wordlist
+
+
+def _state(guess, feedback):
+    return wordlist.targets_for(guess, feedback)
+
+
+def _play(search, candidates, target):
+    """Guesses the solved plan needs to find ``target``."""
+    state, guesses = candidates, 0
+    while True:
+        guesses += 1
+        guess = search.lookup(state)[1]
+        if guess == target:
+            return guesses
+        row = wordlist.feedback_row(wordlist.words[guess])
+        state = state[row[state] == row[target]]
+
+
+def test_exact_search_values_match_playing_the_plan():
+    """The reported value should be what following the plan actually costs."""
+    candidates = _state("ROATE", "00222")
+    assert 5 <= len(candidates) <= 30
+
+    expected = ExactSearch(wordlist, SearchObjective.EXPECTED_GUESSES)
+    total, _ = expected.solve(candidates)
+    plays = [_play(expected, candidates, target) for target in candidates.tolist()]
+    assert sum(plays) == total
+    assert total >= 2 * len(candidates) - 1
+
+    worst = ExactSearch(wordlist, SearchObjective.WORST_CASE)
+    depth, _ = worst.solve(candidates)
+    assert max(_play(worst, candidates, target) for target in candidates.tolist()) == depth
+    assert depth <= max(plays)
+
+
+def test_exact_search_trivial_states():
+    search = ExactSearch(wordlist)
+    pair = np.sort(wordlist.words_to_indices(["CRANE", "CRATE"])).astype(np.int32)
+    assert search.solve(pair) == (3, int(pair[0]))
+
+    # Any of these tells the other two apart, so the 2n - 1 floor is reached.
+    trio = np.sort(wordlist.words_to_indices(["BRAKE", "CRAMP", "CRANE"])).astype(np.int32)
+    value, guess = search.solve(trio)
+    assert value == 5
+    assert guess in trio
+
+
+def test_optimal_agent_reports_exact_and_timed_out_searches():
+    history = [GuessFeedback(guess="ROATE", feedback="00222")]
+    agent = OptimalAgent()
+    response = agent.solve(SolveRequest(history=history, parameters=SolveParameters()))
+    assert response.next_guess is not None
+    assert any("Exact search" in thought.message for thought in response.thoughts)
+
+    # No state worth searching can be finished without any budget.
+    hasty = OptimalAgent(time_budget=0.0)
+    hard = [GuessFeedback(guess="ROATE", feedback="00120")]
+    response = hasty.solve(SolveRequest(history=hard, parameters=SolveParameters()))
+    assert response.next_guess is not None
+    assert any("budget" in thought.message for thought in response.thoughts)
+
+
+def test_optimal_tables_depend_on_the_exact_search(monkeypatch):
+    """Certified tables must be rejected once the search that produced them changes."""
+    agent = OptimalAgent()
+    assert "agent.exact_search" in source_modules(agent)
+    before = agent_fingerprint(agent)
+
+    read_source = opening_book._read_source
+    monkeypatch.setattr(
+        opening_book,
+        "_read_source",
+        lambda name: read_source(name) + (b"# edited" if name == "agent.exact_search" else b""),
+    )
+    assert agent_fingerprint(agent) != before
@@ -20,8 +20,8 @@ from typing import Dict, List, Tuple
 import pytest
 from agent import get_agent
 from agent.base import Agent as BaseAgent
+from agent.session import GameSession
 from schema import SolverStrategy
-from schema.solve_request import SolveRequest
 from word_manager.word_manager import wordlist
 
 
@@ -91,7 +91,8 @@ def simulate_game(agent, answer: str, max_attempts: int = 1000) -> Tuple[bool, i
 
     Returns: (solved, num_guesses, time_taken, peak_memory_mb)
     """
-    history = []
+    # The session carries the candidates between turns instead of re-filtering
+    session = GameSession(agent)
 
     # Start memory tracking
     tracemalloc.start()
@@ -99,24 +100,18 @@ def simulate_game(agent, answer: str, max_attempts: int = 1000) -> Tuple[bool, i
 
     for attempt in range(max_attempts):
         try:
-            # Get suggestion
-            guess = agent.solve(SolveRequest(history=history)).next_guess
+            # Get suggestion, generate feedback and add it to the history
+            _, entry = session.play(answer)
 
-            if not guess or len(guess) != 5:
+            if entry is None:
                 break
 
-            # Generate feedback
-            feedback = wordlist.get_feedback_pattern(guess, answer)
-
-            # Add to history
-            history.append({"guess": guess, "feedback": feedback})
-
             # Check if solved
-            if feedback == "22222":  # All correct
+            if session.solved:
                 end_time = time.perf_counter()
                 current, peak = tracemalloc.get_traced_memory()
                 tracemalloc.stop()
-                return True, len(history), end_time - start_time, peak / 1024 / 1024
+                return True, len(session.history), end_time - start_time, peak / 1024 / 1024
 
         except Exception as e:
             print(f"Error during game: {e}")
@@ -130,7 +125,7 @@ def simulate_game(agent, answer: str, max_attempts: int = 1000) -> Tuple[bool, i
         memory_mb = peak / 1024 / 1024
     except:
         memory_mb = 0
-    return False, len(history), end_time - start_time, memory_mb
+    return False, len(session.history), end_time - start_time, memory_mb
 
 
 @pytest.fixture
@@ -140,7 +135,7 @@ def test_words():
 
     # Use a fixed seed for reproducibility
     random.seed(42)
-    all_words = wordlist.words
+    all_words = wordlist.answers
     # Sample 100 words for faster testing (increase for production benchmarks)
     # return random.sample(all_words, min(100, len(all_words)))
     # Stress test: all words
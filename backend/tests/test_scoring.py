@@ -0,0 +1,80 @@
+"""Tests for the shared entropy scoring kernel."""
+
+import numpy as np
+
+from agent.scoring import is_full_range, shared_scorer, top_k
+from word_manager.word_manager import wordlist
+
+
+def _reference_entropy(guess: int, candidates: np.ndarray, weights=None) -> float:
+    codes = wordlist.feedback_codes([guess], candidates)[0]
+    masses = np.bincount(codes, weights=weights, minlength=243)
+    probs = masses / masses.sum()
+    probs = probs[probs > 0]
+    return float(-(probs * np.log2(probs)).sum())
+
+
+def test_scorer_matches_reference_entropy():
+    """Table-driven entropies should equal the textbook formula."""
+    scorer = shared_scorer()
+    guesses = wordlist.words_to_indices(["ROATE", "CLIPS", "EERIE", "FUZZY"])
+    for feedback in ("01000", "00000", "22000"):
+        candidates = wordlist.targets_for("ROATE", feedback)
+        entropies = scorer.entropies(guesses, candidates)
+        for guess, entropy in zip(guesses, entropies):
+            assert np.isclose(entropy, _reference_entropy(guess, candidates))
+
+
+def test_weighted_entropy_matches_reference():
+    """Weighted buckets should equal the textbook formula on prior masses."""
+    scorer = shared_scorer()
+    guesses = wordlist.words_to_indices(["ROATE", "CLIPS", "EERIE"])
+    rng = np.random.default_rng(3)
+    # Small and large states take different histogram paths.
+    for feedback in ("01000", "00000"):
+        candidates = wordlist.targets_for("ROATE", feedback)
+        weights = rng.random(len(candidates)).astype(np.float32)
+        weights[::5] = 0.0
+        entropies = scorer.entropies(guesses, candidates, weights)
+        for guess, entropy in zip(guesses, entropies):
+            assert np.isclose(entropy, _reference_entropy(guess, candidates, weights))
+
+
+def test_uniform_weights_match_unweighted_entropy():
+    """Equal priors should not change any score."""
+    scorer = shared_scorer(duplicate_penalty=0.1)
+    candidates = wordlist.targets_for("ROATE", "00000")
+    guesses = wordlist.all_indices()[:500]
+    weights = np.full(len(candidates), 2.5, dtype=np.float32)
+    assert np.allclose(
+        scorer.scores(guesses, candidates, weights), scorer.scores(guesses, candidates)
+    )
+
+
+def test_permuted_full_guess_list_is_gathered():
+    """A full-length guess list that is not in index order must not skip the gather."""
+    scorer = shared_scorer()
+    candidates = wordlist.targets_for("ROATE", "00100")
+    full = wordlist.all_indices()
+    permuted = np.concatenate(([0], np.random.default_rng(1).permutation(full[1:-1]), [full[-1]]))
+    assert not is_full_range(permuted, len(full))
+    assert is_full_range(full, len(full))
+    np.testing.assert_array_equal(
+        scorer.entropies(permuted, candidates), scorer.entropies(full, candidates)[permuted]
+    )
+
+
+def test_scorer_applies_duplicate_penalty_vector():
+    """Penalties should scale with the number of repeated letters."""
+    scorer = shared_scorer(duplicate_penalty=0.1)
+    indices = wordlist.words_to_indices(["ROATE", "EERIE", "LLAMA"])
+    assert np.allclose(scorer.penalties[indices], [0.0, 0.2, 0.2])
+
+
+def test_top_k_matches_stable_sort():
+    """Top-k selection should equal the head of a stable descending sort."""
+    rng = np.random.default_rng(7)
+    scores = rng.integers(0, 5, size=500).astype(float)
+    expected = np.argsort(-scores, kind="stable")
+    for k in (1, 3, 17, 499, 500, 600):
+        assert top_k(scores, k).tolist() == expected[:k].tolist()
@@ -0,0 +1,73 @@
+"""Tests for the incremental game session engine."""
+
+import numpy as np
+import pytest
+
+from agent import get_agent
+from agent.session import GameSession
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+from word_manager.word_manager import wordlist
+
+
+def _replayed(agent, answer, max_attempts=6):
+    """Play ``answer`` the way autoplay used to: a fresh request per turn."""
+    history = []
+    for _ in range(max_attempts):
+        guess = agent.solve(SolveRequest(history=history)).next_guess
+        if not guess:
+            break
+        feedback = wordlist.get_feedback_pattern(guess, answer)
+        history.append(GuessFeedback(guess=guess, feedback=feedback))
+        if feedback == "22222":
+            break
+    return [entry.guess for entry in history]
+
+
+def test_session_candidates_match_history_filtering():
+    """Narrowing the carried state should keep exactly what filtering the history keeps."""
+    agent = get_agent(SolverStrategy.ENTROPY)
+    history = [
+        GuessFeedback(guess="ROATE", feedback="00100"),
+        GuessFeedback(guess="clung", feedback="0?000"),
+        GuessFeedback(guess="MIDST", feedback="00002"),
+    ]
+    session = GameSession(agent)
+    for step, entry in enumerate(history, start=1):
+        session.record(entry.guess, entry.feedback)
+        np.testing.assert_array_equal(session.candidates, agent._apply_history(history[:step]))
+    assert session.history[1].guess == "CLUNG"
+    assert session.remaining == len(agent._apply_history(history))
+
+
+@pytest.mark.parametrize(
+    "strategy", [SolverStrategy.ENTROPY, SolverStrategy.FREQUENCY, SolverStrategy.K_BEAM]
+)
+def test_session_plays_the_same_game_as_fresh_requests(strategy):
+    agent = get_agent(strategy)
+    for answer in ["CRANE", "JAZZY", "EERIE"]:
+        session = GameSession(agent)
+        for _ in range(6):
+            _, entry = session.play(answer)
+            if entry is None or session.solved:
+                break
+        assert [entry.guess for entry in session.history] == _replayed(agent, answer)
+        assert session.solved
+
+
+def test_session_resumes_from_history():
+    agent = get_agent(SolverStrategy.ENTROPY)
+    history = [GuessFeedback(guess="ROATE", feedback="00100")]
+    session = GameSession(agent, SolveParameters(max_suggestions=3), history)
+    expected = agent.solve(
+        SolveRequest(history=history, parameters=SolveParameters(max_suggestions=3))
+    )
+    assert session.suggest().suggestions == expected.suggestions
+    assert session.nbytes > 0
+
+
+def test_session_rejects_unknown_guess():
+    session = GameSession(get_agent(SolverStrategy.ENTROPY))
+    with pytest.raises(ValueError):
+        session.record("QQQQQ", "00000")
+    assert session.history == []
+    assert session.remaining == wordlist.answer_count
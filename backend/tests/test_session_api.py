@@ -0,0 +1,146 @@
+"""Tests for the stateful session API and its store."""
+
+import threading
+
+from agent import get_agent
+from agent.session import GameSession
+from api.sessions import SessionStore, sessions
+from schema.solve_request import SolverStrategy
+
+_PARAMETERS = {"strategy": "entropy", "max_suggestions": 3}
+
+
+def test_session_follows_stateless_solve(client):
+    created = client.post("/api/session", json={"parameters": _PARAMETERS})
+    assert created.status_code == 200
+    session = created.json()
+    assert session["state"]["history"] == []
+    assert session["result"]["next_guess"] == "ROATE"
+    assert session["expires_in"] > 0
+
+    guess = {"guess": "roate", "feedback": "00100"}
+    stepped = client.post(f"/api/session/{session['id']}/guess", json=guess)
+    assert stepped.status_code == 200
+    state = stepped.json()
+
+    stateless = client.post(
+        "/api/solve", json={"history": [guess], "parameters": _PARAMETERS}
+    ).json()
+    assert state["result"]["suggestions"] == stateless["suggestions"]
+    assert state["state"]["remaining_candidates"] == stateless["remaining_candidates"]
+    assert state["state"]["history"] == [{"guess": "ROATE", "feedback": "00100"}]
+
+    fetched = client.get(f"/api/session/{session['id']}").json()
+    assert fetched["state"] == state["state"]
+    assert fetched["result"] == state["result"]
+
+
+def test_session_starts_from_history_and_stops_when_solved(client):
+    history = [{"guess": "ROATE", "feedback": "01000"}]
+    session = client.post("/api/session", json={"history": history}).json()
+    assert len(session["state"]["history"]) == 1
+
+    solved = client.post(
+        f"/api/session/{session['id']}/guess", json={"guess": "CIGAR", "feedback": "22222"}
+    ).json()
+    assert solved["state"]["solved"]
+    assert solved["state"]["solution"] == "CIGAR"
+    assert solved["result"] is None
+
+    again = client.post(
+        f"/api/session/{session['id']}/guess", json={"guess": "CRANE", "feedback": "00000"}
+    )
+    assert again.status_code == 409
+
+
+def test_session_rejects_unknown_ids_and_words(client):
+    assert client.get("/api/session/missing").status_code == 404
+    assert (
+        client.post(
+            "/api/session/missing/guess", json={"guess": "CRANE", "feedback": "00000"}
+        ).status_code
+        == 404
+    )
+    bad_history = {"history": [{"guess": "QQQQQ", "feedback": "00000"}]}
+    assert client.post("/api/session", json=bad_history).status_code == 400
+
+    session = client.post("/api/session", json={}).json()
+    bad_guess = client.post(
+        f"/api/session/{session['id']}/guess", json={"guess": "QQQQQ", "feedback": "00000"}
+    )
+    assert bad_guess.status_code == 400
+    assert client.get(f"/api/session/{session['id']}").json()["state"]["history"] == []
+
+    stats = client.get("/api/session/stats").json()
+    assert stats["sessions"] >= 1
+    assert stats["misses"] >= 2
+
+
+def test_stored_sessions_keep_no_code_block(client):
+    """Parked sessions are small, so the byte budget does not evict live games early."""
+    history = [{"guess": "ROATE", "feedback": "00100"}]
+    session = client.post("/api/session", json={"history": history}).json()
+    client.post(f"/api/session/{session['id']}/guess", json={"guess": "CLINT", "feedback": "00000"})
+    stored = sessions.get(session["id"])
+    assert stored.game.nbytes == stored.game.candidates.nbytes
+    assert stored.nbytes < 16 * 1024
+
+
+def test_session_reads_wait_for_a_guess_in_progress(client):
+    session = client.post("/api/session", json={}).json()
+    stored = sessions.get(session["id"])
+    responses = []
+    with stored.lock:  # as if a guess were being applied
+        reader = threading.Thread(
+            target=lambda: responses.append(client.get(f"/api/session/{session['id']}"))
+        )
+        reader.start()
+        reader.join(timeout=0.2)
+        assert not responses
+    reader.join()
+    assert responses[0].status_code == 200
+
+
+def _game():
+    return GameSession(get_agent(SolverStrategy.ENTROPY))
+
+
+def test_store_expires_idle_sessions():
+    now = [0.0]
+    store = SessionStore(ttl=10.0, clock=lambda: now[0])
+    first = store.add(_game(), None)
+    now[0] = 6.0
+    second = store.add(_game(), None)
+    now[0] = 12.0
+
+    assert store.get(first.id) is None
+    assert store.get(second.id) is second
+    assert store.expires_in(second) == 10.0
+    stats = store.stats()
+    assert (stats.sessions, stats.expired, stats.hits, stats.misses) == (1, 1, 1, 1)
+
+
+def test_store_evicts_least_recently_used_over_caps():
+    store = SessionStore(max_sessions=2)
+    first, second = store.add(_game(), None), store.add(_game(), None)
+    store.get(first.id)
+    third = store.add(_game(), None)
+    assert store.get(second.id) is None
+    assert store.get(first.id) is first and store.get(third.id) is third
+
+    per_session = first.nbytes
+    store = SessionStore(max_bytes=per_session * 2)
+    games = [store.add(_game(), None) for _ in range(3)]
+    assert len(store) == 2
+    assert store.get(games[0].id) is None
+    assert store.stats().bytes <= per_session * 2
+    assert store.stats().evicted == 1
+
+
+def test_store_remeasures_after_guesses():
+    store = SessionStore()
+    stored = store.add(_game(), None)
+    before = store.stats().bytes
+    stored.game.record("ROATE", "00100")
+    store.update(stored)
+    assert store.stats().bytes == stored.nbytes != before
@@ -0,0 +1,119 @@
+"""Tests for server-side bulk simulation."""
+
+import asyncio
+import json
+
+from agent import get_agent
+from agent.simulation import play_lockstep
+from api.simulation import SimulationRun, simulations
+from schema.solve_request import GuessFeedback, SolveParameters, SolveRequest, SolverStrategy
+from word_manager.word_manager import wordlist
+
+_ANSWERS = ["CIGAR", "REBUT", "SISSY", "HUMPH", "AWAKE", "BLUSH"]
+
+
+class _CountingAgent:
+    def __init__(self, agent):
+        self.agent = agent
+        self.calls = 0
+
+    def solve(self, request):
+        self.calls += 1
+        return self.agent.solve(request)
+
+
+def _play_alone(agent, answer, max_attempts=6):
+    history = []
+    for _ in range(max_attempts):
+        guess = agent.solve(SolveRequest(history=history)).next_guess
+        feedback = wordlist.get_feedback_pattern(guess, answer)
+        history.append(GuessFeedback(guess=guess, feedback=feedback))
+        if feedback == "22222":
+            break
+    return tuple(entry.guess for entry in history)
+
+
+def test_lockstep_matches_games_played_alone_with_fewer_solves():
+    agent = _CountingAgent(get_agent(SolverStrategy.ENTROPY))
+    results = play_lockstep(agent, _ANSWERS, SolveParameters(), 6)
+
+    assert [result.answer for result in results] == _ANSWERS
+    for result in results:
+        assert result.guesses == _play_alone(agent.agent, result.answer)
+        assert result.solved == (result.guesses[-1] == result.answer)
+    # Every game shares the opener, and SISSY/HUMPH share their second state.
+    assert agent.calls < sum(len(result.guesses) for result in results)
+
+
+def test_simulate_streams_games_then_summary(client):
+    response = client.post("/api/simulate", json={"strategy": "entropy", "answers": _ANSWERS})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    games, summary = lines[:-1], lines[-1]
+    assert sorted(game["index"] for game in games) == list(range(len(_ANSWERS)))
+    assert [game["completed"] for game in games] == list(range(1, len(_ANSWERS) + 1))
+    assert summary["type"] == "summary"
+    assert summary["games"] == len(_ANSWERS)
+    assert summary["solved"] == sum(game["solved"] for game in games)
+    assert sum(summary["distribution"].values()) == summary["solved"]
+
+    progress = client.get(f"/api/simulate/{response.headers['x-simulation-id']}").json()
+    assert progress["status"] == "completed"
+    assert progress["completed"] == len(_ANSWERS)
+
+
+def test_simulate_rejects_unknown_answers_and_ids(client):
+    response = client.post("/api/simulate", json={"answers": ["ZZZZZ"]})
+    assert response.status_code == 400
+    # Allowed-only guesses are valid words but never answers.
+    response = client.post("/api/simulate", json={"answers": ["CIGAR", wordlist.words[-1]]})
+    assert response.status_code == 400
+    assert wordlist.words[-1] in response.json()["detail"]
+    response = client.post("/api/simulate", json={"answers": ["CIGAR"] * 10001})
+    assert response.status_code == 422
+    assert client.get("/api/simulate/missing").status_code == 404
+    assert client.delete("/api/simulate/missing").status_code == 404
+
+
+def test_simulate_caps_concurrent_runs(client, monkeypatch):
+    monkeypatch.setattr(simulations, "max_running", 0)
+    response = client.post("/api/simulate", json={"answers": _ANSWERS})
+    assert response.status_code == 429
+
+
+def test_unstarted_stream_holds_no_slot(client):
+    """A stream dropped before its first chunk must not leak a concurrency slot."""
+    run = SimulationRun(SolverStrategy.ENTROPY, _ANSWERS, SolveParameters(), 6)
+    for _ in range(simulations.max_running + 1):
+        simulations.start(run)
+    assert simulations.get(run.id) is None
+
+    response = client.post("/api/simulate", json={"answers": _ANSWERS[:1]})
+    assert response.status_code == 200
+
+
+def test_stream_reports_a_slot_taken_meanwhile(monkeypatch):
+    async def run_late():
+        run = SimulationRun(SolverStrategy.ENTROPY, _ANSWERS, SolveParameters(), 6)
+        lines = simulations.start(run)
+        monkeypatch.setattr(simulations, "max_running", 0)
+        return run, [json.loads(line) async for line in lines]
+
+    run, lines = asyncio.run(run_late())
+    assert len(lines) == 1
+    assert "already running" in lines[0]["error"]
+    assert run.progress().status == "failed"
+
+
+def test_cancelled_run_ends_with_a_summary():
+    async def run_cancelled():
+        run = SimulationRun(SolverStrategy.ENTROPY, _ANSWERS, SolveParameters(), 6)
+        run.cancel()
+        return run, [json.loads(line) async for line in simulations.start(run)]
+
+    run, lines = asyncio.run(run_cancelled())
+    assert lines == [lines[-1]]
+    assert lines[-1]["cancelled"] is True
+    assert run.progress().status == "cancelled"
@@ -63,4 +63,49 @@ def test_solve_all_strategies(client, sample_strategies):
         assert response.status_code == 200
         data = response.json()
         assert data["next_guess"].isupper()
-        assert data["next_guess"].isalpha()
\ No newline at end of file
+        assert data["next_guess"].isalpha()
+
+def test_solve_with_unknown_feedback_tile(client):
+    """Feedback may mark unreadable tiles with ``?``."""
+    exact = client.post("/api/solve", json={
+        "history": [{"guess": "ROATE", "feedback": "00000"}],
+    }).json()
+    partial = client.post("/api/solve", json={
+        "history": [{"guess": "ROATE", "feedback": "0000?"}],
+    })
+    assert partial.status_code == 200
+    assert partial.json()["remaining_candidates"] > exact["remaining_candidates"]
+
+    invalid = client.post("/api/solve", json={
+        "history": [{"guess": "ROATE", "feedback": "0000x"}],
+    })
+    assert invalid.status_code == 422
+
+
+def test_solve_batch_matches_single_solves_in_order(client):
+    """Batch results come back in input order; duplicates are solved once."""
+    histories = [
+        [{"guess": "ROATE", "feedback": "00000"}],
+        [{"guess": "ROATE", "feedback": "00000"}, {"guess": "CLIPS", "feedback": "00100"}],
+        [],
+        [{"guess": "ROATE", "feedback": "00000"}],
+    ]
+    requests = [{"history": history} for history in histories]
+    requests.append({
+        "history": histories[0],
+        "parameters": {"strategy": "frequency", "max_suggestions": 3},
+    })
+
+    response = client.post("/api/solve/batch", json={"requests": requests})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["solved_states"] == 4
+    assert len(data["results"]) == len(requests)
+    for request, result in zip(requests, data["results"]):
+        single = client.post("/api/solve", json=request).json()
+        assert result["suggestions"] == single["suggestions"]
+        assert result["remaining_candidates"] == single["remaining_candidates"]
+
+
+def test_solve_batch_rejects_empty_batch(client):
+    assert client.post("/api/solve/batch", json={"requests": []}).status_code == 422
@@ -1,6 +1,16 @@
 """Tests for word list management."""
+import numpy as np
 import pytest
-from word_manager.word_manager import wordlist
+from word_manager.word_manager import (
+    _compute_pattern,
+    _feedback_block,
+    _letter_counts,
+    _parse_priors,
+    _parse_word_list,
+    _pattern_to_code,
+    _words_to_letters,
+    wordlist,
+)
 
 
 def test_wordlist_loading():
@@ -46,4 +56,103 @@ def test_word_length_validation():
 def test_case_insensitive_validation():
     """Test that validation is case-insensitive."""
     assert wordlist.is_valid("aleph"), "Failed lowercase validation"
-    assert wordlist.is_valid("AlEpH"), "Failed mixed-case validation"
\ No newline at end of file
+    assert wordlist.is_valid("AlEpH"), "Failed mixed-case validation"
+
+
+def test_vectorized_feedback_handles_duplicate_letters():
+    """Block builder must agree with the scalar reference on repeated letters."""
+    words = ["EERIE", "SPEED", "ABBEY", "LLAMA", "ERASE", "GEESE", "ALLOT", "TOTAL"]
+    letters = _words_to_letters(words)
+    codes = _feedback_block(letters, letters, _letter_counts(letters))
+
+    for row, guess in enumerate(words):
+        for col, target in enumerate(words):
+            expected = _pattern_to_code(_compute_pattern(guess, target))
+            assert codes[row, col] == expected, f"{guess}/{target}"
+
+
+def test_feedback_matrix_matches_reference_row():
+    """A stored matrix row should match the scalar pattern for every target."""
+    words = wordlist.words
+    for guess in ("ROATE", "EERIE"):
+        for target in words[:200]:
+            assert wordlist.get_feedback_pattern(guess, target) == _compute_pattern(guess, target)
+
+
+def test_posting_list_slice_matches_matrix_scan():
+    """Posting-list buckets should hold exactly the targets with that feedback."""
+    row = wordlist.feedback_row("ROATE")
+    for feedback in ("00000", "01020", "22222"):
+        expected = np.flatnonzero(row == wordlist.encode_feedback(feedback))
+        assert wordlist.targets_for("ROATE", feedback).tolist() == expected.tolist()
+
+
+def test_answers_come_first():
+    """Answer index equals dictionary index, so answer rows are a prefix."""
+    answers = wordlist.answers
+    assert 0 < wordlist.answer_count < len(wordlist.words)
+    assert answers == wordlist.words[: wordlist.answer_count]
+    assert wordlist.is_answer(answers[0])
+    assert not wordlist.is_answer(wordlist.words[-1])
+    assert wordlist.answer_indices().tolist() == list(range(wordlist.answer_count))
+
+
+def test_feedback_matrix_covers_answer_targets_only():
+    """Every guess has a row, but only answers are targets."""
+    row = wordlist.feedback_row("ROATE")
+    assert row.shape == (wordlist.answer_count,)
+    assert wordlist.targets_for("ROATE", "00000").max() < wordlist.answer_count
+
+
+def test_feedback_for_non_answer_target():
+    """Patterns against allowed-only words fall back to the scalar computation."""
+    target = wordlist.words[-1]
+    assert not wordlist.is_answer(target)
+    expected = _compute_pattern("ROATE", target)
+    assert wordlist.get_feedback_pattern("ROATE", target) == expected
+    assert wordlist.get_feedback_code("ROATE", target) == _pattern_to_code(expected)
+
+
+def test_parse_word_list_formats():
+    """Answer flags and an explicit answers list both order answers first."""
+    flagged = [{"word": "abbey"}, {"word": "cigar", "answer": True}, "rebut"]
+    assert _parse_word_list(flagged) == (["CIGAR", "ABBEY", "REBUT"], 1)
+
+    listed = {"words": ["abbey", "cigar", "rebut"], "answers": ["rebut", "cigar"]}
+    assert _parse_word_list(listed) == (["REBUT", "CIGAR", "ABBEY"], 2)
+
+    # Without any answers marked, every word may be the answer.
+    assert _parse_word_list(["abbey", "cigar"]) == (["ABBEY", "CIGAR"], 2)
+    with pytest.raises(ValueError):
+        _parse_word_list([])
+
+
+def test_parse_priors():
+    """Priors come from entries or a mapping; words without one default to 1."""
+    entries = [{"word": "cigar", "answer": True, "prior": 3}, {"word": "abbey"}]
+    assert _parse_priors(entries) == {"CIGAR": 3}
+    assert _parse_priors({"words": ["cigar"], "priors": {"cigar": 0.5}}) == {"CIGAR": 0.5}
+    for bad in (-1, "high", True, float("nan")):
+        with pytest.raises(ValueError):
+            _parse_priors([{"word": "cigar", "prior": bad}])
+
+    priors = wordlist.priors()
+    assert priors.dtype == np.float32
+    assert priors.shape == (len(wordlist.words),)
+
+
+def test_wildcard_feedback_matches_any_tile():
+    """A ``?`` tile admits every color; filtering equals the union of exact patterns."""
+    candidates = wordlist.answer_indices()
+    partial = wordlist.filter_candidates(candidates, "ROATE", "0?000")
+    expected = np.union1d(
+        np.union1d(
+            wordlist.targets_for("ROATE", "00000"), wordlist.targets_for("ROATE", "01000")
+        ),
+        wordlist.targets_for("ROATE", "02000"),
+    )
+    assert partial.tolist() == expected.tolist()
+
+    narrowed = wordlist.filter_candidates(partial, "CLIPS", "?????")
+    assert narrowed.tolist() == partial.tolist()
+    assert wordlist.consistent_words("ROATE", "?????").all()
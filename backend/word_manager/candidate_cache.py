@@ -0,0 +1,80 @@
+"""Bounded LRU cache of candidate index arrays keyed by guess history prefixes."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+HistoryKey = Tuple[Tuple[str, str], ...]
+
+
+class CandidateCache:
+    """Map canonical ``((guess, feedback), ...)`` prefixes to surviving candidates.
+
+    Entries are evicted least-recently-used first once either the entry count or
+    the total size of the stored arrays exceeds its cap. Stored arrays are marked
+    read-only because every caller shares them.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[HistoryKey, np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: HistoryKey) -> Optional[np.ndarray]:
+        with self._lock:
+            candidates = self._entries.get(key)
+            if candidates is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return candidates
+
+    def put(self, key: HistoryKey, candidates: np.ndarray) -> np.ndarray:
+        candidates.flags.writeable = False
+        if candidates.nbytes > self.max_bytes:
+            return candidates
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = candidates
+            self._bytes += candidates.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return candidates
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every agent strategy
+candidate_cache = CandidateCache()
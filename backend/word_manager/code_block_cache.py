@@ -0,0 +1,139 @@
+"""Byte-bounded cache of in-RAM feedback code blocks for candidate states."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .candidate_set import CandidateSet
+from .word_manager import WordListManager, wordlist
+
+
+class CodeBlockCache:
+    """Keep dense ``candidates x guesses`` code blocks for recently scored states.
+
+    A state already seen is served as is. A state whose candidates are a subset of
+    a cached state, such as the next turn of the same game, is cut out of the
+    smallest cached superset by row selection on that small in-RAM block, instead
+    of gathering its rows from the memory-mapped matrix again. Entries are evicted
+    least-recently-used first to keep the stored blocks under ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        word_manager: WordListManager,
+        max_bytes: int = 128 * 1024 * 1024,
+        max_entries: int = 256,
+    ) -> None:
+        self._word_manager = word_manager
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CandidateSet, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def block(self, candidates: np.ndarray) -> np.ndarray:
+        """Return the read-only code block whose row ``i`` belongs to ``candidates[i]``.
+
+        ``candidates`` must be ascending, as produced by history filtering.
+        """
+        key = CandidateSet.from_indices(candidates, self._word_manager.answer_count)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            parent = self._smallest_superset(key)
+
+        if parent is not None:
+            parent_candidates, parent_block = parent
+            block = parent_block[np.searchsorted(parent_candidates, candidates)]
+        else:
+            block = np.asarray(self._word_manager.target_codes(candidates))
+
+        block.flags.writeable = False
+        self._store(key, np.asarray(candidates), block, narrowed=parent is not None)
+        return block
+
+    def peek(self, candidates: np.ndarray) -> Optional[np.ndarray]:
+        """Return the cached block for exactly ``candidates``, if any, without counting it."""
+        key = CandidateSet.from_indices(candidates, self._word_manager.answer_count)
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def seed(self, candidates: np.ndarray, block: np.ndarray) -> None:
+        """Store a block the caller already narrowed, e.g. a game session's next state."""
+        key = CandidateSet.from_indices(candidates, self._word_manager.answer_count)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+        block.flags.writeable = False
+        self._store(key, np.asarray(candidates), block, narrowed=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.narrowed = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "narrowed": self.narrowed,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _smallest_superset(self, key: CandidateSet) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        best: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        for cached_key, entry in self._entries.items():
+            if len(cached_key) <= len(key) or len(key - cached_key):
+                continue
+            if best is None or len(entry[0]) < len(best[0]):
+                best = entry
+        return best
+
+    def _store(
+        self, key: CandidateSet, candidates: np.ndarray, block: np.ndarray, narrowed: bool
+    ) -> None:
+        with self._lock:
+            if narrowed:
+                self.narrowed += 1
+            else:
+                self.misses += 1
+
+            # One oversized state (e.g. a first guess that reveals nothing) must not
+            # flush every other game's blocks, so it is computed but not kept.
+            if block.nbytes > self.max_bytes // 2:
+                return
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1].nbytes
+            self._entries[key] = (candidates, block)
+            self._bytes += block.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+
+# Shared by every scorer
+code_block_cache = CodeBlockCache(wordlist)
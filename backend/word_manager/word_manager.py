@@ -4,21 +4,43 @@ import json
 import os
 from collections.abc import Mapping
 from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from numpy.lib.format import open_memmap
 
+# Feedback tile the user could not read; matches any of the three colors.
+WILDCARD = "?"
+
 
 class WordListManager:
-    """Lazy-loaded singleton for word list."""
+    """Lazy-loaded singleton for word list.
+
+    The dictionary holds every allowed guess; words flagged ``"answer": true``
+    (or listed under ``"answers"``) are the possible solutions. Answers are
+    ordered first, so answer ``i`` is also dictionary word ``i``, and candidate
+    sets only ever hold indices below ``answer_count``. Without any flag every
+    word is an answer.
+
+    Entries may also carry a ``"prior"``: how likely the word is to be the
+    answer, relative to the others (default 1). ``priors()`` holds them as a
+    ``float32`` array aligned with the dictionary indices.
+    """
 
     _instance: Optional["WordListManager"] = None
     _words: Optional[List[str]] = None
+    _answer_count: Optional[int] = None
+    _priors: Optional[np.ndarray] = None
+    _guess_only_counts: Optional[np.ndarray] = None
     _feedback: Optional["_FeedbackLookup"] = None
     _word_index: Optional[Dict[str, int]] = None
     _feedback_matrix: Optional[np.memmap] = None
+    _letters: Optional[np.ndarray] = None
+    _feedback_postings: Optional[np.memmap] = None
+    _feedback_offsets: Optional[np.memmap] = None
+    _target_matrix: Optional[np.memmap] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -45,6 +67,8 @@ class WordListManager:
             if txt_path.exists():
                 with open(txt_path, "r") as f:
                     self._words = [word.strip().upper() for word in f if len(word.strip()) == 5]
+                self._answer_count = len(self._words)
+                self._priors = np.ones(len(self._words), dtype=np.float32)
                 print(f"Loaded {len(self._words)} words from legacy words.txt")
                 return self._words
             raise FileNotFoundError("No wordlist found")
@@ -52,31 +76,16 @@ class WordListManager:
         with open(data_path, "r") as f:
             data = json.load(f)
 
-        if isinstance(data, dict):
-            payload = data.get("words", [])
-        elif isinstance(data, list):
-            payload = data
-        else:  # pragma: no cover - safeguard for unexpected formats
-            raise ValueError("Unsupported word list format")
-
-        normalized: List[str] = []
-        for entry in payload:
-            if isinstance(entry, str):
-                normalized.append(entry.strip().upper())
-            elif isinstance(entry, dict) and "word" in entry:
-                word = entry["word"]
-                if isinstance(word, str):
-                    normalized.append(word.strip().upper())
-
-        if not normalized:
-            raise ValueError("Word list file is empty or malformed")
-
-        self._words = normalized
+        self._words, self._answer_count = _parse_word_list(data)
+        priors = _parse_priors(data)
+        self._priors = np.array([priors.get(word, 1.0) for word in self._words], dtype=np.float32)
 
         # Build deterministic index for matrix lookups
         self._word_index = {word: idx for idx, word in enumerate(self._words)}
 
-        print(f"✅ Loaded {len(self._words)} words from wordlist.json")
+        print(
+            f"✅ Loaded {len(self._words)} words ({self._answer_count} answers) from wordlist.json"
+        )
         return self._words
 
     @property
@@ -84,6 +93,20 @@ class WordListManager:
         """Get word list (loads if needed)."""
         return self.load_words()
 
+    @property
+    def answer_count(self) -> int:
+        """Number of possible answers; they are the first ``answer_count`` words."""
+        self.load_words()
+        return self._answer_count
+
+    @property
+    def answers(self) -> List[str]:
+        return self.words[: self.answer_count]
+
+    def is_answer(self, word: str) -> bool:
+        index = self._ensure_word_index().get(word.upper())
+        return index is not None and index < self.answer_count
+
     @property
     def feedback(self) -> Dict[str, Dict[str, str]]:
         """Get feedback patterns (loads if needed)."""
@@ -91,7 +114,7 @@ class WordListManager:
 
     def is_valid(self, word: str) -> bool:
         """Check if word exists in dictionary."""
-        return word.upper() in self.words
+        return word.upper() in self._ensure_word_index()
 
     def get_feedback_pattern(self, guess: str, target: str) -> str:
         """Return Wordle-style feedback pattern for the guess/target pair."""
@@ -106,6 +129,9 @@ class WordListManager:
             target_idx = index[target.upper()]
         except KeyError as exc:  # pragma: no cover - invalid user input
             raise ValueError("Word not found in dictionary") from exc
+        if target_idx >= self.answer_count:
+            # The matrix only has answer columns.
+            return _pattern_to_code(_compute_pattern(guess.upper(), target.upper()))
         return int(matrix[guess_idx, target_idx])
 
     # ------------------------------------------------------------------
@@ -119,46 +145,132 @@ class WordListManager:
             raise RuntimeError("Word index failed to initialize")
         return self._word_index
 
+    def priors(self) -> np.ndarray:
+        """Return each word's answer prior as a ``float32`` array (1 where none is given)."""
+        self.load_words()
+        return self._priors
+
+    def letter_array(self) -> np.ndarray:
+        """Return the words as an ``N x 5`` array of letter indices (A=0 ... Z=25)."""
+        if self._letters is None:
+            self._letters = _words_to_letters(self.words)
+        return self._letters
+
     def _feedback_matrix_path(self) -> Path:
         return Path(__file__).resolve().parent / "feedback_matrix.npy"
 
     def _ensure_feedback_matrix(self) -> np.memmap:
+        """Load (building once if needed) the ``guesses x answers`` feedback matrix."""
         if self._feedback_matrix is not None:
             return self._feedback_matrix
 
         words = self.words
-        word_count = len(words)
+        shape = (len(words), self.answer_count)
         matrix_path = self._feedback_matrix_path()
 
-        if matrix_path.exists():
-            self._feedback_matrix = open_memmap(
-                matrix_path, mode="r", dtype=np.uint8, shape=(word_count, word_count)
-            )
+        matrix = _open_if_shaped(matrix_path, shape)
+        if matrix is not None:
+            self._feedback_matrix = matrix
             print(f"✅ Loaded feedback matrix from {matrix_path.name}")
             return self._feedback_matrix
 
         max_workers = min(32, (os.cpu_count() or 4))
-        print(f"⚙️ Generating feedback matrix for {word_count} words using {max_workers} workers...")
-        matrix = open_memmap(matrix_path, mode="w+", dtype=np.uint8, shape=(word_count, word_count))
-
-        with ProcessPoolExecutor(
-            max_workers=max_workers,
-            initializer=_feedback_worker_init,
-            initargs=(words,),
-        ) as executor:
-            word_index = self._ensure_word_index()
-            for guess, codes in executor.map(_feedback_worker_compute, words, chunksize=4):
-                matrix[word_index[guess], :] = codes
-
-        matrix.flush()
-        del matrix  # close write handle
+        print(f"⚙️ Generating {shape[0]}x{shape[1]} feedback matrix using {max_workers} workers...")
+        # Build next to the final path so an interrupted run never leaves a partial matrix.
+        partial_path = matrix_path.with_suffix(".partial.npy")
+        matrix = open_memmap(partial_path, mode="w+", dtype=np.uint8, shape=shape)
+        del matrix  # header written; tiles are filled in place by the workers
+
+        _build_feedback_matrix(partial_path, self.letter_array(), shape[1], max_workers)
+        os.replace(partial_path, matrix_path)
+        # Tables derived from an older matrix no longer match it.
+        for derived in (*self._feedback_index_paths(), self._target_matrix_path()):
+            derived.unlink(missing_ok=True)
         print(f"✅ Stored feedback matrix at {matrix_path.name}")
 
-        self._feedback_matrix = open_memmap(
-            matrix_path, mode="r", dtype=np.uint8, shape=(word_count, word_count)
-        )
+        self._feedback_matrix = open_memmap(matrix_path, mode="r")
         return self._feedback_matrix
 
+    def _feedback_index_paths(self) -> tuple[Path, Path]:
+        base_dir = Path(__file__).resolve().parent
+        return base_dir / "feedback_postings.npy", base_dir / "feedback_offsets.npy"
+
+    def _ensure_feedback_index(self) -> tuple[np.memmap, np.memmap]:
+        """Load (building once if needed) the per-guess posting lists of the matrix.
+
+        Row ``g`` of the postings holds every target index ordered by its feedback
+        code for guess ``g`` (a stable counting sort, so each bucket is ascending),
+        and ``offsets[g, code]:offsets[g, code + 1]`` delimits the bucket for ``code``.
+        """
+        if self._feedback_postings is not None:
+            return self._feedback_postings, self._feedback_offsets
+
+        matrix = self._ensure_feedback_matrix()
+        postings_path, offsets_path = self._feedback_index_paths()
+
+        offsets_shape = (matrix.shape[0], _PATTERN_SPACE + 1)
+        if (
+            _open_if_shaped(postings_path, matrix.shape) is None
+            or _open_if_shaped(offsets_path, offsets_shape) is None
+        ):
+            max_workers = min(32, (os.cpu_count() or 4))
+            print(f"⚙️ Generating feedback posting lists using {max_workers} workers...")
+            partial_postings = postings_path.with_suffix(".partial.npy")
+            partial_offsets = offsets_path.with_suffix(".partial.npy")
+            postings = open_memmap(
+                partial_postings, mode="w+", dtype=_index_dtype(matrix.shape[1]), shape=matrix.shape
+            )
+            offsets = open_memmap(
+                partial_offsets,
+                mode="w+",
+                dtype=_index_dtype(matrix.shape[1] + 1),
+                shape=offsets_shape,
+            )
+            del postings, offsets  # headers written; rows are filled in place by the workers
+
+            _build_feedback_index(
+                self._feedback_matrix_path(), partial_postings, partial_offsets, max_workers
+            )
+            os.replace(partial_postings, postings_path)
+            os.replace(partial_offsets, offsets_path)
+            print(f"✅ Stored feedback posting lists at {postings_path.name}")
+
+        self._feedback_postings = open_memmap(postings_path, mode="r")
+        self._feedback_offsets = open_memmap(offsets_path, mode="r")
+        return self._feedback_postings, self._feedback_offsets
+
+    def _target_matrix_path(self) -> Path:
+        return Path(__file__).resolve().parent / "feedback_matrix_by_target.npy"
+
+    def _ensure_target_matrix(self) -> np.memmap:
+        """Load (building once if needed) the transposed, target-major feedback matrix.
+
+        Scoring reads every guess's code for a handful of candidate targets. In the
+        guess-major matrix those are scattered bytes across the whole file; here each
+        candidate is one contiguous row.
+        """
+        if self._target_matrix is not None:
+            return self._target_matrix
+
+        matrix = self._ensure_feedback_matrix()
+        target_path = self._target_matrix_path()
+
+        if _open_if_shaped(target_path, matrix.shape[::-1]) is None:
+            max_workers = min(32, (os.cpu_count() or 4))
+            print(f"⚙️ Generating target-major feedback matrix using {max_workers} workers...")
+            partial_path = target_path.with_suffix(".partial.npy")
+            transposed = open_memmap(
+                partial_path, mode="w+", dtype=np.uint8, shape=matrix.shape[::-1]
+            )
+            del transposed  # header written; tiles are filled in place by the workers
+
+            _build_target_matrix(self._feedback_matrix_path(), partial_path, max_workers)
+            os.replace(partial_path, target_path)
+            print(f"✅ Stored target-major feedback matrix at {target_path.name}")
+
+        self._target_matrix = open_memmap(target_path, mode="r")
+        return self._target_matrix
+
     # ------------------------------------------------------------------
     # Vectorized helpers
     # ------------------------------------------------------------------
@@ -171,14 +283,102 @@ class WordListManager:
         index = self._ensure_word_index()
         return np.array([index[word.upper()] for word in words], dtype=np.int64)
 
+    def indices_to_words(self, indices: Sequence[int]) -> List[str]:
+        words = self.words
+        return [words[int(idx)] for idx in indices]
+
+    def all_indices(self) -> np.ndarray:
+        """Return every dictionary index (every allowed guess) as an ``int32`` array."""
+        return np.arange(len(self.words), dtype=np.int32)
+
+    def answer_indices(self) -> np.ndarray:
+        """Return every answer index as an ``int32`` candidate array."""
+        return np.arange(self.answer_count, dtype=np.int32)
+
+    def encode_feedback(self, pattern: str) -> int:
+        return _pattern_to_code(pattern)
+
+    def decode_feedback(self, code: int) -> str:
+        return _code_to_pattern(code, 5)
+
+    def feedback_row(self, guess: str) -> np.ndarray:
+        """Return the matrix row holding ``guess``'s feedback code for every answer."""
+        index = self._ensure_word_index()
+        try:
+            guess_idx = index[guess.upper()]
+        except KeyError as exc:  # pragma: no cover - invalid user input
+            raise ValueError("Word not found in dictionary") from exc
+        return self._ensure_feedback_matrix()[guess_idx]
+
+    def consistent_words(self, guess: str, feedback: str) -> np.ndarray:
+        """Return a mask over the dictionary of words that would give ``feedback`` for ``guess``.
+
+        These are the guesses hard mode still allows after that hint. Answer
+        columns are compared straight from the guess's matrix row; the matrix has
+        no columns for the allowed-only words, so their codes are computed as one
+        vectorized block.
+        """
+        letters = self.letter_array()
+        answer_count = self.answer_count
+        if self._guess_only_counts is None:
+            self._guess_only_counts = _letter_counts(letters[answer_count:])
+        guess_letters = _words_to_letters([guess])
+        tail = _feedback_block(guess_letters, letters[answer_count:], self._guess_only_counts)[0]
+        answers = self.feedback_mask(self.feedback_row(guess), feedback)
+        return np.concatenate((answers, self.feedback_mask(tail, feedback)))
+
+    def targets_for(self, guess: str, feedback: str) -> np.ndarray:
+        """Return the ascending answer indices that give ``feedback`` for ``guess``."""
+        index = self._ensure_word_index()
+        try:
+            guess_idx = index[guess.upper()]
+        except KeyError as exc:  # pragma: no cover - invalid user input
+            raise ValueError("Word not found in dictionary") from exc
+        postings, offsets = self._ensure_feedback_index()
+        code = self.encode_feedback(feedback)
+        start, stop = offsets[guess_idx, code], offsets[guess_idx, code + 1]
+        return postings[guess_idx, start:stop].astype(np.int32)
+
+    def feedback_mask(self, codes: np.ndarray, feedback: str) -> np.ndarray:
+        """Return which of ``codes`` match ``feedback``, whose tiles may be ``?`` wildcards.
+
+        A wildcard pattern admits several codes; its 243-entry compatibility table
+        is built once per pattern and indexed by the codes, as cheap as comparing.
+        """
+        if WILDCARD in feedback:
+            return _compatibility_table(feedback)[codes]
+        return codes == self.encode_feedback(feedback)
+
+    def filter_candidates(self, candidates: np.ndarray, guess: str, feedback: str) -> np.ndarray:
+        """Keep the candidate indices whose feedback for ``guess`` matches ``feedback``.
+
+        From the full answer list an exact pattern is a posting-list slice;
+        afterwards the surviving candidates are already smaller than any bucket
+        they could be intersected with, so they are checked against the guess's
+        matrix row. Patterns with ``?`` tiles are always checked against the row.
+        """
+        if candidates.size == self.answer_count and WILDCARD not in feedback:
+            return self.targets_for(guess, feedback)
+        row = self.feedback_row(guess)
+        return candidates[self.feedback_mask(row[candidates], feedback)]
+
+    def target_codes(self, target_indices: Sequence[int]) -> np.ndarray:
+        """Return a ``targets x guesses`` block with every guess's code for each answer target."""
+        target_idx_arr = np.asarray(target_indices, dtype=np.int64)
+        return self._ensure_target_matrix()[target_idx_arr]
+
     def feedback_codes(
         self, guess_indices: Sequence[int], target_indices: Sequence[int]
     ) -> np.ndarray:
         matrix = self._ensure_feedback_matrix()
-        guess_idx_arr = np.asarray(list(guess_indices), dtype=np.int64)
-        target_idx_arr = np.asarray(list(target_indices), dtype=np.int64)
+        guess_idx_arr = np.asarray(guess_indices, dtype=np.int64)
+        target_idx_arr = np.asarray(target_indices, dtype=np.int64)
         if guess_idx_arr.size == 0 or target_idx_arr.size == 0:
             return np.empty((guess_idx_arr.size, target_idx_arr.size), dtype=np.uint8)
+        if np.all(np.diff(guess_idx_arr) == 1):
+            # Contiguous guess rows: slice them and gather only the columns.
+            first = guess_idx_arr[0]
+            return matrix[first : first + guess_idx_arr.size].take(target_idx_arr, axis=1)
         return matrix[np.ix_(guess_idx_arr, target_idx_arr)]
 
 
@@ -186,21 +386,260 @@ class WordListManager:
 wordlist = WordListManager()
 
 
-_WORKER_WORDS: List[str] = []
-
-
-def _feedback_worker_init(words: List[str]) -> None:
-    global _WORKER_WORDS
-    _WORKER_WORDS = words
-
-
-def _feedback_worker_compute(guess: str) -> tuple[str, List[int]]:
-    guess = guess.upper()
-    feedback_codes: List[int] = []
-    for target in _WORKER_WORDS:
-        pattern = _compute_pattern(guess, target)
-        feedback_codes.append(_pattern_to_code(pattern))
-    return guess, feedback_codes
+# Rows of guesses scored per tile; keeps the (rows x N) temporaries at a few MB.
+_FEEDBACK_BLOCK_ROWS = 256
+_PATTERN_SPACE = 3**5
+
+_WORKER_MATRIX: Optional[np.memmap] = None
+_WORKER_LETTERS: Optional[np.ndarray] = None
+_WORKER_COUNTS: Optional[np.ndarray] = None
+_WORKER_POSTINGS: Optional[np.memmap] = None
+_WORKER_OFFSETS: Optional[np.memmap] = None
+_WORKER_TRANSPOSED: Optional[np.memmap] = None
+
+
+def _parse_word_list(data: object) -> Tuple[List[str], int]:
+    """Return ``(words, answer_count)`` from a parsed ``wordlist.json``.
+
+    Accepts a list of strings or ``{"word": ..., "answer": bool}`` entries, or an
+    object with a ``"words"`` list and an optional ``"answers"`` list. Answers
+    are moved to the front in their listed order; with none marked, every word
+    is an answer.
+    """
+    answers: List[str] = []
+    if isinstance(data, dict):
+        payload = data.get("words", [])
+        answers = [word.strip().upper() for word in data.get("answers", [])]
+    elif isinstance(data, list):
+        payload = data
+    else:  # pragma: no cover - safeguard for unexpected formats
+        raise ValueError("Unsupported word list format")
+
+    normalized: List[str] = []
+    for entry in payload:
+        if isinstance(entry, str):
+            normalized.append(entry.strip().upper())
+        elif isinstance(entry, dict) and "word" in entry:
+            word = entry["word"]
+            if isinstance(word, str):
+                normalized.append(word.strip().upper())
+                if entry.get("answer"):
+                    answers.append(normalized[-1])
+
+    if not normalized and not answers:
+        raise ValueError("Word list file is empty or malformed")
+    if not answers:
+        return normalized, len(normalized)
+
+    answers = list(dict.fromkeys(answers))
+    answer_set = set(answers)
+    return answers + [word for word in normalized if word not in answer_set], len(answers)
+
+
+def _parse_priors(data: object) -> Dict[str, float]:
+    """Return the explicit ``"prior"`` of every entry that has one.
+
+    Priors come from ``{"word": ..., "prior": p}`` entries or, in the object
+    format, from an optional ``"priors"`` mapping of word to prior.
+    """
+    priors: Dict[str, float] = {}
+    payload = data.get("words", []) if isinstance(data, dict) else data
+    for entry in payload:
+        if isinstance(entry, dict) and isinstance(entry.get("word"), str) and "prior" in entry:
+            priors[entry["word"].strip().upper()] = entry["prior"]
+    if isinstance(data, dict):
+        for word, prior in data.get("priors", {}).items():
+            priors[word.strip().upper()] = prior
+
+    for word, prior in priors.items():
+        if isinstance(prior, bool) or not isinstance(prior, (int, float)):
+            raise ValueError(f"Prior for {word} must be a number")
+        if not 0 <= prior < float("inf"):
+            raise ValueError(f"Prior for {word} must be a finite non-negative number")
+    return priors
+
+
+def _words_to_letters(words: Sequence[str]) -> np.ndarray:
+    joined = "".join(word.upper() for word in words).encode("ascii")
+    letters = np.frombuffer(joined, dtype=np.uint8).reshape(len(words), 5) - ord("A")
+    return np.ascontiguousarray(letters)
+
+
+def _letter_counts(letters: np.ndarray) -> np.ndarray:
+    """Return a ``26 x N`` table with how often each letter occurs in each word."""
+    counts = np.zeros((26, letters.shape[0]), dtype=np.int8)
+    columns = np.arange(letters.shape[0])
+    for pos in range(letters.shape[1]):
+        np.add.at(counts, (letters[:, pos], columns), 1)
+    return counts
+
+
+def _feedback_block(
+    guesses: np.ndarray, targets: np.ndarray, target_counts: np.ndarray
+) -> np.ndarray:
+    """Compute feedback codes for every (guess, target) pair of two letter arrays.
+
+    ``target_counts`` is the ``_letter_counts`` table of ``targets``. A guess letter
+    that is not green is yellow while the target still holds an unclaimed copy of
+    it: copies claimed by greens anywhere in the word and by the same letter at an
+    earlier guess position (green or yellow) are subtracted first. That is exactly
+    the left-to-right rule of ``_compute_pattern``, so duplicate letters agree.
+    """
+    greens = [guesses[:, None, pos] == targets[None, :, pos] for pos in range(5)]
+    codes = np.zeros((guesses.shape[0], targets.shape[0]), dtype=np.uint8)
+
+    for pos in range(5):
+        unclaimed = target_counts[guesses[:, pos]]
+        for other in range(5):
+            if other == pos:
+                continue
+            same_letter = guesses[:, other] == guesses[:, pos]
+            if not same_letter.any():
+                continue
+            if other < pos:
+                unclaimed -= same_letter[:, None]
+            else:
+                unclaimed -= greens[other] & same_letter[:, None]
+
+        yellow = (unclaimed > 0) & ~greens[pos]
+        codes *= 3
+        codes += greens[pos] * np.uint8(2)
+        codes += yellow
+
+    return codes
+
+
+def _open_if_shaped(path: Path, shape: tuple) -> Optional[np.memmap]:
+    """Memory-map the ``.npy`` at ``path`` if it exists and has ``shape``."""
+    if not path.exists():
+        return None
+    array = open_memmap(path, mode="r")
+    if array.shape != tuple(shape):
+        print(f"⚠️  {path.name} has shape {array.shape}, expected {tuple(shape)}; rebuilding")
+        return None
+    return array
+
+
+def _index_dtype(limit: int) -> type:
+    return np.uint16 if limit <= np.iinfo(np.uint16).max else np.int32
+
+
+def _run_tiles(initializer, initargs: tuple, compute, row_count: int, max_workers: int) -> None:
+    """Run ``compute(start)`` for every row tile, in-process or across a process pool."""
+    starts = range(0, row_count, _FEEDBACK_BLOCK_ROWS)
+    if max_workers <= 1:
+        initializer(*initargs)
+        for start in starts:
+            compute(start)
+        _release_worker_state()
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        for _ in executor.map(compute, starts):
+            pass
+
+
+def _release_worker_state() -> None:
+    global _WORKER_MATRIX, _WORKER_LETTERS, _WORKER_COUNTS
+    global _WORKER_POSTINGS, _WORKER_OFFSETS, _WORKER_TRANSPOSED
+    _WORKER_MATRIX = _WORKER_LETTERS = _WORKER_COUNTS = None
+    _WORKER_POSTINGS = _WORKER_OFFSETS = _WORKER_TRANSPOSED = None
+
+
+def _build_feedback_matrix(
+    matrix_path: Path, letters: np.ndarray, answer_count: int, max_workers: int
+) -> None:
+    _run_tiles(
+        _feedback_worker_init,
+        (str(matrix_path), letters, answer_count),
+        _feedback_worker_compute,
+        letters.shape[0],
+        max_workers,
+    )
+
+
+def _feedback_worker_init(matrix_path: str, letters: np.ndarray, answer_count: int) -> None:
+    global _WORKER_MATRIX, _WORKER_LETTERS, _WORKER_COUNTS
+    _WORKER_MATRIX = open_memmap(matrix_path, mode="r+")
+    _WORKER_LETTERS = letters
+    _WORKER_COUNTS = _letter_counts(letters[:answer_count])
+
+
+def _feedback_worker_compute(start: int) -> int:
+    stop = min(start + _FEEDBACK_BLOCK_ROWS, _WORKER_LETTERS.shape[0])
+    answers = _WORKER_LETTERS[: _WORKER_COUNTS.shape[1]]
+    _WORKER_MATRIX[start:stop, :] = _feedback_block(
+        _WORKER_LETTERS[start:stop], answers, _WORKER_COUNTS
+    )
+    _WORKER_MATRIX.flush()
+    return start
+
+
+def _build_feedback_index(
+    matrix_path: Path, postings_path: Path, offsets_path: Path, max_workers: int
+) -> None:
+    row_count = open_memmap(matrix_path, mode="r").shape[0]
+    _run_tiles(
+        _index_worker_init,
+        (str(matrix_path), str(postings_path), str(offsets_path)),
+        _index_worker_compute,
+        row_count,
+        max_workers,
+    )
+
+
+def _index_worker_init(matrix_path: str, postings_path: str, offsets_path: str) -> None:
+    global _WORKER_MATRIX, _WORKER_POSTINGS, _WORKER_OFFSETS
+    _WORKER_MATRIX = open_memmap(matrix_path, mode="r")
+    _WORKER_POSTINGS = open_memmap(postings_path, mode="r+")
+    _WORKER_OFFSETS = open_memmap(offsets_path, mode="r+")
+
+
+def _index_worker_compute(start: int) -> int:
+    stop = min(start + _FEEDBACK_BLOCK_ROWS, _WORKER_MATRIX.shape[0])
+    codes = np.asarray(_WORKER_MATRIX[start:stop])
+    rows = stop - start
+
+    # A stable sort of uint8 codes is a counting sort: buckets keep ascending targets.
+    _WORKER_POSTINGS[start:stop, :] = np.argsort(codes, axis=1, kind="stable")
+    row_offsets = (np.arange(rows, dtype=np.int64) * _PATTERN_SPACE)[:, None]
+    counts = np.bincount((codes + row_offsets).ravel(), minlength=rows * _PATTERN_SPACE).reshape(
+        rows, _PATTERN_SPACE
+    )
+    _WORKER_OFFSETS[start:stop, 0] = 0
+    _WORKER_OFFSETS[start:stop, 1:] = np.cumsum(counts, axis=1)
+
+    _WORKER_POSTINGS.flush()
+    _WORKER_OFFSETS.flush()
+    return start
+
+
+def _build_target_matrix(matrix_path: Path, target_path: Path, max_workers: int) -> None:
+    column_count = open_memmap(matrix_path, mode="r").shape[1]
+    _run_tiles(
+        _transpose_worker_init,
+        (str(matrix_path), str(target_path)),
+        _transpose_worker_compute,
+        column_count,
+        max_workers,
+    )
+
+
+def _transpose_worker_init(matrix_path: str, target_path: str) -> None:
+    global _WORKER_MATRIX, _WORKER_TRANSPOSED
+    _WORKER_MATRIX = open_memmap(matrix_path, mode="r")
+    _WORKER_TRANSPOSED = open_memmap(target_path, mode="r+")
+
+
+def _transpose_worker_compute(start: int) -> int:
+    stop = min(start + _FEEDBACK_BLOCK_ROWS, _WORKER_MATRIX.shape[1])
+    _WORKER_TRANSPOSED[start:stop, :] = _WORKER_MATRIX[:, start:stop].T
+    _WORKER_TRANSPOSED.flush()
+    return start
 
 
 def _compute_pattern(guess: str, target: str) -> str:
@@ -225,6 +664,18 @@ def _compute_pattern(guess: str, target: str) -> str:
     return "".join(result)
 
 
+@lru_cache(maxsize=None)
+def _compatibility_table(pattern: str) -> np.ndarray:
+    """Return the 243-entry mask of feedback codes a wildcard pattern admits."""
+    codes = np.arange(_PATTERN_SPACE)
+    table = np.ones(_PATTERN_SPACE, dtype=bool)
+    for position, char in enumerate(pattern):
+        if char != WILDCARD:
+            table &= codes // 3 ** (len(pattern) - 1 - position) % 3 == int(char)
+    table.flags.writeable = False
+    return table
+
+
 def _pattern_to_code(pattern: str) -> int:
     code = 0
     for char in pattern:
@@ -20,6 +20,9 @@ const ALGORITHMS: { value: SolverStrategy; label: string }[] = [
   { value: "entropy", label: "Entropy" },
   { value: "better_entropy", label: "Better Entropy" },
   { value: "k_beam", label: "K-Beam" },
+  { value: "optimal", label: "Optimal" },
+  { value: "lookahead", label: "Lookahead" },
+  { value: "mcts", label: "MCTS" },
 ];
 
 export function AISuggestionPanel({
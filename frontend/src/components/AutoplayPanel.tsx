@@ -13,6 +13,9 @@ const STRATEGIES: { value: SolverStrategy; label: string }[] = [
   { value: "frequency", label: "Frequency" },
   { value: "random", label: "Random" },
   { value: "k_beam", label: "K-Beam" },
+  { value: "optimal", label: "Optimal" },
+  { value: "lookahead", label: "Lookahead" },
+  { value: "mcts", label: "MCTS" },
 ];
 
 type AutoplayPanelProps = {
@@ -23,6 +26,7 @@ export function AutoplayPanel({ autoplayState }: AutoplayPanelProps) {
   const [strategy, setStrategy] = useState<SolverStrategy>("better_entropy");
   const [maxAttempts, setMaxAttempts] = useState(6);
   const [allowRepeats, setAllowRepeats] = useState(false);
+  const [hardMode, setHardMode] = useState(false);
   const [answerInput, setAnswerInput] = useState("");
   const [isTranscriptOpen, setTranscriptOpen] = useState(false);
 
@@ -84,6 +88,7 @@ export function AutoplayPanel({ autoplayState }: AutoplayPanelProps) {
       strategy,
       max_attempts: maxAttempts,
       allow_repeats: allowRepeats,
+      hard_mode: hardMode,
       answer: fallbackAnswer,
     });
   };
@@ -198,6 +203,17 @@ export function AutoplayPanel({ autoplayState }: AutoplayPanelProps) {
           />
           Allow repeated letters
         </label>
+
+        <label className="md:col-span-2 flex items-center gap-3 rounded-2xl border border-neutral-200 bg-neutral-50/70 px-4 py-3 text-sm font-medium text-neutral-700">
+          <input
+            type="checkbox"
+            checked={hardMode}
+            onChange={(event) => setHardMode(event.target.checked)}
+            disabled={isBusy}
+            className="h-4 w-4 rounded border-neutral-300 text-primary-600 focus:ring-primary-200"
+          />
+          Hard mode (every guess uses the revealed hints)
+        </label>
       </div>
 
       {error && (
@@ -33,6 +33,9 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
 
   const timeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const stepsRef = useRef<AutoplayStep[]>([]);
+  // False while steps are still streaming in; playback waits for them.
+  const streamDoneRef = useRef(true);
+  const abortRef = useRef<AbortController | null>(null);
 
   const clearPlayback = useCallback(() => {
     if (timeoutRef.current) {
@@ -48,8 +51,7 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
 
   const schedulePlayback = useCallback(
     (startIndex: number) => {
-      const steps = stepsRef.current;
-      if (!steps.length) {
+      if (!stepsRef.current.length && streamDoneRef.current) {
         setActiveStepIndex(-1);
         finishPlayback();
         return;
@@ -58,8 +60,15 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
       let nextIndex = Math.max(0, startIndex);
 
       const runStep = () => {
+        const steps = stepsRef.current;
+        if (nextIndex >= steps.length) {
+          // The next step has not streamed in yet.
+          timeoutRef.current = setTimeout(runStep, stepInterval / 4);
+          return;
+        }
+
         setActiveStepIndex(nextIndex);
-        if (nextIndex >= steps.length - 1) {
+        if (nextIndex >= steps.length - 1 && streamDoneRef.current) {
           timeoutRef.current = setTimeout(() => {
             finishPlayback();
           }, stepInterval);
@@ -83,29 +92,62 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
       setError(null);
       setActiveStepIndex(-1);
 
+      abortRef.current?.abort();
+      const controller = new AbortController();
+      abortRef.current = controller;
+      stepsRef.current = [];
+      streamDoneRef.current = false;
+
       try {
         const sanitizedPayload = {
           ...payload,
           answer: payload.answer?.trim().toUpperCase() || undefined,
         };
-        const response = await solverAPI.runAutoplay(sanitizedPayload);
+        // Steps arrive one solve at a time; playback starts with the first.
+        const response = await solverAPI.streamAutoplay(
+          sanitizedPayload,
+          {
+            onStart: (answer) => {
+              setSession({ answer, solved: false, attempts_used: 0, steps: [] });
+            },
+            onStep: (step) => {
+              stepsRef.current = [...stepsRef.current, step];
+              const steps = stepsRef.current;
+              setSession((previous) =>
+                previous ? { ...previous, steps, attempts_used: steps.length } : previous
+              );
+              if (steps.length === 1) {
+                setStatus("playing");
+                schedulePlayback(0);
+              }
+            },
+          },
+          controller.signal
+        );
+        streamDoneRef.current = true;
         setSession(response);
         stepsRef.current = response.steps;
 
         if (response.steps.length === 0) {
           setStatus("completed");
-          return;
         }
-
-        setStatus("playing");
-        schedulePlayback(0);
       } catch (err) {
+        streamDoneRef.current = true;
+        if (controller.signal.aborted) {
+          return;
+        }
         console.error("Autoplay error:", err);
+        clearPlayback();
         setSession(null);
         stepsRef.current = [];
         setStatus("idle");
+        setActiveStepIndex(-1);
         const message = err instanceof Error ? err.message : "Failed to run autoplay";
         setError(message);
+      } finally {
+        if (abortRef.current === controller) {
+          abortRef.current = null;
+        }
       }
     },
     [clearPlayback, schedulePlayback]
@@ -118,6 +160,7 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
     setActiveStepIndex(-1);
     setStatus("playing");
     stepsRef.current = session.steps;
+    streamDoneRef.current = true;
     schedulePlayback(0);
   }, [schedulePlayback, session]);
 
@@ -125,12 +168,14 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
     if (status === "idle" || status === "completed") {
       return;
     }
+    abortRef.current?.abort();
     clearPlayback();
     setStatus("idle");
     setActiveStepIndex(-1);
   }, [clearPlayback, status]);
 
   const reset = useCallback(() => {
+    abortRef.current?.abort();
     clearPlayback();
     setSession(null);
     setStatus("idle");
@@ -141,6 +186,7 @@ export function useAutoplay(stepInterval: number = STEP_INTERVAL_MS): UseAutopla
 
   useEffect(() => {
     return () => {
+      abortRef.current?.abort();
       clearPlayback();
     };
   }, [clearPlayback]);
@@ -24,7 +24,7 @@ export interface GameEndState {
   message: string;
 }
 
-export type SolverStrategy = 'entropy' | 'random' | 'frequency' | 'better_entropy' | 'k_beam';
+export type SolverStrategy = 'entropy' | 'random' | 'frequency' | 'better_entropy' | 'k_beam' | 'optimal' | 'lookahead' | 'mcts';
 
 export interface AgentThought {
   message: string;
@@ -58,6 +58,19 @@ export type SolveResponsePayload = {
   thoughts?: AgentThought[];
 };
 
+export type SessionResponsePayload = {
+  id: string;
+  strategy: SolverStrategy;
+  state: {
+    history: SolveHistoryEntry[];
+    remaining_candidates: number;
+    solved: boolean;
+    solution?: string | null;
+  };
+  result: SolveResponsePayload | null;
+  expires_in: number;
+};
+
 export interface ValidateResponse {
   word: string;
   valid: boolean;
@@ -83,6 +96,7 @@ export interface AutoplayRequestPayload {
   strategy: SolverStrategy;
   max_attempts?: number;
   allow_repeats?: boolean;
+  hard_mode?: boolean;
 }
 
 export interface AISuggestion {
@@ -2,7 +2,9 @@ import type {
   AISuggestion,
   AutoplayRequestPayload,
   AutoplayResponse,
+  AutoplayStep,
   LetterState,
+  SessionResponsePayload,
   SolveHistoryEntry,
   SolveRequestPayload,
   SolveResponsePayload,
@@ -76,8 +78,26 @@ const deriveReasoning = (
   return `${remaining} candidates remain after applying your feedback history.`;
 };
 
+type SolverSession = {
+  id: string;
+  parameters: string;
+  history: SolveHistoryEntry[];
+};
+
+const extendsHistory = (
+  prefix: SolveHistoryEntry[],
+  history: SolveHistoryEntry[]
+): boolean =>
+  prefix.length <= history.length &&
+  prefix.every(
+    (entry, index) =>
+      entry.guess === history[index].guess && entry.feedback === history[index].feedback
+  );
+
 class SolverAPI {
   private baseUrl: string;
+  // Server-side session of the current board; only new rows are sent to it.
+  private session: SolverSession | null = null;
 
   constructor(baseUrl: string = API_BASE_URL) {
     this.baseUrl = baseUrl;
@@ -115,6 +135,76 @@ class SolverAPI {
     return response.json();
   }
 
+  /**
+   * Solve through a server-side session: a board that only gained rows since the
+   * last call sends just those rows; anything else starts a new session.
+   */
+  async requestSessionSuggestions(
+    payload: SolveRequestPayload,
+    signal?: AbortSignal
+  ): Promise<SolveResponsePayload> {
+    const parameters = JSON.stringify(payload.parameters);
+    const session = this.session;
+    let state: SessionResponsePayload;
+
+    if (
+      session &&
+      session.parameters === parameters &&
+      extendsHistory(session.history, payload.history)
+    ) {
+      let latest: SessionResponsePayload | null = null;
+      for (const row of payload.history.slice(session.history.length)) {
+        latest = await this.postSessionGuess(session.id, row, signal);
+        session.history = [...session.history, row];
+      }
+      state =
+        latest ?? (await this.sessionRequest(`/session/${session.id}`, { method: "GET", signal }));
+    } else {
+      state = await this.sessionRequest("/session", {
+        method: "POST",
+        body: JSON.stringify(payload),
+        signal,
+      });
+      this.session = { id: state.id, parameters, history: payload.history };
+    }
+
+    if (!state.result) {
+      throw new Error("The session is already solved");
+    }
+    return state.result;
+  }
+
+  private postSessionGuess(
+    id: string,
+    row: SolveHistoryEntry,
+    signal?: AbortSignal
+  ): Promise<SessionResponsePayload> {
+    return this.sessionRequest(`/session/${id}/guess`, {
+      method: "POST",
+      body: JSON.stringify(row),
+      signal,
+    });
+  }
+
+  private async sessionRequest(
+    path: string,
+    init: RequestInit
+  ): Promise<SessionResponsePayload> {
+    const response = await fetch(`${this.baseUrl}${path}`, {
+      ...init,
+      headers: {
+        "Content-Type": "application/json",
+      },
+    });
+
+    if (!response.ok) {
+      const detail = await response.text();
+      throw new Error(detail || "Session request failed");
+    }
+
+    return response.json();
+  }
+
   async getSuggestion(params: {
     guesses: string[];
     evaluations: LetterState[][];
@@ -143,8 +233,19 @@ class SolverAPI {
       },
     };
 
-    const response = await this.requestAISuggestions(payload, signal);
-    
+    let response: SolveResponsePayload;
+    try {
+      response = await this.requestSessionSuggestions(payload, signal);
+    } catch (err) {
+      // The server may hold rows this client never saw confirmed, so start afresh
+      // next time; an expired or evicted session is answered statelessly now.
+      this.session = null;
+      if (signal?.aborted) {
+        throw err;
+      }
+      response = await this.requestAISuggestions(payload, signal);
+    }
+
     console.log("Solver response:", response);
 
     const remaining =
@@ -184,7 +285,7 @@ class SolverAPI {
     return response.json();
   }
 
-  async getAllWords(): Promise<string[]> {
+  async getAllWords(): Promise<{ words: string[]; answers: string[] }> {
     const response = await fetch(`${this.baseUrl}/words/all`);
 
     if (!response.ok) {
@@ -192,7 +293,7 @@ class SolverAPI {
     }
 
     const data = await response.json();
-    return data.words;
+    return { words: data.words, answers: data.answers ?? data.words };
   }
 
   async runAutoplay(payload: AutoplayRequestPayload): Promise<AutoplayResponse> {
@@ -211,6 +312,79 @@ class SolverAPI {
 
     return response.json();
   }
+
+  /**
+   * Run autoplay over Server-Sent Events: `onStart` gets the answer and `onStep`
+   * each step as soon as the backend computes it. Resolves with the full result.
+   */
+  async streamAutoplay(
+    payload: AutoplayRequestPayload,
+    handlers: {
+      onStart?: (answer: string) => void;
+      onStep?: (step: AutoplayStep) => void;
+    },
+    signal?: AbortSignal
+  ): Promise<AutoplayResponse> {
+    const response = await fetch(`${this.baseUrl}/autoplay/stream`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "text/event-stream",
+      },
+      body: JSON.stringify(payload),
+      signal,
+    });
+
+    if (!response.ok || !response.body) {
+      const detail = await response.text();
+      throw new Error(detail || "Autoplay failed");
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    let result: AutoplayResponse | null = null;
+
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) {
+        break;
+      }
+      buffer += value;
+
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary >= 0) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+
+        let event = "message";
+        let data = "";
+        for (const line of block.split("\n")) {
+          if (line.startsWith("event: ")) {
+            event = line.slice(7);
+          } else if (line.startsWith("data: ")) {
+            data += line.slice(6);
+          }
+        }
+
+        const parsed = JSON.parse(data);
+        if (event === "start") {
+          handlers.onStart?.(parsed.answer);
+        } else if (event === "step") {
+          handlers.onStep?.(parsed);
+        } else if (event === "done") {
+          result = parsed;
+        } else if (event === "error") {
+          throw new Error(parsed.detail || "Autoplay failed");
+        }
+      }
+    }
+
+    if (!result) {
+      throw new Error("Autoplay stream ended early");
+    }
+    return result;
+  }
 }
 
 export const solverAPI = new SolverAPI();
@@ -1,31 +1,33 @@
 import { GameStoreState } from "@/stores/game-store";
 import { LetterState, KeyboardState } from "@/types/types";
-import { loadWords, getRandomWordFromList, getDailyWordFromList } from "./word-loader";
+import { loadWords, loadAnswers, getRandomWordFromList, getDailyWordFromList } from "./word-loader";
 
 export function normalize(word: string): string {
   return word.trim().toUpperCase();
 }
 
 let wordsCache: string[] = [];
+let answersCache: string[] = [];
 
 // Initialize word list
 export async function initializeWordList(): Promise<void> {
   if (wordsCache.length === 0) {
     wordsCache = await loadWords();
+    answersCache = await loadAnswers();
   }
 }
 
 export async function getDailyAnswer(): Promise<{ answer: string; id: string }> {
   await initializeWordList();
   const now = new Date();
-  const ans = getDailyWordFromList(wordsCache, now);
+  const ans = getDailyWordFromList(answersCache, now);
   const id = now.toISOString().slice(0, 10); // YYYY-MM-DD
   return { answer: ans, id };
 }
 
 export async function getRandomAnswer(): Promise<{ answer: string; id: string }> {
   await initializeWordList();
-  const ans = getRandomWordFromList(wordsCache);
+  const ans = getRandomWordFromList(answersCache);
   const id = `rand-${Date.now()}`;
   return { answer: ans, id };
 }
@@ -2,8 +2,15 @@
 import { solverAPI } from './api-utils';
 
 let cachedWords: string[] = [];
+// Words that can be the hidden answer; every cached word is an allowed guess.
+let cachedAnswers: string[] = [];
 let loadingPromise: Promise<string[]> | null = null;
 
+export async function loadAnswers(): Promise<string[]> {
+  await loadWords();
+  return cachedAnswers;
+}
+
 export async function loadWords(): Promise<string[]> {
   if (cachedWords.length > 0) {
     return cachedWords;
@@ -21,7 +28,9 @@ export async function loadWords(): Promise<string[]> {
       
       if (isBackendHealthy) {
         console.log('Loading word list from backend...');
-        cachedWords = await solverAPI.getAllWords();
+        const lists = await solverAPI.getAllWords();
+        cachedWords = lists.words;
+        cachedAnswers = lists.answers;
         console.log(`Loaded ${cachedWords.length} words from backend`);
         return cachedWords;
       }
@@ -30,10 +39,15 @@ export async function loadWords(): Promise<string[]> {
       console.log('Backend not available, trying local wordlist.json...');
       const response = await fetch('/wordlist.json');
       if (response.ok) {
-        const data: Array<{ word: string }> = await response.json();
-        cachedWords = data
-          .map(item => item.word.trim().toUpperCase())
-          .filter(word => word.length === 5);
+        const data: Array<{ word: string; answer?: boolean }> = await response.json();
+        const entries = data
+          .map(item => ({ word: item.word.trim().toUpperCase(), answer: !!item.answer }))
+          .filter(item => item.word.length === 5);
+        cachedWords = entries.map(item => item.word);
+        cachedAnswers = entries.filter(item => item.answer).map(item => item.word);
+        if (cachedAnswers.length === 0) {
+          cachedAnswers = cachedWords;
+        }
         console.log(`Loaded ${cachedWords.length} words from local file`);
         return cachedWords;
       }